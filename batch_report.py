@@ -0,0 +1,197 @@
+# Headless report pack: every report section for the whole university and for each
+# faculty and department, written as static HTML pages without the Streamlit runtime.
+#
+#   python batch_report.py yayinlar_2023.xlsx yayinlar_2024.xlsx --output rapor --workers 8
+import argparse
+import html
+import importlib.util
+import os
+import re
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+
+from plotly.offline import get_plotlyjs
+
+from processing import DEPARTMENT_MAPPING, FACULTY_MAPPING, load_and_process_data, present_unit_labels
+from sections import (FILTER_KEYS, REPORT_SECTIONS, SectionData, build_comparison_pairs, build_year_color_map,
+                      describe_years)
+
+PAGE_TEMPLATE = """<!DOCTYPE html>
+<html lang="tr">
+<head>
+<meta charset="utf-8">
+<title>{title}</title>
+<script src="plotly.min.js"></script>
+<style>
+    body {{ font-family: 'Roboto', sans-serif; max-width: 900px; margin: 0 auto; padding: 0 20px; }}
+    h1, h2, h3 {{ color: #1F77B4; }}
+    .info {{ background-color: #E8F1FB; padding: 8px 12px; border-radius: 4px; }}
+    table {{ border-collapse: collapse; }}
+    td, th {{ border: 1px solid #DDD; padding: 4px 8px; }}
+</style>
+</head>
+<body>
+<h1>{title}</h1>
+{body}
+</body>
+</html>
+"""
+
+# Unit filters rendered by the pack: (filter key, page name prefix, label mapping)
+UNIT_FILTERS = {
+    'Faculty': ('faculty_include', 'fakulte', FACULTY_MAPPING),
+    'Department': ('department_include', 'bolum', DEPARTMENT_MAPPING),
+}
+
+NON_WORD = re.compile(r'[^\w]+')
+
+# Dataset shared by the tasks of one worker process, set once by the pool initializer
+WORKER_CONTEXT = {}
+
+# Stands in for Streamlit's UploadedFile so load_and_process_data can be reused as is
+class LocalFile:
+    def __init__(self, path):
+        self.name = Path(path).name
+        self.data = Path(path).read_bytes()
+
+    def getvalue(self):
+        return self.data
+
+def page_name(prefix, label):
+    return f"{prefix}-{NON_WORD.sub('-', label.lower()).strip('-')}"
+
+# Minimal Markdown used by the section texts: bold only
+def markdown_to_html(text):
+    return re.sub(r'\*\*(.+?)\*\*', r'<strong>\1</strong>', html.escape(text))
+
+def render_items_html(items, image_dir):
+    parts = []
+    for item in items:
+        kind = item[0]
+        if kind == 'chart':
+            parts.append(item[1].to_html(full_html=False, include_plotlyjs=False))
+            if image_dir is not None:
+                item[1].write_image(image_dir / f"{NON_WORD.sub('_', item[2])}.png")
+        elif kind == 'table':
+            parts.append(item[1].to_html())
+        elif kind == 'markdown':
+            parts.append(f"<p>{markdown_to_html(item[1])}</p>")
+        elif kind == 'info':
+            parts.append(f"<p class=\"info\">{html.escape(item[1])}</p>")
+        elif kind == 'pages':
+            # Static pages have no pager, so every page is written out
+            _, _, page_count, build_page = item
+            for page in range(1, page_count + 1):
+                parts.extend(render_items_html(build_page(page), image_dir))
+    return parts
+
+def render_section_html(section, data, image_dir):
+    parts = [f"<h2 id=\"{section['anchor']}\">{html.escape(section['title'])}</h2>",
+             f"<p>{markdown_to_html(section['description'].format_map(data))}</p>"]
+    for label, build in section['panels']:
+        if label is not None:
+            parts.append(f"<h3>{html.escape(label)}</h3>")
+        parts.extend(render_items_html(build(data), image_dir))
+    if 'footnote' in section:
+        parts.append(f"<p>{markdown_to_html(section['footnote'])}</p>")
+    return parts
+
+def init_worker(context):
+    WORKER_CONTEXT.update(context)
+
+# Render one report page; column/label select the unit, None renders the whole university
+def render_page(name, title, column, label):
+    context = WORKER_CONTEXT
+    filters = dict.fromkeys(FILTER_KEYS, [])
+    if column is not None:
+        filters[UNIT_FILTERS[column][0]] = [label]
+    data = SectionData(context['section_context'], filters=filters)
+    image_dir = None
+    if context['images']:
+        image_dir = context['output'] / name
+        image_dir.mkdir(exist_ok=True)
+    body = []
+    for section in REPORT_SECTIONS:
+        # Batch pages use each section option's default choice
+        for option, (_, choices) in section.get('options', {}).items():
+            data[option] = choices[0]
+        body.extend(render_section_html(section, data, image_dir))
+    path = context['output'] / f"{name}.html"
+    path.write_text(PAGE_TEMPLATE.format(title=html.escape(title), body='\n'.join(body)), encoding='utf-8')
+    return path
+
+def render_index(output, pages, years_text):
+    groups = {'Genel': [], 'Fakülteler': [], 'Bölümler': []}
+    for name, title, column, _ in pages:
+        group = 'Genel' if column is None else 'Fakülteler' if column == 'Faculty' else 'Bölümler'
+        groups[group].append(f"<li><a href=\"{name}.html\">{html.escape(title)}</a></li>")
+    body = ''.join(f"<h2>{group}</h2><ul>{''.join(links)}</ul>" for group, links in groups.items() if links)
+    index = output / 'index.html'
+    index.write_text(PAGE_TEMPLATE.format(title=html.escape(f"Araştırma Yayınları Raporu ({years_text})"), body=body),
+                     encoding='utf-8')
+    return index
+
+def parse_args(argv):
+    parser = argparse.ArgumentParser(description="Her fakülte ve bölüm için statik HTML yayın raporu oluşturur.")
+    parser.add_argument('files', nargs='+', help="Yıllık Excel dosyaları (.xlsx)")
+    parser.add_argument('--output', default='rapor', help="Çıktı klasörü (varsayılan: rapor)")
+    parser.add_argument('--workers', type=int, default=os.cpu_count() or 1, help="Paralel süreç sayısı")
+    parser.add_argument('--consecutive', action='store_true', help="Değişimi ardışık yıllar arasında hesapla")
+    parser.add_argument('--base-year', help="Karşılaştırmanın başlangıç yılı (varsayılan: sondan ikinci yıl)")
+    parser.add_argument('--target-year', help="Karşılaştırmanın bitiş yılı (varsayılan: son yıl)")
+    parser.add_argument('--images', action='store_true', help="Grafikleri PNG olarak da kaydet (kaleido gerekir)")
+    args = parser.parse_args(argv)
+    if args.images and importlib.util.find_spec('kaleido') is None:
+        parser.error("--images için kaleido paketi kurulu olmalıdır")
+    return args
+
+def main(argv=None):
+    args = parse_args(argv)
+    started = time.perf_counter()
+    df, removed_df, cube, label_indexes, filter_indexes, unmatched_titles, unit_matches, dataset_key, error = load_and_process_data(
+        [LocalFile(path) for path in args.files])
+    if error:
+        print(f"Dosyalar işlenirken hata oluştu: {error}", file=sys.stderr)
+        return 1
+
+    years = sorted(df['Year'].unique())
+    base_year = args.base_year or years[max(len(years) - 2, 0)]
+    target_year = args.target_year or years[-1]
+    for year in (base_year, target_year):
+        if year not in years:
+            print(f"{year} yılı verilerde bulunmuyor", file=sys.stderr)
+            return 1
+    mode = "Ardışık Yıllar" if args.consecutive else "Seçili Yıl Çifti"
+    comparison_pairs = build_comparison_pairs(years, mode, base_year, target_year)
+    compared_years = sorted({year for pair in comparison_pairs for year in pair}) or years
+    years_text = describe_years(years)
+
+    output = Path(args.output)
+    output.mkdir(parents=True, exist_ok=True)
+    (output / 'plotly.min.js').write_text(get_plotlyjs(), encoding='utf-8')
+
+    section_context = dict(df=df, cube=cube, label_indexes=label_indexes, dataset_key=dataset_key, years=years,
+                           years_text=years_text, comparison_pairs=comparison_pairs, compared_years=compared_years,
+                           compared_years_text=describe_years(compared_years), year_color_map=build_year_color_map(years),
+                           filter_indexes=filter_indexes)
+    pages = [('genel', f"Tüm Birimler ({years_text})", None, None)]
+    for column, (_, prefix, mapping) in UNIT_FILTERS.items():
+        present = present_unit_labels(cube[column], label_indexes[column])
+        for label in sorted((unit for unit in mapping if unit and unit in present), key=str.lower):
+            pages.append((page_name(prefix, label), f"{label} ({years_text})", column, label))
+
+    context = {'section_context': section_context, 'output': output, 'images': args.images}
+    # Units fan out across processes; each worker receives the dataset once through the initializer
+    with ProcessPoolExecutor(max_workers=max(1, min(args.workers, len(pages))), initializer=init_worker,
+                             initargs=(context,)) as pool:
+        futures = [pool.submit(render_page, *page) for page in pages]
+        for done, future in enumerate(futures, start=1):
+            print(f"[{done}/{len(pages)}] {future.result()}")
+    index = render_index(output, pages, years_text)
+    print(f"{len(pages)} sayfa {time.perf_counter() - started:.1f} sn içinde oluşturuldu: {index}")
+    return 0
+
+if __name__ == '__main__':
+    sys.exit(main())
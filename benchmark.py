@@ -0,0 +1,215 @@
+# Benchmark suite for the load-filter-render pipeline on synthetic workbooks.
+# Each stage is timed separately at several dataset sizes and written to a JSON file
+# that can be compared against an earlier run with --compare.
+#
+#   python benchmark.py --sizes 1000 10000 100000 --output benchmark_results.json
+import argparse
+import json
+import platform
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime, timezone
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+import plotly
+
+from figure_payload import figure_json
+import processing
+from processing import build_filter_index, filter_rows, frame_memory, load_and_process_data
+from sections import (FILTER_KEYS, REPORT_SECTIONS, TREND_PANELS, SectionData, apply_filters, build_comparison_pairs,
+                      build_year_color_map, describe_years)
+from synthetic_data import generate_dataset, workbook_bytes
+
+# Upload-like workbook held in memory
+class MemoryFile:
+    def __init__(self, name, data):
+        self.name = name
+        self.data = data
+
+    def getvalue(self):
+        return self.data
+
+# Best wall-clock time of repeat calls and the last result
+def timed(function, repeat):
+    best, result = float('inf'), None
+    for _ in range(repeat):
+        started = time.perf_counter()
+        result = function()
+        best = min(best, time.perf_counter() - started)
+    return best, result
+
+# Every item of a panel, with all pages of paged items built
+def build_all_items(items):
+    built = []
+    for item in items:
+        if item[0] == 'pages':
+            for page in range(1, item[2] + 1):
+                built.extend(build_all_items(item[3](page)))
+        else:
+            built.append(item)
+    return built
+
+# Bytes the dashboard sends for the charts, as compact JSON
+def figure_bytes(items):
+    return sum(len(figure_json(item[1]).encode()) for item in items if item[0] == 'chart')
+
+# A filter state like the ones used in meetings: three faculties, minus the largest department and one title
+def benchmark_filters(cube, label_indexes):
+    faculties = cube.groupby('Faculty', observed=True)['Total Publications'].sum().nlargest(3).index
+    largest_department = cube.groupby('Department', observed=True)['Total Publications'].sum().idxmax()
+    filters = dict.fromkeys(FILTER_KEYS, [])
+    filters['faculty_include'] = list(label_indexes['Faculty']['labels'][cube['Faculty'].cat.categories.get_indexer(faculties)])
+    filters['department_exclude'] = list(label_indexes['Department']['labels'][cube['Department'].cat.categories.get_indexer([largest_department])])
+    filters['title_exclude'] = ['Prof. Dr.']
+    return filters
+
+def benchmark_size(rows, years, repeat, seed):
+    frames = generate_dataset(max(1, rows // len(years)), years, seed=seed)
+    files = [MemoryFile(f"yayinlar_{frame['Year'].iloc[0]}.xlsx", workbook_bytes(frame)) for frame in frames]
+    results = []
+
+    def record(stage, seconds, **extra):
+        results.append({'rows': rows, 'stage': stage, 'seconds': round(seconds, 6), **extra})
+        print(f"{rows:>8} {stage:<45} {seconds * 1000:>10.1f} ms")
+
+    # Cold loads parse and clean into an empty disk cache; the validation input is captured on the way
+    validation_inputs = []
+    check_and_remove_errors = processing.check_and_remove_errors
+
+    def capturing_check(df):
+        validation_inputs.append(df.copy())
+        return check_and_remove_errors(df)
+
+    # Files a load builds name and filter indexes for; the other files' indexes come from the disk cache
+    indexed_files = []
+    build_name_index = processing.build_name_index
+
+    def counting_name_index(df):
+        indexed_files.append(len(df))
+        return build_name_index(df)
+
+    def cold_load():
+        processing.CACHE_DIR = Path(tempfile.mkdtemp(dir=cache_root))
+        return load_and_process_data(files)
+
+    cache_dir = processing.CACHE_DIR
+    with tempfile.TemporaryDirectory() as cache_root:
+        processing.check_and_remove_errors = capturing_check
+        processing.build_name_index = counting_name_index
+        try:
+            seconds, loaded = timed(cold_load, repeat)
+            df, removed_df, cube, label_indexes, filter_indexes, unmatched_titles, unit_matches, dataset_key, error = loaded
+            if error:
+                raise RuntimeError(error)
+            memory = frame_memory(df)
+            record('load_and_process_data (cold)', seconds, processed_rows=len(df), cube_rows=len(cube),
+                   df_bytes=memory['compact'], df_wide_bytes=memory['wide'])
+            indexed_files.clear()
+            seconds, _ = timed(lambda: load_and_process_data(files), repeat)
+            record('load_and_process_data (disk cache)', seconds, indexed_files=len(indexed_files) / repeat)
+            # A corrected last-year file: only that file misses the cache, so each repeat gets its own variant
+            replacements = iter([MemoryFile(files[-1].name, workbook_bytes(generate_dataset(
+                max(1, rows // len(years)), years, seed=seed + attempt)[-1])) for attempt in range(1, repeat + 1)])
+            indexed_files.clear()
+            seconds, _ = timed(lambda: load_and_process_data(files[:-1] + [next(replacements)]), repeat)
+            record('load_and_process_data (one file replaced)', seconds, indexed_files=len(indexed_files) / repeat,
+                   indexed_rows=sum(indexed_files) / repeat)
+        finally:
+            processing.check_and_remove_errors = check_and_remove_errors
+            processing.build_name_index = build_name_index
+            processing.CACHE_DIR = cache_dir
+    # One call per file of the first cold load, so the timing covers the same rows as the findings
+    file_inputs = validation_inputs[:len(files)]
+    seconds, _ = timed(lambda: [check_and_remove_errors(frame.copy()) for frame in file_inputs], repeat)
+    record('check_and_remove_errors', seconds, findings=len(removed_df), validated_rows=sum(map(len, file_inputs)))
+
+    # A rebuild over the whole dataset, for comparison with the per-file indexes the loads merge
+    seconds, _ = timed(lambda: {'df': build_filter_index(df), 'cube': build_filter_index(cube)}, repeat)
+    record('build_filter_index', seconds)
+    filters = benchmark_filters(cube, label_indexes)
+    seconds, _ = timed(lambda: filter_rows(filter_indexes['df'], filters, label_indexes), repeat)
+    record('filter_rows (df)', seconds)
+    seconds, _ = timed(lambda: (apply_filters(df, filter_indexes['df'], filters, label_indexes),
+                                apply_filters(cube, filter_indexes['cube'], filters, label_indexes)), repeat)
+    record('apply_filters (df + cube)', seconds)
+
+    years = sorted(df['Year'].unique())
+    comparison_pairs = build_comparison_pairs(years, "Seçili Yıl Çifti", years[max(len(years) - 2, 0)], years[-1])
+    compared_years = sorted({year for pair in comparison_pairs for year in pair}) or years
+    context = dict(df=df, cube=cube, label_indexes=label_indexes, dataset_key=dataset_key, years=years,
+                   years_text=describe_years(years), comparison_pairs=comparison_pairs, compared_years=compared_years,
+                   compared_years_text=describe_years(compared_years), year_color_map=build_year_color_map(years),
+                   filter_indexes=filter_indexes)
+
+    def section_data():
+        data = SectionData(context, filters=filters)
+        for key in ('year_rollup', 'faculty_rollup', 'dept_rollup', 'filtered_df'):
+            data[key]
+        for section in REPORT_SECTIONS:
+            for option, (_, choices) in section.get('options', {}).items():
+                data[option] = choices[0]
+        return data
+
+    seconds, data = timed(section_data, repeat)
+    record('roll-ups', seconds)
+    sections = [{'anchor': 'ozet-trendleri', 'panels': TREND_PANELS}] + REPORT_SECTIONS
+    for section in sections:
+        seconds, items = timed(lambda: [item for _, build in section['panels'] for item in build_all_items(build(data))], repeat)
+        record(f"section {section['anchor']}", seconds, figures=sum(item[0] == 'chart' for item in items),
+               figure_bytes=figure_bytes(items))
+    return results
+
+def environment():
+    try:
+        commit = subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], capture_output=True, text=True,
+                                cwd=Path(__file__).parent, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        commit = None
+    return {
+        'timestamp': datetime.now(timezone.utc).isoformat(timespec='seconds'),
+        'commit': commit,
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'pandas': pd.__version__,
+        'numpy': np.__version__,
+        'plotly': plotly.__version__,
+    }
+
+def compare(results, previous_path):
+    previous = {(r['rows'], r['stage']): r['seconds'] for r in json.loads(Path(previous_path).read_text())['results']}
+    print(f"\n{'satır':>8} {'aşama':<45} {'önceki':>10} {'şimdi':>10} {'oran':>7}")
+    for result in results:
+        before = previous.get((result['rows'], result['stage']))
+        if before:
+            print(f"{result['rows']:>8} {result['stage']:<45} {before * 1000:>8.1f}ms {result['seconds'] * 1000:>8.1f}ms "
+                  f"{result['seconds'] / before:>6.2f}x")
+
+def parse_args(argv):
+    parser = argparse.ArgumentParser(description="Yükleme, filtreleme ve bölüm oluşturma adımlarını ölçer.")
+    parser.add_argument('--sizes', nargs='+', type=int, default=[1_000, 10_000, 100_000], help="Toplam satır sayıları")
+    parser.add_argument('--years', nargs='+', type=int, default=[2022, 2023, 2024], help="Üretilecek yıllar")
+    parser.add_argument('--repeat', type=int, default=3, help="Her ölçümün tekrar sayısı (en iyisi raporlanır)")
+    parser.add_argument('--seed', type=int, default=0, help="Rastgele sayı tohumu")
+    parser.add_argument('--output', default='benchmark_results.json', help="Sonuç dosyası")
+    parser.add_argument('--compare', help="Karşılaştırılacak önceki sonuç dosyası")
+    return parser.parse_args(argv)
+
+def main(argv=None):
+    args = parse_args(argv)
+    years = [str(year) for year in args.years]
+    results = []
+    for rows in args.sizes:
+        results.extend(benchmark_size(rows, years, args.repeat, args.seed))
+    Path(args.output).write_text(json.dumps({'environment': environment(), 'results': results}, indent=2,
+                                            ensure_ascii=False), encoding='utf-8')
+    print(f"Sonuçlar yazıldı: {args.output}")
+    if args.compare:
+        compare(results, args.compare)
+    return 0
+
+if __name__ == '__main__':
+    sys.exit(main())
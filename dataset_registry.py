@@ -0,0 +1,83 @@
+# Server-wide registry of processed datasets, shared read-only by every session that uploads the same files.
+# Sessions hold a lease on the dataset they display; unleased datasets are evicted least recently used
+# first once the registry exceeds its memory budget. Free of Streamlit like processing.py.
+import threading
+import weakref
+from collections import OrderedDict
+
+from processing import load_and_process_data, upload_cache_key
+
+# One processed upload set. Frames are never modified after loading; with pandas copy-on-write,
+# filtered views taken by sessions cannot write through to them either.
+class Dataset:
+    def __init__(self, key, df, removed_df, cube, label_indexes, filter_indexes, unmatched_titles, unit_matches):
+        self.key = key
+        self.df = df
+        self.removed_df = removed_df
+        self.cube = cube
+        self.label_indexes = label_indexes
+        self.unmatched_titles = unmatched_titles
+        self.unit_matches = unit_matches
+        self.filter_indexes = filter_indexes
+        frames = (df, removed_df, cube, unmatched_titles, unit_matches)
+        self.nbytes = (sum(int(frame.memory_usage(deep=True).sum()) for frame in frames) +
+                       sum(bitsets.nbytes for index in self.filter_indexes.values()
+                           for column, bitsets in index.items() if column != 'rows'))
+
+# A session's reference to a dataset; the registry sees it go away when the session drops it
+class DatasetLease:
+    def __init__(self, dataset):
+        self.dataset = dataset
+
+class DatasetRegistry:
+    def __init__(self, max_bytes):
+        self.max_bytes = max_bytes
+        self.entries = OrderedDict()
+        self.lock = threading.Lock()
+
+    # Lease for the processed files, loading them at most once even when sessions upload them concurrently.
+    # held is the session's current lease, reused when it is for the same files. Returns (lease, error)
+    # like load_and_process_data returns its error.
+    def acquire(self, files, held=None):
+        key = upload_cache_key(files)
+        with self.lock:
+            if held is not None and held.dataset.key == key and key in self.entries:
+                self.entries.move_to_end(key)
+                return held, None
+            entry = self.entries.get(key)
+            if entry is None:
+                entry = self.entries[key] = {'dataset': None, 'leases': weakref.WeakSet(), 'loading': threading.Lock()}
+            self.entries.move_to_end(key)
+        with entry['loading']:
+            if entry['dataset'] is None:
+                *loaded, dataset_key, error = load_and_process_data(files)
+                if error:
+                    with self.lock:
+                        if self.entries.get(key) is entry:
+                            del self.entries[key]
+                    return None, error
+                entry['dataset'] = Dataset(dataset_key, *loaded)
+            lease = DatasetLease(entry['dataset'])
+            with self.lock:
+                entry['leases'].add(lease)
+                self.evict()
+        return lease, None
+
+    def used_bytes(self):
+        return sum(entry['dataset'].nbytes for entry in self.entries.values() if entry['dataset'] is not None)
+
+    # Called with the lock held; datasets that are still leased or loading are never evicted
+    def evict(self):
+        used = self.used_bytes()
+        for key, entry in list(self.entries.items()):
+            if used <= self.max_bytes:
+                break
+            if entry['dataset'] is not None and not entry['leases']:
+                used -= entry['dataset'].nbytes
+                del self.entries[key]
+
+    def stats(self):
+        with self.lock:
+            loaded = [entry for entry in self.entries.values() if entry['dataset'] is not None]
+            return {'datasets': len(loaded), 'leases': sum(len(entry['leases']) for entry in loaded),
+                    'bytes': self.used_bytes(), 'max_bytes': self.max_bytes}
@@ -0,0 +1,105 @@
+# Excel export of the aggregates behind the report sections for one filter state.
+# Sheets are written row by row with openpyxl's write-only mode, so the workbook is never held
+# as an object model; free of Streamlit so it can run on the download thread.
+from io import BytesIO
+
+import numpy as np
+import pandas as pd
+from openpyxl import Workbook
+
+from metrics import DIVERSITY_METRICS, QUARTILE_COLUMNS
+from processing import pub_type_labels, pub_types, resolve_unit_labels
+from sections import FILTER_KEYS, UNIT_VIEWS
+
+FILTER_LABELS = {
+    'faculty_include': "Fakülte (Dahil)",
+    'department_include': "Bölüm (Dahil)",
+    'title_include': "Unvan (Dahil)",
+    'faculty_exclude': "Fakülte (Hariç)",
+    'department_exclude': "Bölüm (Hariç)",
+    'title_exclude': "Unvan (Hariç)",
+}
+COUNT_HEADERS = {**pub_type_labels, 'Total Publications': 'Toplam Yayın', 'Impact Score': 'Etki Puanı',
+                 'Total Researchers': 'Toplam Araştırmacı', 'Active Researchers': 'Aktif Araştırmacı'}
+
+# Header row, then one row per frame row; NaN becomes an empty cell
+def frame_rows(frame, headers):
+    yield [headers.get(column, column) for column in frame.columns]
+    for row in frame.itertuples(index=False, name=None):
+        yield [None if isinstance(value, float) and np.isnan(value) else value for value in row]
+
+def write_sheet(book, title, rows):
+    sheet = book.create_sheet(title)
+    for row in rows:
+        sheet.append(row)
+
+# Faculty and department roll-ups stacked with a unit type column
+def unit_frames(data, columns, build=None):
+    frames = []
+    for unit, view in UNIT_VIEWS.items():
+        frame = data[view['rollup']][[unit, 'Year'] + columns].rename(columns={unit: 'Birim', 'Year': 'Yıl'})
+        if build is not None:
+            frame = build(frame)
+        frames.append(frame.assign(**{'Birim Türü': view['label']}))
+    frame = pd.concat(frames, ignore_index=True)
+    return frame[['Birim Türü'] + [column for column in frame.columns if column != 'Birim Türü']]
+
+def unit_change_frame(data):
+    frames = []
+    for unit, view in UNIT_VIEWS.items():
+        year_pubs = data[view['rollup']].pivot(index=unit, columns='Year', values='Total Publications').fillna(0)
+        for pair_base, pair_target in data['comparison_pairs']:
+            pair = year_pubs.reindex(columns=[pair_base, pair_target], fill_value=0)
+            frames.append(pd.DataFrame({
+                'Birim Türü': view['label'],
+                'Birim': pair.index.astype(str),
+                'Dönem': f"{pair_base}-{pair_target}",
+                'Başlangıç': pair[pair_base].to_numpy(),
+                'Bitiş': pair[pair_target].to_numpy(),
+                'Değişim': (pair[pair_target] - pair[pair_base]).to_numpy(),
+            }))
+    if not frames:
+        return pd.DataFrame(columns=['Birim Türü', 'Birim', 'Dönem', 'Başlangıç', 'Bitiş', 'Değişim'])
+    return pd.concat(frames, ignore_index=True)
+
+def add_active_ratio(frame):
+    return frame.assign(**{'Aktif Araştırmacı Oranı': frame['Active Researchers'] / frame['Total Researchers']})
+
+def add_diversity(frame):
+    counts = frame[QUARTILE_COLUMNS].to_numpy()
+    diversity = {name: metric(counts) for name, metric in DIVERSITY_METRICS.items()}
+    return frame.drop(columns=QUARTILE_COLUMNS).assign(**diversity)
+
+# Cube rows (department x title x year), streamed straight from the filtered cube
+def detail_rows(data):
+    cube = data['filtered_cube']
+    faculties = resolve_unit_labels(cube['Faculty'], data['label_indexes']['Faculty'])
+    departments = resolve_unit_labels(cube['Department'], data['label_indexes']['Department'])
+    measures = pub_types + ['Total Publications', 'Impact Score', 'Total Researchers', 'Active Researchers']
+    yield ['Fakülte', 'Bölüm', 'Unvan', 'Yıl'] + [COUNT_HEADERS[column] for column in measures]
+    columns = [faculties, departments, cube['Title'], cube['Year']] + [cube[column] for column in measures]
+    for row in zip(*columns):
+        yield [None if isinstance(value, float) and np.isnan(value) else value for value in row]
+
+def write_export(data, target):
+    book = Workbook(write_only=True)
+    write_sheet(book, "Filtreler", [["Filtre", "Seçim"]] +
+                [[FILTER_LABELS[key], ", ".join(data['filters'][key]) or "Tümü"] for key in FILTER_KEYS] +
+                [["Yıllar", ", ".join(data['years'])],
+                 ["Karşılaştırma", ", ".join(f"{base}-{target}" for base, target in data['comparison_pairs']) or "Yok"]])
+    write_sheet(book, "Yıllık Tür Dağılımı", frame_rows(
+        data['year_rollup'][['Year'] + pub_types + ['Total Publications']].rename(columns={'Year': 'Yıl'}), COUNT_HEADERS))
+    write_sheet(book, "Birim Tür Dağılımı", frame_rows(unit_frames(data, pub_types + ['Total Publications']), COUNT_HEADERS))
+    write_sheet(book, "Birim Değişimi", frame_rows(unit_change_frame(data), {}))
+    write_sheet(book, "Etki Puanı", frame_rows(unit_frames(data, ['Total Publications', 'Impact Score']), COUNT_HEADERS))
+    write_sheet(book, "Aktif Araştırmacı Oranı", frame_rows(
+        unit_frames(data, ['Total Researchers', 'Active Researchers'], add_active_ratio), COUNT_HEADERS))
+    write_sheet(book, "Çeşitlilik İndeksi", frame_rows(unit_frames(data, QUARTILE_COLUMNS, add_diversity), {}))
+    write_sheet(book, "Bölüm Unvan Yıl Detayı", detail_rows(data))
+    book.save(target)
+
+# Workbook bytes for a download; only the compressed file is kept in memory
+def export_workbook(data):
+    buffer = BytesIO()
+    write_export(data, buffer)
+    return buffer.getvalue()
@@ -0,0 +1,73 @@
+# Compact JSON for figures sent to the browser: the template keeps only the trace types a figure draws,
+# and typed arrays are narrowed to the smallest dtype that holds their values exactly. The output is
+# what plotly.io.to_json gives for the compacted figure, so its length is the chart's payload size.
+# Free of Streamlit like processing.py.
+import base64
+
+import numpy as np
+import plotly.io as pio
+
+# Template layout entries for subplot kinds, dropped when no trace of the figure is drawn on one
+SUBPLOT_TRACE_TYPES = {
+    'geo': {'scattergeo', 'choropleth'},
+    'mapbox': {'scattermapbox', 'choroplethmapbox', 'densitymapbox'},
+    'map': {'scattermap', 'choroplethmap', 'densitymap'},
+    'polar': {'scatterpolar', 'scatterpolargl', 'barpolar'},
+    'ternary': {'scatterternary'},
+    'scene': {'scatter3d', 'surface', 'mesh3d', 'cone', 'streamtube', 'volume', 'isosurface'},
+}
+
+# Integer dtypes plotly.js has typed arrays for, smallest first; it has none for 64-bit integers
+INTEGER_DTYPES = [np.dtype(name) for name in ('u1', 'i1', 'u2', 'i2', 'u4', 'i4')]
+TYPED_DTYPES = {name: np.dtype(name) for name in ('i1', 'u1', 'i2', 'u2', 'i4', 'u4', 'f4', 'f8')}
+
+def trim_template(spec):
+    template = spec.get('layout', {}).get('template')
+    if not template:
+        return
+    trace_types = {trace.get('type', 'scatter') for trace in spec.get('data', [])}
+    template['data'] = {kind: traces for kind, traces in template.get('data', {}).items() if kind in trace_types}
+    for subplot, kinds in SUBPLOT_TRACE_TYPES.items():
+        if not trace_types & kinds:
+            template.get('layout', {}).pop(subplot, None)
+
+# Integral floats become the smallest integer dtype, other float64 arrays float32 when no value changes
+def narrow(values):
+    if values.dtype.kind == 'f' and values.size and np.isfinite(values).all() and (values == np.round(values)).all():
+        low, high = values.min(), values.max()
+        for dtype in INTEGER_DTYPES:
+            info = np.iinfo(dtype)
+            if info.min <= low and high <= info.max:
+                return values.astype(dtype)
+    if values.dtype == np.float64:
+        single = values.astype(np.float32)
+        if np.array_equal(single, values, equal_nan=True):
+            return single
+    return values
+
+# Plotly Express stores its columns as typed array specs already; the figure's other arrays are numpy arrays
+def compact_typed_array(array):
+    dtype = TYPED_DTYPES.get(array['dtype'])
+    if dtype is None:
+        return array
+    values = narrow(np.frombuffer(base64.b64decode(array['bdata']), dtype=dtype))
+    if values.dtype == dtype:
+        return array
+    return {**array, 'dtype': values.dtype.str[1:], 'bdata': base64.b64encode(values.tobytes()).decode('ascii')}
+
+def compact_arrays(value):
+    if isinstance(value, np.ndarray):
+        return narrow(value) if value.dtype.kind == 'f' else value
+    if isinstance(value, dict):
+        if 'bdata' in value and 'dtype' in value:
+            return compact_typed_array(value)
+        return {key: compact_arrays(item) for key, item in value.items()}
+    if isinstance(value, (list, tuple)):
+        return [compact_arrays(item) for item in value]
+    return value
+
+# Compact JSON of a figure, ready for go.Figure(json.loads(...), _validate=False)
+def figure_json(figure):
+    spec = compact_arrays(figure.to_dict())
+    trim_template(spec)
+    return pio.to_json(spec, validate=False)
@@ -0,0 +1,67 @@
+# Workbook ingestion for the publication dashboard.
+# Kept outside the Streamlit script so process pool workers can import it.
+import multiprocessing
+import os
+import re
+from concurrent.futures import ProcessPoolExecutor
+from io import BytesIO
+
+import pandas as pd
+
+YEAR_PATTERN = re.compile(r'(?<!\d)((?:19|20)\d{2})(?!\d)')
+YEAR_COLUMNS = ['Yıl', 'Year']
+
+# The dashboard server is multi-threaded (session threads, the precompute pool), and a forked worker can
+# inherit a lock another thread held at fork time; workers start from a clean forkserver process instead
+# (spawn where there is no forkserver, e.g. Windows)
+if 'forkserver' in multiprocessing.get_all_start_methods():
+    WORKER_CONTEXT = multiprocessing.get_context('forkserver')
+    # Workers fork from a server that has imported pandas already
+    WORKER_CONTEXT.set_forkserver_preload([__name__])
+else:
+    WORKER_CONTEXT = multiprocessing.get_context('spawn')
+
+def year_from_text(text):
+    match = YEAR_PATTERN.search(str(text))
+    return match.group(1) if match else None
+
+# Parse one workbook and tag its rows with the year taken from the file name,
+# a 'Yıl' column or the sheet name, in that order
+def parse_workbook(name, data):
+    with pd.ExcelFile(BytesIO(data)) as book:
+        sheet_name = book.sheet_names[0]
+        df = book.parse(sheet_name)
+    df.columns = df.columns.astype(str).str.strip()
+    year = year_from_text(name)
+    year_column = next((c for c in YEAR_COLUMNS if c in df.columns), None)
+    if year is None and year_column is not None:
+        df['Year'] = df[year_column].map(year_from_text)
+        if df['Year'].isna().any():
+            raise ValueError(f"{name}: '{year_column}' sütununda yıl okunamayan satırlar var")
+    else:
+        year = year or year_from_text(sheet_name)
+        if year is None:
+            raise ValueError(f"{name}: yıl dosya adından, 'Yıl' sütunundan veya sayfa adından okunamadı")
+        df['Year'] = year
+    if year_column is not None and year_column != 'Year':
+        df = df.drop(columns=year_column)
+    return df
+
+# Parse all workbooks concurrently, in input order; wall-clock time follows the slowest file
+def parse_workbooks(files):
+    names = [name for name, _ in files]
+    payloads = [data for _, data in files]
+    if len(files) == 1:
+        return [parse_workbook(names[0], payloads[0])]
+    with ProcessPoolExecutor(max_workers=min(len(files), os.cpu_count() or 1),
+                             mp_context=WORKER_CONTEXT) as pool:
+        return list(pool.map(parse_workbook, names, payloads))
+
+# Each year has to come from a single file
+def check_file_years(names, file_years):
+    seen_years = {}
+    for name, years in zip(names, file_years):
+        for year in years:
+            if year in seen_years:
+                raise ValueError(f"{year} yılı hem {seen_years[year]} hem {name} dosyasında bulunuyor")
+            seen_years[year] = name
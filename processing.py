@@ -0,0 +1,831 @@
+# Loading, cleaning and aggregation of the publication workbooks.
+# Free of Streamlit so the dashboard and the batch report generator share it.
+import hashlib
+import json
+import os
+import re
+import shutil
+import threading
+import uuid
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+from pandas.api.types import union_categoricals
+
+from ingestion import check_file_years, parse_workbooks
+from metrics import QUARTILE_COLUMNS
+
+# Faculty and Department mappings
+FACULTY_MAPPING = {
+    'Mühendislik Fakültesi': 'Mühendislik Fakültesi',
+    'İktisadi ve İdari Bilimler Fakültesi': 'İktisadi ve İdari Bilimler Fakültesi',
+    'Fen Edebiyat Fakültesi': 'Fen Edebiyat Fakültesi',
+    'Eğitim Fakültesi': 'Eğitim Fakültesi',
+    'Mimarlık Fakültesi': 'Mimarlık Fakültesi',
+    'Yabancı Diller Yüksek Okulu': 'Yabancı Diller Yüksek Okulu',
+    'Rektörlük': 'Rektörlük',
+    'Fen Bilimleri Enstitüsü': 'Fen Bilimleri Enstitüsü',
+    'Deniz Bilimleri Enstitüsü': 'Deniz Bilimleri Enstitüsü',
+    'Uygulamalı Matematik Enstitüsü': 'Uygulamalı Matematik Enstitüsü',
+    'Sosyal Bilimler Enstitüsü': 'Sosyal Bilimler Enstitüsü',
+    'Enformatik Enstitüsü': 'Enformatik Enstitüsü',
+    'Meslek Yüksek Okulu': 'Meslek Yüksek Okulu'
+}
+FACULTY_ORDER = sorted(FACULTY_MAPPING.keys())
+
+DEPARTMENT_MAPPING = {
+    'Aktüerya Bilimleri Anabilim Dalı': 'Aktüerya Bilimleri Anabilim Dalı',
+    'Beden Eğitimi ve Spor Bölümü': 'Beden Eğitimi ve Spor Bölümü',
+    'Bilgisayar Mühendisliği Bölümü': 'Bilgisayar Mühendisliği Bölümü',
+    'Bilgisayar ve Öğretim Teknolojileri Eğitimi Bölümü': 'Bilgisayar ve Öğretim Teknolojileri Eğitimi Bölümü',
+    'Bilim ve Teknoloji Politikası Çalışmaları Anabilim Dalı': 'Bilim ve Teknoloji Politikası Çalışmaları Anabilim Dalı',
+    'Bilimsel Hesaplama Anabilim Dalı': 'Bilimsel Hesaplama Anabilim Dalı',
+    'Bilişim Sistemleri Anabilim Dalı': 'Bilişim Sistemleri Anabilim Dalı',
+    'Bilişsel Bilimler Anabilim Dalı': 'Bilişsel Bilimler Anabilim Dalı',
+    'Biyolojik Bilimler Bölümü': 'Biyolojik Bilimler Bölümü',
+    'Çevre Mühendisliği Bölümü': 'Çevre Mühendisliği Bölümü',
+    'Deniz Bilimleri Anabilim Dalı': 'Deniz Bilimleri Anabilim Dalı',
+    'Deniz Biyolojisi ve Balıkçılık Anabilim Dalı': 'Deniz Biyolojisi ve Balıkçılık Anabilim Dalı',
+    'Deniz Jeolojisi ve Jeofiziği Anabilim Dalı': 'Deniz Jeolojisi ve Jeofiziği Anabilim Dalı',
+    'Eğitim Bilimleri Bölümü': 'Eğitim Bilimleri Bölümü',
+    'Elektrik ve Elektronik Mühendisliği Bölümü': 'Elektrik ve Elektronik Mühendisliği Bölümü',
+    'Endüstri Mühendisliği Bölümü': 'Endüstri Mühendisliği Bölümü',
+    'Endüstriyel Tasarım Bölümü': 'Endüstriyel Tasarım Bölümü',
+    'Fen Bilimleri Enstitüsü': 'Fen Bilimleri Enstitüsü',
+    'Felsefe Bölümü': 'Felsefe Bölümü',
+    'Finansal Matematik Anabilim Dalı': 'Finansal Matematik Anabilim Dalı',
+    'Fizik Bölümü': 'Fizik Bölümü',
+    'Gıda Mühendisliği Bölümü': 'Gıda Mühendisliği Bölümü',
+    'Havacılık ve Uzay Mühendisliği Bölümü': 'Havacılık ve Uzay Mühendisliği Bölümü',
+    'İktisat Bölümü': 'İktisat Bölümü',
+    'İnşaat Mühendisliği Bölümü': 'İnşaat Mühendisliği Bölümü',
+    'İstatistik Bölümü': 'İstatistik Bölümü',
+    'Jeoloji Mühendisliği Bölümü': 'Jeoloji Mühendisliği Bölümü',
+    'Kimya Bölümü': 'Kimya Bölümü',
+    'Kimya Mühendisliği Bölümü': 'Kimya Mühendisliği Bölümü',
+    'Kriptografi Anabilim Dalı': 'Kriptografi Anabilim Dalı',
+    'Maden Mühendisliği Bölümü': 'Maden Mühendisliği Bölümü',
+    'Makina Mühendisliği Bölümü': 'Makina Mühendisliği Bölümü',
+    'Matematik Bölümü': 'Matematik Bölümü',
+    'Matematik ve Fen Bilimleri Eğitimi Bölümü': 'Matematik ve Fen Bilimleri Eğitimi Bölümü',
+    'Meslek Yüksek Okulu': 'Meslek Yüksek Okulu',
+    'Metalurji ve Malzeme Mühendisliği Bölümü': 'Metalurji ve Malzeme Mühendisliği Bölümü',
+    'Mimarlık Bölümü': 'Mimarlık Bölümü',
+    'Modelleme ve Simülasyon Anabilim Dalı': 'Modelleme ve Simülasyon Anabilim Dalı',
+    'Modern Diller Bölümü': 'Modern Diller Bölümü',
+    'Mühendislik Bilimleri Bölümü': 'Mühendislik Bilimleri Bölümü',
+    'Müzik ve Güzel Sanatlar Bölümü': 'Müzik ve Güzel Sanatlar Bölümü',
+    'Petrol ve Doğal Gaz Mühendisliği Bölümü': 'Petrol ve Doğal Gaz Mühendisliği Bölümü',
+    'Psikoloji Bölümü': 'Psikoloji Bölümü',
+    'Sağlık Bilişimi Anabilim Dalı': 'Sağlık Bilişimi Anabilim Dalı',
+    'Siber Güvenlik Anabilim Dalı': 'Siber Güvenlik Anabilim Dalı',
+    'Siyaset Bilimi ve Kamu Yönetimi Bölümü': 'Siyaset Bilimi ve Kamu Yönetimi Bölümü',
+    'Sosyoloji Bölümü': 'Sosyoloji Bölümü',
+    'Şehir ve Bölge Planlama Bölümü': 'Şehir ve Bölge Planlama Bölümü',
+    'Tarih Bölümü': 'Tarih Bölümü',
+    'Temel Eğitim Bölümü': 'Temel Eğitim Bölümü',
+    'Türk Dili Bölümü': 'Türk Dili Bölümü',
+    'Uluslararası İlişkiler Bölümü': 'Uluslararası İlişkiler Bölümü',
+    'Veri Bilişimi Anabilim Dalı': 'Veri Bilişimi Anabilim Dalı',
+    'Yabancı Diller Bölümü': 'Yabancı Diller Bölümü',
+    'Yabancı Diller Eğitimi Bölümü': 'Yabancı Diller Eğitimi Bölümü',
+    '': 'Bilinmeyen'
+}
+DEPARTMENT_ORDER = sorted([d for d in DEPARTMENT_MAPPING.keys() if d])
+
+# English names of the units, used only by fuzzy unit matching
+FACULTY_ALIASES = {
+    'Faculty of Engineering': 'Mühendislik Fakültesi',
+    'Faculty of Economic and Administrative Sciences': 'İktisadi ve İdari Bilimler Fakültesi',
+    'Faculty of Arts and Sciences': 'Fen Edebiyat Fakültesi',
+    'Faculty of Education': 'Eğitim Fakültesi',
+    'Faculty of Architecture': 'Mimarlık Fakültesi',
+    'School of Foreign Languages': 'Yabancı Diller Yüksek Okulu',
+    'Rectorate': 'Rektörlük',
+    'Graduate School of Natural and Applied Sciences': 'Fen Bilimleri Enstitüsü',
+    'Institute of Marine Sciences': 'Deniz Bilimleri Enstitüsü',
+    'Institute of Applied Mathematics': 'Uygulamalı Matematik Enstitüsü',
+    'Graduate School of Social Sciences': 'Sosyal Bilimler Enstitüsü',
+    'Graduate School of Informatics': 'Enformatik Enstitüsü',
+    'Vocational School': 'Meslek Yüksek Okulu'
+}
+DEPARTMENT_ALIASES = {
+    'Actuarial Sciences': 'Aktüerya Bilimleri Anabilim Dalı',
+    'Physical Education and Sports': 'Beden Eğitimi ve Spor Bölümü',
+    'Computer Engineering': 'Bilgisayar Mühendisliği Bölümü',
+    'Computer Education and Instructional Technology': 'Bilgisayar ve Öğretim Teknolojileri Eğitimi Bölümü',
+    'Science and Technology Policy Studies': 'Bilim ve Teknoloji Politikası Çalışmaları Anabilim Dalı',
+    'Scientific Computing': 'Bilimsel Hesaplama Anabilim Dalı',
+    'Information Systems': 'Bilişim Sistemleri Anabilim Dalı',
+    'Cognitive Science': 'Bilişsel Bilimler Anabilim Dalı',
+    'Biological Sciences': 'Biyolojik Bilimler Bölümü',
+    'Environmental Engineering': 'Çevre Mühendisliği Bölümü',
+    'Marine Sciences': 'Deniz Bilimleri Anabilim Dalı',
+    'Marine Biology and Fisheries': 'Deniz Biyolojisi ve Balıkçılık Anabilim Dalı',
+    'Marine Geology and Geophysics': 'Deniz Jeolojisi ve Jeofiziği Anabilim Dalı',
+    'Educational Sciences': 'Eğitim Bilimleri Bölümü',
+    'Electrical and Electronics Engineering': 'Elektrik ve Elektronik Mühendisliği Bölümü',
+    'Industrial Engineering': 'Endüstri Mühendisliği Bölümü',
+    'Industrial Design': 'Endüstriyel Tasarım Bölümü',
+    'Graduate School of Natural and Applied Sciences': 'Fen Bilimleri Enstitüsü',
+    'Philosophy': 'Felsefe Bölümü',
+    'Financial Mathematics': 'Finansal Matematik Anabilim Dalı',
+    'Physics': 'Fizik Bölümü',
+    'Food Engineering': 'Gıda Mühendisliği Bölümü',
+    'Aerospace Engineering': 'Havacılık ve Uzay Mühendisliği Bölümü',
+    'Economics': 'İktisat Bölümü',
+    'Civil Engineering': 'İnşaat Mühendisliği Bölümü',
+    'Statistics': 'İstatistik Bölümü',
+    'Geological Engineering': 'Jeoloji Mühendisliği Bölümü',
+    'Chemistry': 'Kimya Bölümü',
+    'Chemical Engineering': 'Kimya Mühendisliği Bölümü',
+    'Cryptography': 'Kriptografi Anabilim Dalı',
+    'Mining Engineering': 'Maden Mühendisliği Bölümü',
+    'Mechanical Engineering': 'Makina Mühendisliği Bölümü',
+    'Mathematics': 'Matematik Bölümü',
+    'Mathematics and Science Education': 'Matematik ve Fen Bilimleri Eğitimi Bölümü',
+    'Vocational School': 'Meslek Yüksek Okulu',
+    'Metallurgical and Materials Engineering': 'Metalurji ve Malzeme Mühendisliği Bölümü',
+    'Architecture': 'Mimarlık Bölümü',
+    'Modeling and Simulation': 'Modelleme ve Simülasyon Anabilim Dalı',
+    'Modern Languages': 'Modern Diller Bölümü',
+    'Engineering Sciences': 'Mühendislik Bilimleri Bölümü',
+    'Music and Fine Arts': 'Müzik ve Güzel Sanatlar Bölümü',
+    'Petroleum and Natural Gas Engineering': 'Petrol ve Doğal Gaz Mühendisliği Bölümü',
+    'Psychology': 'Psikoloji Bölümü',
+    'Health Informatics': 'Sağlık Bilişimi Anabilim Dalı',
+    'Cyber Security': 'Siber Güvenlik Anabilim Dalı',
+    'Political Science and Public Administration': 'Siyaset Bilimi ve Kamu Yönetimi Bölümü',
+    'Sociology': 'Sosyoloji Bölümü',
+    'City and Regional Planning': 'Şehir ve Bölge Planlama Bölümü',
+    'History': 'Tarih Bölümü',
+    'Elementary Education': 'Temel Eğitim Bölümü',
+    'Turkish Language': 'Türk Dili Bölümü',
+    'International Relations': 'Uluslararası İlişkiler Bölümü',
+    'Data Informatics': 'Veri Bilişimi Anabilim Dalı',
+    'Foreign Languages': 'Yabancı Diller Bölümü',
+    'Foreign Language Education': 'Yabancı Diller Eğitimi Bölümü'
+}
+
+# Column mapping for new file layout
+COLUMN_MAPPING = {
+    'Unvan': 'Title',
+    'Ad Soyad': 'Name',
+    'Fakülte': 'Faculty',
+    'Bölüm': 'Department',
+    'WoS ESCI İndeksinde Taranan Makale': 'ESCI Articles',
+    'Scopus Makale (WoS SCIE, AHCI, SSCI, ESCI Taranmayan)': 'Scopus Articles',
+    'WoS Q1 Makale Sayısı': 'Q1 Articles',
+    'WoS Q2 Makale Sayısı': 'Q2 Articles',
+    'WoS Q3 Makale Sayısı': 'Q3 Articles',
+    'WoS Q4 Makale Sayısı': 'Q4 Articles',
+    'WoS Quartile Bulunmayan Makale Sayısı': 'Non-Quartile Articles',
+    # Optional, only used by the quartile total validation rule
+    'WoS Toplam Makale Sayısı': 'Reported WoS Total'
+}
+
+# Title order
+title_order = ["Arş. Gör.", "Öğr. Gör.", "Dr. Öğr. Üyesi", "Doç. Dr.", "Prof. Dr.", "Diğer"]
+
+# Publication types definition
+pub_types = ['ESCI Articles', 'Scopus Articles', 'Q1 Articles', 'Q2 Articles', 'Q3 Articles', 'Q4 Articles', 'Non-Quartile Articles']
+pub_type_labels = {
+    'ESCI Articles': 'ESCI Makaleleri',
+    'Scopus Articles': 'Scopus Makaleleri',
+    'Q1 Articles': 'Q1 Makaleleri',
+    'Q2 Articles': 'Q2 Makaleleri',
+    'Q3 Articles': 'Q3 Makaleleri',
+    'Q4 Articles': 'Q4 Makaleleri',
+    'Non-Quartile Articles': 'Çeyreklik Olmayan Makaleler'
+}
+
+# Title extraction: raw title spellings found in names and the canonical title they map to
+TITLE_ALIASES = {
+    "Prof. Dr.": "Prof. Dr.",
+    "Prof.": "Prof. Dr.",
+    "Doç. Dr.": "Doç. Dr.",
+    "Dr. Öğr. Üyesi": "Dr. Öğr. Üyesi",
+    "Öğr. Gör.": "Öğr. Gör.",
+    "Arş. Gör.": "Arş. Gör.",
+    "Asst. Prof.": "Dr. Öğr. Üyesi",
+    "Assoc. Prof.": "Doç. Dr.",
+    "Lect. PhD": "Öğr. Gör.",
+    "Res. Asst.": "Arş. Gör.",
+    "Araştırma Görevlisi": "Arş. Gör.",
+    "Öğretim Görevlisi": "Öğr. Gör.",
+    "Araştırmacı": "Diğer",
+    "İdari Personel": "Diğer"
+}
+# Single alternation, longest spelling first so "Prof. Dr." wins over "Prof."
+TITLE_PATTERN = re.compile('(' + '|'.join(re.escape(t) for t in sorted(TITLE_ALIASES, key=len, reverse=True)) + ')')
+# Name -> canonical title (NaN when unmatched), shared by every upload in this process. Session threads load
+# concurrently, so the cache is only touched under its lock and each call maps from its own dict.
+TITLE_CACHE = {}
+TITLE_CACHE_MAX_SIZE = 500_000
+TITLE_CACHE_LOCK = threading.Lock()
+
+def extract_titles(names):
+    unique_names = names.unique()
+    with TITLE_CACHE_LOCK:
+        titles_by_name = {name: TITLE_CACHE[name] for name in unique_names if name in TITLE_CACHE}
+    unseen = pd.Series([name for name in unique_names if name not in titles_by_name], dtype=object)
+    if len(unseen):
+        extracted = dict(zip(unseen, unseen.str.extract(TITLE_PATTERN, expand=False).map(TITLE_ALIASES)))
+        titles_by_name.update(extracted)
+        with TITLE_CACHE_LOCK:
+            if len(TITLE_CACHE) + len(extracted) > TITLE_CACHE_MAX_SIZE:
+                TITLE_CACHE.clear()
+            TITLE_CACHE.update(extracted)
+    titles = names.map(titles_by_name)
+    unmatched_titles = pd.DataFrame({'Ad Soyad': pd.unique(names[titles.isna()])})
+    return titles.fillna("Diğer"), unmatched_titles
+
+# Researcher identity: names are compared without titles, punctuation, extra whitespace and case.
+# Dotted/dotless I are folded the Turkish way first, since str.lower() turns 'İ' into 'i' plus a combining dot.
+TURKISH_CASEFOLD = str.maketrans({'İ': 'i', 'I': 'ı'})
+NAME_PUNCTUATION = re.compile(r'[^\w\s]')
+
+def normalize_name(name):
+    name = TITLE_PATTERN.sub(' ', name).translate(TURKISH_CASEFOLD).lower()
+    return ' '.join(NAME_PUNCTUATION.sub(' ', name).split())
+
+# Fuzzy unit matching: raw unit names missing from a mapping are resolved through a character-trigram index
+# over the canonical names and their aliases. Keys ignore case, Turkish letters, punctuation and generic unit
+# words, so 'fizik bolumu', 'Fizik' and 'Department of Physics' all reach 'Fizik Bölümü'.
+# Trigrams are weighted by inverse document frequency, so words many units share ('bilimleri', 'enstitüsü',
+# 'eğitim') count for little, and a match must lead the best other unit by UNIT_MATCH_MARGIN.
+# One typo costs a short name most of its trigrams, so names the trigrams reject are matched word by word:
+# every word must be in one unit's key, allowing one edit in words of UNIT_TYPO_MIN_LENGTH letters or more.
+UNIT_MATCH_THRESHOLD = float(os.environ.get('DASHBOARD_UNIT_MATCH_THRESHOLD', '0.7'))
+UNIT_MATCH_MARGIN = float(os.environ.get('DASHBOARD_UNIT_MATCH_MARGIN', '0.1'))
+UNIT_TYPO_MIN_LENGTH = 4
+ASCII_FOLD = str.maketrans('çğıöşüâîû', 'cgiosuaiu')
+UNIT_STOPWORDS = {'bolumu', 'bolum', 'anabilim', 'dali', 'abd', 've', 'fakultesi', 'department', 'dept', 'faculty',
+                  'of', 'and', 'the', 'fak'}
+# Abbreviations common in hand-typed sheets, expanded before matching
+UNIT_ABBREVIATIONS = {'muh': 'muhendisligi', 'eng': 'engineering', 'egt': 'egitimi', 'enst': 'enstitusu'}
+UNIT_MATCH_COLUMNS = {
+    'Faculty': ('Fakülte', FACULTY_MAPPING, FACULTY_ALIASES),
+    'Department': ('Bölüm', DEPARTMENT_MAPPING, DEPARTMENT_ALIASES),
+}
+# Column -> trigram index, built on first use and shared by every upload in this process
+UNIT_INDEXES = {}
+
+def unit_match_key(name):
+    words = NAME_PUNCTUATION.sub(' ', name.translate(TURKISH_CASEFOLD).lower().translate(ASCII_FOLD)).split()
+    return ' '.join(UNIT_ABBREVIATIONS.get(word, word) for word in words if word not in UNIT_STOPWORDS)
+
+def trigrams(key):
+    padded = f"  {key} "
+    return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+def unit_match_keys(mapping, aliases):
+    return {unit_match_key(raw) for raw in list(mapping) + list(aliases) if raw}
+
+# Inverted index: trigram -> ids of the match keys containing it, with the trigram's IDF weight. Document
+# frequencies count the keys of every unit column, so an institute's generic words weigh as little among
+# the departments as among the faculties. Trigrams no key contains get the weight of the rarest possible one.
+def build_unit_index(mapping, aliases):
+    canonical_by_key = {}
+    for raw, canonical in list(mapping.items()) + list(aliases.items()):
+        if raw:
+            canonical_by_key.setdefault(unit_match_key(raw), mapping.get(canonical, canonical))
+    keys = list(canonical_by_key)
+    postings = {}
+    for key_id, key in enumerate(keys):
+        for gram in trigrams(key):
+            postings.setdefault(gram, []).append(key_id)
+    vocabulary = set().union(*(unit_match_keys(mapping, aliases) for _, mapping, aliases in UNIT_MATCH_COLUMNS.values()))
+    frequencies = {}
+    for key in vocabulary:
+        for gram in trigrams(key):
+            frequencies[gram] = frequencies.get(gram, 0) + 1
+    weights = {gram: np.log((len(vocabulary) + 1) / (frequencies[gram] + 0.5)) for gram in postings}
+    canonical = np.array([canonical_by_key[key] for key in keys], dtype=object)
+    unit_codes, units = pd.factorize(canonical)
+    return {
+        'ids': {key: key_id for key_id, key in enumerate(keys)},
+        'canonical': canonical,
+        'units': unit_codes,
+        'unit_count': len(units),
+        'words': [key.split() for key in keys],
+        'sizes': np.array([sum(weights[gram] for gram in trigrams(key)) for key in keys]),
+        'postings': {gram: np.array(key_ids) for gram, key_ids in postings.items()},
+        'weights': weights,
+        'unseen_weight': np.log((len(vocabulary) + 1) / 0.5),
+    }
+
+def unit_index(column):
+    if column not in UNIT_INDEXES:
+        _, mapping, aliases = UNIT_MATCH_COLUMNS[column]
+        UNIT_INDEXES[column] = build_unit_index(mapping, aliases)
+    return UNIT_INDEXES[column]
+
+# Optimal string alignment distance of at most one: one substitution, insertion, deletion or transposition
+def within_one_edit(a, b):
+    if len(a) > len(b):
+        a, b = b, a
+    if len(b) - len(a) > 1:
+        return False
+    if len(a) < len(b):
+        i = next((i for i in range(len(a)) if a[i] != b[i]), len(a))
+        return a[i:] == b[i + 1:]
+    diff = [i for i in range(len(a)) if a[i] != b[i]]
+    return len(diff) <= 1 or (len(diff) == 2 and diff[1] == diff[0] + 1 and a[diff[0]] == b[diff[1]] and
+                               a[diff[1]] == b[diff[0]])
+
+def unit_word_matches(word, key_word):
+    return word == key_word or (min(len(word), len(key_word)) >= UNIT_TYPO_MIN_LENGTH and within_one_edit(word, key_word))
+
+# A trigram match also needs a counterpart in the key for each word of UNIT_TYPO_MIN_LENGTH letters or more:
+# a word within one edit, or one sharing at least half of its trigrams. 'Sağlık' has none in 'Fen Bilimleri
+# Enstitüsü', however much of the rest the two names share.
+def words_have_counterparts(key, key_words):
+    for word in key.split():
+        if len(word) < UNIT_TYPO_MIN_LENGTH or word in UNIT_STOPWORDS:
+            continue
+        grams = trigrams(word)
+        if not any(unit_word_matches(word, key_word) or
+                   2 * len(grams & trigrams(key_word)) >= 0.5 * (len(grams) + len(trigrams(key_word)))
+                   for key_word in key_words):
+            return False
+    return True
+
+# Key whose words cover every word of the name with the fewest words left over, when those keys are all
+# of one unit; None otherwise. Misspelled generic words ('bolmu') are dropped like the generic words, and
+# the name has to cover at least half of the key's words.
+def match_unit_words(key, index):
+    words = [word for word in key.split() if not any(unit_word_matches(word, stopword) for stopword in UNIT_STOPWORDS)]
+    covering = [(len(key_words) - len(words), key_id) for key_id, key_words in enumerate(index['words'])
+                if words and len(key_words) <= 2 * len(words) and
+                all(any(unit_word_matches(word, key_word) for key_word in key_words) for word in words)]
+    if not covering:
+        return None
+    fewest = min(extra for extra, _ in covering)
+    best = [key_id for extra, key_id in covering if extra == fewest]
+    return best[0] if len({index['units'][key_id] for key_id in best}) == 1 else None
+
+# Canonical unit for each raw name with its weighted Dice similarity, its lead over the best other unit and
+# how it was matched: 'Tam' (same key), 'Trigram', 'Kelime' (word by word) or None when left unmatched.
+# Only candidates sharing a trigram are scored.
+def match_units(values, index, threshold=UNIT_MATCH_THRESHOLD, margin=UNIT_MATCH_MARGIN):
+    matches, scores, margins, methods = [], [], [], []
+    for value in values:
+        key = unit_match_key(value)
+        if key in index['ids']:
+            matches.append(index['canonical'][index['ids'][key]])
+            scores.append(1.0)
+            margins.append(1.0)
+            methods.append('Tam')
+            continue
+        grams = [gram for gram in trigrams(key) if gram in index['postings']]
+        if not grams:
+            matches.append(None)
+            scores.append(0.0)
+            margins.append(0.0)
+            methods.append(None)
+            continue
+        weight = sum(index['weights'][gram] for gram in grams) + index['unseen_weight'] * (len(trigrams(key)) - len(grams))
+        shared = np.bincount(np.concatenate([index['postings'][gram] for gram in grams]),
+                             weights=np.repeat([index['weights'][gram] for gram in grams],
+                                               [len(index['postings'][gram]) for gram in grams]),
+                             minlength=len(index['sizes']))
+        similarity = 2 * shared / (weight + index['sizes'])
+        # Aliases of one unit do not compete with each other
+        unit_similarity = np.zeros(index['unit_count'])
+        np.maximum.at(unit_similarity, index['units'], similarity)
+        best = int(similarity.argmax())
+        method = 'Trigram'
+        runner_up = np.partition(unit_similarity, -2)[-2] if index['unit_count'] > 1 else 0.0
+        if (similarity[best] < threshold or similarity[best] - runner_up < margin or
+                not words_have_counterparts(key, index['words'][best])):
+            word_match = match_unit_words(key, index)
+            method = None if word_match is None else 'Kelime'
+            if word_match is not None:
+                best = word_match
+                others = np.delete(unit_similarity, index['units'][best])
+                runner_up = others.max() if len(others) else 0.0
+        matches.append(index['canonical'][best])
+        scores.append(round(float(similarity[best]), 3))
+        margins.append(round(float(similarity[best] - runner_up), 3))
+        methods.append(method)
+    return matches, scores, margins, methods
+
+# Maps each unit column to canonical names in one pass over its distinct values.
+# Returns the review table of every raw name that needed fuzzy matching.
+def normalize_units(df, threshold=UNIT_MATCH_THRESHOLD, margin=UNIT_MATCH_MARGIN):
+    reviews = []
+    for column, (label, mapping, _) in UNIT_MATCH_COLUMNS.items():
+        values = df[column].unique()
+        unknown = [value for value in values if value not in mapping and value != 'Bilinmeyen']
+        matches, scores, margins, methods = (match_units(unknown, unit_index(column), threshold, margin) if unknown
+                                             else ([], [], [], []))
+        matched = {value: match for value, match, method in zip(unknown, matches, methods) if method is not None}
+        df[column] = df[column].map({value: mapping.get(value, matched.get(value, value)) for value in values})
+        reviews.append(pd.DataFrame({
+            'Sütun': label,
+            'Ham Değer': pd.Series(unknown, dtype=object),
+            'Önerilen Birim': pd.Series(matches, dtype=object),
+            'Benzerlik': pd.Series(scores, dtype=float),
+            'Fark': pd.Series(margins, dtype=float),
+            'Yöntem': pd.Series(methods, dtype=object),
+            'Durum': ['Eşlenmedi' if method is None else 'Eşlendi' for method in methods],
+        }))
+    return df, pd.concat(reviews, ignore_index=True)
+
+# Name index of one processed file: the normalized name of each Name category and whether it is a homonym,
+# i.e. occurs more than once within a year of the file. A year never spans files, so the homonyms of a
+# dataset are those of its files.
+def build_name_index(df):
+    keys = pd.Series([normalize_name(name) for name in df['Name'].cat.categories], dtype=object)
+    key_codes, unique_keys = pd.factorize(keys)
+    name_codes = key_codes[df['Name'].cat.codes.to_numpy()].astype(np.int64)
+    year_count = len(df['Year'].cat.categories)
+    name_years = name_codes * year_count + df['Year'].cat.codes.to_numpy()
+    repeated = np.bincount(name_years, minlength=len(unique_keys) * year_count)[name_years] > 1
+    homonyms = np.zeros(len(unique_keys), dtype=bool)
+    homonyms[name_codes[repeated]] = True
+    return pd.DataFrame({'Key': keys, 'Homonym': homonyms[key_codes]})
+
+# Stable id per researcher across years, from the files' frames (in dataset row order) and name indexes:
+# only the names of the index are factorized, never normalized again. A normalized name is one person
+# unless it is a homonym; homonyms are told apart by department.
+def build_researcher_ids(frames, name_indexes):
+    key_codes, unique_keys = pd.factorize(pd.concat([index['Key'] for index in name_indexes], ignore_index=True))
+    homonyms = np.zeros(len(unique_keys), dtype=bool)
+    homonyms[key_codes[np.concatenate([index['Homonym'].to_numpy(dtype=bool) for index in name_indexes])]] = True
+    offsets = np.cumsum([0] + [len(index) for index in name_indexes])
+    name_codes = np.concatenate([key_codes[offset:][frame['Name'].cat.codes.to_numpy()]
+                                 for frame, offset in zip(frames, offsets)]).astype(np.int64)
+    department_codes = np.concatenate([frame['Department'].cat.codes.to_numpy() for frame in frames]).astype(np.int64)
+    # 0 marks a unique name; department code -1 (missing) becomes 1
+    unit_codes = np.where(homonyms[name_codes], department_codes + 2, 0)
+    ids, _ = pd.factorize(name_codes * (len(DEPARTMENT_CATEGORIES) + 2) + unit_codes)
+    return ids.astype(np.int32)
+
+# Validation rules: each rule maps a report reason ({value} is filled per row) to a
+# (violation mask, reported value) pair, evaluated on whole columns at once.
+# 'Hata' rows are removed from the data, 'Uyarı' rows are only reported.
+OUTLIER_Z_THRESHOLD = 3.5
+
+def negative_count_checks(df):
+    return {f"Negatif değer ({{value}}) {col} sütununda": (df[col] < 0, df[col]) for col in pub_types}
+
+# People who share a name are told apart by their unit, so only a repeated name within the same unit is a duplicate
+def duplicate_row_checks(df):
+    duplicated = df.duplicated(subset=['Name', 'Faculty', 'Department', 'Year'], keep='first')
+    return {"Aynı yıl ve birim için tekrarlanan kayıt ({value})": (duplicated, df['Year'])}
+
+def quartile_total_checks(df):
+    if 'Reported WoS Total' not in df.columns:
+        return {}
+    quartile_sum = df[QUARTILE_COLUMNS].sum(axis=1)
+    return {"Q1-Q4 toplamı ({value}) bildirilen WoS toplamını aşıyor": (quartile_sum > df['Reported WoS Total'].fillna(np.inf), quartile_sum)}
+
+# Modified z-score of Total Publications per year, based on the median absolute deviation. When more than
+# half of a year's researchers share one value (usually 0) the MAD is 0, and the mean absolute deviation
+# scaled to the same units takes its place; a year where everyone has the same total has no outliers.
+def outlier_checks(df):
+    totals = df['Total Publications'].astype(np.float64)
+    deviation = (totals - totals.groupby(df['Year']).transform('median')).abs()
+    mad = deviation.groupby(df['Year']).transform('median') / 0.6745
+    mean_ad = deviation.groupby(df['Year']).transform('mean') * 1.253314
+    scale = mad.where(mad > 0, mean_ad)
+    z_score = deviation / scale.where(scale > 0)
+    return {"Aykırı toplam yayın sayısı ({value})": (z_score > OUTLIER_Z_THRESHOLD, df['Total Publications'])}
+
+def blank_unit_checks(df):
+    return {f"Boş {label} bilgisi": (df[col].str.strip().isin(['', 'Bilinmeyen']), df[col])
+            for col, label in (('Faculty', 'fakülte'), ('Department', 'bölüm'))}
+
+VALIDATION_RULES = [
+    (negative_count_checks, 'Hata'),
+    (duplicate_row_checks, 'Hata'),
+    (quartile_total_checks, 'Hata'),
+    (outlier_checks, 'Uyarı'),
+    (blank_unit_checks, 'Uyarı'),
+]
+
+# Error checking and removal: evaluate every rule, then turn the violation matrix into the report with one melt
+def check_and_remove_errors(df):
+    masks, values, severities = {}, {}, {}
+    for rule, severity in VALIDATION_RULES:
+        for reason, (mask, value) in rule(df).items():
+            masks[reason] = mask
+            values[reason] = value
+            severities[reason] = severity
+    violations = pd.DataFrame(masks, index=df.index)
+    hits = violations.melt(ignore_index=False, var_name='Sebep', value_name='Hit')
+    hits['Değer'] = pd.DataFrame(values, index=df.index).astype(object).melt(ignore_index=False)['value'].to_numpy()
+    hits = hits[hits['Hit'].to_numpy(dtype=bool)].sort_index(kind='stable')
+    removed_df = pd.DataFrame({
+        'Ad Soyad': df['Name'].reindex(hits.index).to_numpy(),
+        'Yıl': df['Year'].reindex(hits.index).to_numpy(),
+        'Sebep': [reason.format(value=value) for reason, value in zip(hits['Sebep'], hits['Değer'])],
+        'Durum': hits['Sebep'].map(severities).map({'Hata': 'Kaldırıldı', 'Uyarı': 'Uyarı'}).to_numpy(),
+    })
+    error_reasons = [reason for reason, severity in severities.items() if severity == 'Hata']
+    cleaned_df = df[~violations[error_reasons].any(axis=1)].reset_index(drop=True)
+    return cleaned_df, removed_df
+
+# Processed upload cache settings; bump PROCESSING_VERSION whenever the cleaning logic changes
+PROCESSING_VERSION = 12
+CACHE_DIR = Path(os.environ.get('DASHBOARD_CACHE_DIR', '.dashboard_cache'))
+CACHE_MAX_BYTES = int(os.environ.get('DASHBOARD_CACHE_MAX_MB', '512')) * 1024 * 1024
+
+# Aggregation cube: one row per (Faculty, Department, Title, Year) cell
+CUBE_DIMENSIONS = ['Faculty', 'Department', 'Title', 'Year']
+COUNT_COLUMNS = pub_types + ['Total Publications']
+CUBE_MEASURES = pub_types + ['Total Publications', 'Impact Score', 'Total Researchers', 'Active Researchers']
+
+# Impact score is linear in the counts, so it is derived from summed counts instead of being stored per row
+def impact_score(frame):
+    return (4 * frame['Q1 Articles'] + 3 * frame['Q2 Articles'] + 2 * frame['Q3 Articles'] + 1 * frame['Q4 Articles'] +
+            0.5 * (frame['ESCI Articles'] + frame['Scopus Articles'] + frame['Non-Quartile Articles']))
+
+def build_aggregation_cube(df):
+    active_names = df['Name'].where(df['Total Publications'] > 0)
+    aggregations = {col: (col, 'sum') for col in COUNT_COLUMNS}
+    aggregations['Total Researchers'] = ('Name', 'nunique')
+    aggregations['Active Researchers'] = ('Active Name', 'nunique')
+    # dropna=False keeps rows whose unit is not a known category so department roll-ups still see them
+    cube = df.assign(**{'Active Name': active_names}).groupby(CUBE_DIMENSIONS, observed=True, dropna=False).agg(**aggregations)
+    cube = cube.reset_index()
+    # The cube is small, so it goes back to plain int64 counts and string years; unsigned sums would wrap on subtraction
+    cube[COUNT_COLUMNS] = cube[COUNT_COLUMNS].astype(np.int64)
+    cube['Year'] = cube['Year'].astype(str)
+    cube.insert(cube.columns.get_loc('Total Publications') + 1, 'Impact Score', impact_score(cube))
+    return cube
+
+# Roll the cube up to the requested dimensions (researcher counts assume one row per person per cell)
+def rollup_cube(cube, by, measures=CUBE_MEASURES):
+    return cube.groupby(by, observed=True)[measures].sum().reset_index()
+
+# Positions of the n largest values by partial selection, in the order of Series.nlargest(keep='first'):
+# descending, ties broken by ascending order (row position by default). Only values tied with the n-th
+# largest are sorted, so the cost stays linear in the number of values.
+def top_n(values, n, order=None):
+    values = np.asarray(values, dtype=np.float64)
+    candidates = np.arange(len(values))
+    if len(values) > n > 0:
+        threshold = np.partition(values, len(values) - n)[len(values) - n]
+        candidates = np.flatnonzero(values >= threshold)
+    ties = candidates if order is None else np.asarray(order)[candidates]
+    return candidates[np.lexsort((ties, -values[candidates]))][:n]
+
+# Unit label index: display label and filter codes per category of a Categorical unit column
+def build_label_index(categories, mapping):
+    reverse = {}
+    for label, value in mapping.items():
+        reverse.setdefault(value, label)
+    labels = np.array([reverse.get(c, c) for c in categories], dtype=object)
+    codes_by_label = {}
+    for code, label in enumerate(labels):
+        codes_by_label.setdefault(label, []).append(code)
+    return {'labels': labels, 'codes': codes_by_label, 'unique': len(codes_by_label) == len(labels)}
+
+def resolve_unit_labels(values, label_index):
+    if label_index['unique']:
+        return values.cat.rename_categories(list(label_index['labels']))
+    # Code -1 (missing) picks the trailing NaN
+    lookup = np.append(label_index['labels'], np.nan)
+    return pd.Series(lookup[values.cat.codes.to_numpy()], index=values.index)
+
+# Filter index: one packed row bitset per category code of each filter column, built once per frame
+FILTER_COLUMNS = {
+    'Faculty': ('faculty_include', 'faculty_exclude'),
+    'Department': ('department_include', 'department_exclude'),
+    'Title': ('title_include', 'title_exclude'),
+}
+
+def build_filter_index(frame):
+    index = {'rows': len(frame)}
+    for column in FILTER_COLUMNS:
+        codes = frame[column].cat.codes.to_numpy()
+        index[column] = np.packbits(codes == np.arange(len(frame[column].cat.categories))[:, None], axis=1)
+    return index
+
+# Filter index of frames stacked in order, from their own indexes: filter column categories are the same in
+# every file, so each block of bitsets is only shifted to the bit offset of its first row. Padding bits are
+# zero, which lets blocks be ORed into the bytes they share.
+def concat_filter_indexes(indexes):
+    rows = sum(index['rows'] for index in indexes)
+    merged = {'rows': rows}
+    for column in FILTER_COLUMNS:
+        bitsets = np.zeros((indexes[0][column].shape[0], (rows + 7) // 8), dtype=np.uint8)
+        offset = 0
+        for index in indexes:
+            block = index[column]
+            start, shift = divmod(offset, 8)
+            bitsets[:, start:start + block.shape[1]] |= block >> shift
+            if shift:
+                spill = block << (8 - shift)
+                bitsets[:, start + 1:start + 1 + block.shape[1]] |= spill[:, :bitsets.shape[1] - start - 1]
+            offset += index['rows']
+        merged[column] = bitsets
+    return merged
+
+# Rows matching a filter state: OR of the include bitsets, AND-NOT of the exclude bitsets.
+# None means no filter is active.
+def filter_rows(filter_index, filters, label_indexes):
+    mask = None
+    for column, (include_key, exclude_key) in FILTER_COLUMNS.items():
+        bitsets = filter_index[column]
+        for key, exclude in ((include_key, False), (exclude_key, True)):
+            if not filters[key]:
+                continue
+            codes = [code for label in filters[key] for code in label_indexes[column]['codes'].get(label, [])]
+            selected = np.bitwise_or.reduce(bitsets[codes], axis=0) if codes else np.zeros(bitsets.shape[1], dtype=np.uint8)
+            if exclude:
+                selected = ~selected
+            mask = selected if mask is None else mask & selected
+    if mask is None:
+        return None
+    return np.flatnonzero(np.unpackbits(mask, count=filter_index['rows']))
+
+def present_unit_labels(values, label_index):
+    codes = np.unique(values.cat.codes.to_numpy())
+    return set(label_index['labels'][codes[codes >= 0]])
+
+# Unit categories cover every known unit, not only the ones present, so frames and cubes of
+# separately processed files concatenate without re-encoding
+FACULTY_CATEGORIES = list(dict.fromkeys(FACULTY_MAPPING[f] for f in FACULTY_ORDER))
+DEPARTMENT_CATEGORIES = list(dict.fromkeys(DEPARTMENT_MAPPING[d] for d in DEPARTMENT_ORDER))
+
+# Every dataset has these categories, so the label indexes are built once and shared
+LABEL_INDEXES = {
+    'Faculty': build_label_index(FACULTY_CATEGORIES, FACULTY_MAPPING),
+    'Department': build_label_index(DEPARTMENT_CATEGORIES, DEPARTMENT_MAPPING),
+    'Title': build_label_index(title_order, {}),
+}
+
+# Cleaning of one parsed workbook (the slow path behind the on-disk cache)
+def clean_frame(df):
+    df.columns = df.columns.str.strip()
+    df = df.rename(columns=COLUMN_MAPPING)
+    df['Faculty'] = df['Faculty'].fillna('Bilinmeyen').astype(str)
+    df['Department'] = df['Department'].fillna('Bilinmeyen').astype(str)
+    df['Name'] = df['Name'].fillna('Bilinmeyen').astype(str)
+    df = df.dropna(subset=['Name'], how='all')
+    df = df.fillna({'ESCI Articles': 0, 'Scopus Articles': 0, 'Q1 Articles': 0,
+                    'Q2 Articles': 0, 'Q3 Articles': 0, 'Q4 Articles': 0, 'Non-Quartile Articles': 0})
+    df[['ESCI Articles', 'Scopus Articles', 'Q1 Articles', 'Q2 Articles', 'Q3 Articles',
+        'Q4 Articles', 'Non-Quartile Articles']] = df[['ESCI Articles', 'Scopus Articles', 'Q1 Articles',
+                                                      'Q2 Articles', 'Q3 Articles', 'Q4 Articles',
+                                                      'Non-Quartile Articles']].astype(int)
+    if 'Title' not in df.columns or df['Title'].isna().all():
+        df['Title'], unmatched_titles = extract_titles(df['Name'])
+    else:
+        df['Title'] = df['Title'].fillna('Diğer').astype(str)
+        unmatched_titles = pd.DataFrame({'Ad Soyad': pd.Series(dtype=object)})
+    df['Total Publications'] = df[pub_types].sum(axis=1)
+    # Validate before unit names are mapped so blank units are still recognisable
+    df, removed_df = check_and_remove_errors(df)
+    df, unit_matches = normalize_units(df)
+    df['Faculty'] = pd.Categorical(df['Faculty'], categories=FACULTY_CATEGORIES, ordered=True)
+    df['Department'] = pd.Categorical(df['Department'], categories=DEPARTMENT_CATEGORIES, ordered=True)
+    df['Title'] = pd.Categorical(df['Title'], categories=title_order, ordered=True)
+    df['Year'] = df['Year'].astype(str)
+    return compact_frame(df), removed_df, unmatched_titles, unit_matches
+
+# Compact layout of the processed frame: validated counts are non-negative and fit small unsigned ints,
+# Year and Name repeat across rows and are dictionary-encoded. Arithmetic on the counts belongs in the cube.
+def compact_frame(df):
+    for column in COUNT_COLUMNS:
+        df[column] = pd.to_numeric(df[column], downcast='unsigned')
+    df['Year'] = pd.Categorical(df['Year'], categories=sorted(df['Year'].unique()), ordered=True)
+    df['Name'] = df['Name'].astype('category')
+    return df
+
+# Processed frames of several files stacked in order. Name and Year categories differ between files, so
+# they are unioned and the codes remapped; the other columns share their dtypes and concatenate as they are.
+def concat_frames(frames):
+    names = union_categoricals([frame['Name'] for frame in frames], sort_categories=True)
+    years = union_categoricals([frame['Year'] for frame in frames], sort_categories=True, ignore_order=True)
+    df = pd.concat([frame.drop(columns=['Name', 'Year']) for frame in frames], ignore_index=True)
+    return df.assign(Name=names, Year=years.as_ordered())[frames[0].columns]
+
+# Bytes of a processed frame as stored and in the int64/object layout it replaces
+def frame_memory(df):
+    wide = df.astype({**dict.fromkeys(COUNT_COLUMNS, np.int64), 'Year': object, 'Name': object})
+    wide['Impact Score'] = impact_score(wide)
+    return {'compact': int(df.memory_usage(deep=True).sum()), 'wide': int(wide.memory_usage(deep=True).sum())}
+
+# On-disk cache of processed files, keyed by file content, PROCESSING_VERSION and the unit matching settings.
+# An entry holds the frames of clean_frame plus the file's aggregation cube and name index, in
+# PROCESSED_FRAMES order, and the filter indexes of its data and cube (PROCESSED_FILTERS, frame position).
+PROCESSED_FRAMES = ('data', 'removed', 'titles', 'units', 'cube', 'names')
+PROCESSED_FILTERS = {'df': 0, 'cube': 4}
+
+# Unit names are mapped while cleaning, so the thresholds and mapping tables decide the cached frames
+UNIT_MATCH_SIGNATURE = hashlib.sha256(json.dumps({
+    'threshold': UNIT_MATCH_THRESHOLD,
+    'margin': UNIT_MATCH_MARGIN,
+    'typo_min_length': UNIT_TYPO_MIN_LENGTH,
+    'columns': {column: [mapping, aliases] for column, (_, mapping, aliases) in UNIT_MATCH_COLUMNS.items()},
+    'stopwords': sorted(UNIT_STOPWORDS),
+    'abbreviations': UNIT_ABBREVIATIONS,
+}, sort_keys=True, ensure_ascii=False).encode()).hexdigest()
+
+# The year can come from the file name, so names are part of the key
+def file_cache_key(file):
+    return hashlib.sha256(f"v{PROCESSING_VERSION}-{UNIT_MATCH_SIGNATURE}".encode() + file.name.encode() + b'\0' +
+                          file.getvalue()).hexdigest()
+
+# Dataset key of an upload set; upload order is not part of it
+def upload_cache_key(files):
+    digest = hashlib.sha256()
+    for key in sorted(file_cache_key(file) for file in files):
+        digest.update(key.encode())
+    return digest.hexdigest()
+
+def read_processed_cache(key):
+    entry = CACHE_DIR / key
+    try:
+        frames = tuple(pd.read_parquet(entry / f"{name}.parquet") for name in PROCESSED_FRAMES)
+        with np.load(entry / "filters.npz") as bitsets:
+            filter_indexes = {name: {'rows': len(frames[position]),
+                                     **{column: bitsets[f"{name}_{column}"] for column in FILTER_COLUMNS}}
+                              for name, position in PROCESSED_FILTERS.items()}
+        # Touch the entry so eviction sees it as recently used
+        os.utime(entry)
+    except Exception:
+        return None
+    return frames + (filter_indexes,)
+
+def write_processed_cache(key, part):
+    *frames, filter_indexes = part
+    tmp_entry = CACHE_DIR / f".{key}.{uuid.uuid4().hex}"
+    try:
+        tmp_entry.mkdir(parents=True)
+        for name, frame in zip(PROCESSED_FRAMES, frames):
+            frame.to_parquet(tmp_entry / f"{name}.parquet", index=False)
+        np.savez(tmp_entry / "filters.npz", **{f"{name}_{column}": filter_indexes[name][column]
+                                              for name in PROCESSED_FILTERS for column in FILTER_COLUMNS})
+        tmp_entry.rename(CACHE_DIR / key)
+    except Exception:
+        # A failed or concurrent write only costs a reparse next time
+        shutil.rmtree(tmp_entry, ignore_errors=True)
+        return
+    evict_processed_cache()
+
+def evict_processed_cache():
+    entries = []
+    for entry in CACHE_DIR.iterdir():
+        if entry.is_dir() and not entry.name.startswith('.'):
+            try:
+                size = sum(f.stat().st_size for f in entry.iterdir())
+                entries.append((entry.stat().st_mtime, size, entry))
+            except OSError:
+                # Removed by another session while we were scanning
+                continue
+    total_size = sum(size for _, size, _ in entries)
+    # Least recently used entries go first
+    for _, size, entry in sorted(entries):
+        if total_size <= CACHE_MAX_BYTES:
+            break
+        shutil.rmtree(entry, ignore_errors=True)
+        total_size -= size
+
+# Each file is cleaned, validated, aggregated and indexed on its own, so replacing or adding one year's file
+# only parses that file and builds its name and filter indexes. This is exact because every validation rule
+# compares rows of the same year and a year never spans files. Cache misses are parsed together to keep the
+# parallel parsing.
+def process_files(files):
+    keys = [file_cache_key(file) for file in files]
+    parts = {key: read_processed_cache(key) for key in keys}
+    missing = [(file, key) for file, key in zip(files, keys) if parts[key] is None]
+    if missing:
+        for (file, key), raw in zip(missing, parse_workbooks([(file.name, file.getvalue()) for file, _ in missing])):
+            df, removed_df, unmatched_titles, unit_matches = clean_frame(raw)
+            cube = build_aggregation_cube(df)
+            parts[key] = (df, removed_df, unmatched_titles, unit_matches, cube, build_name_index(df),
+                          {'df': build_filter_index(df), 'cube': build_filter_index(cube)})
+            write_processed_cache(key, parts[key])
+    return [parts[key] for key in keys]
+
+# Per-file results stacked into the dataset in year order; cube cells of different years never overlap,
+# so the file cubes are simply concatenated. Researcher ids and filter indexes are merged from the files'
+# indexes, so a replaced file leaves the work done for the others as it is.
+def combine_processed(parts):
+    parts = sorted(parts, key=lambda part: min(part[0]['Year'].cat.categories, default=''))
+    data, removed, titles, units, cubes, names, filters = zip(*parts)
+    df = concat_frames(data)
+    df['Researcher ID'] = build_researcher_ids(data, names)
+    unmatched_titles = pd.concat(titles, ignore_index=True).drop_duplicates(ignore_index=True)
+    unit_matches = pd.concat(units, ignore_index=True).drop_duplicates(subset=['Sütun', 'Ham Değer'], ignore_index=True)
+    filter_indexes = {name: concat_filter_indexes([index[name] for index in filters]) for name in PROCESSED_FILTERS}
+    return (df, pd.concat(removed, ignore_index=True), unmatched_titles, unit_matches, pd.concat(cubes, ignore_index=True),
+            filter_indexes)
+
+# Files are upload-like objects with .name and .getvalue(); errors are returned, not raised
+def load_and_process_data(files):
+    try:
+        cache_key = upload_cache_key(files)
+        parts = process_files(files)
+        check_file_years([file.name for file in files], [part[0]['Year'].cat.categories for part in parts])
+        df, removed_df, unmatched_titles, unit_matches, cube, filter_indexes = combine_processed(parts)
+        return df, removed_df, cube, LABEL_INDEXES, filter_indexes, unmatched_titles, unit_matches, cache_key, None
+    except Exception as e:
+        return None, None, None, None, None, None, None, None, str(e)
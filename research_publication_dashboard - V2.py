@@ -1,10 +1,22 @@
 import streamlit as st
-import pandas as pd
-import plotly.express as px
 import plotly.graph_objects as go
-import numpy as np
-from io import StringIO
-import uuid
+import json
+import os
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from datetime import datetime, timezone
+from functools import partial
+from metrics import diversity_by
+from dataset_registry import DatasetRegistry
+from excel_export import export_workbook
+from figure_payload import figure_json
+from processing import (DEPARTMENT_MAPPING, FACULTY_MAPPING, UNIT_MATCH_MARGIN, UNIT_MATCH_THRESHOLD, frame_memory,
+                        present_unit_labels, pub_type_labels, pub_types, rollup_cube)
+from sections import (FILTER_KEYS, REPORT_SECTIONS, TREND_PANELS, SectionData, build_comparison_pairs,
+                      build_year_color_map, describe_years)
 
 # Page configuration
 st.set_page_config(page_title="Araştırma Yayınları Panosu", layout="centered")
@@ -119,779 +131,624 @@ toc_items = [
     ("Veri Özeti", "veri-ozeti"),
     ("Veri Hataları", "veri-hatalari"),
     ("Veri Filtreleme", "veri-filtreleme"),
-    ("Yıl Bazında Yayın Türü Dağılımı", "yil-bazinda-yayin"),
-    ("Yayın Türü Değişim Karşılaştırması (2023 vs 2024)", "yayin-degisim"),
-    ("Fakülte/Bölüm Bazında Yayın Çeyreklik Dağılımı", "fakulte-ceyreklik"),
-    ("Fakülte ve Yayın Türü Dağılımı", "fakulte-yayin-turu"),
-    ("Toplam Yayın Sayısına Göre İlk 5 Birim", "top-5-birim"),
-    ("Unvan Bazında Yayın Dağılımı", "unvan-dagilim"),
-    ("Yayın Değişimi (2023-2024)", "yayin-degisim-2023-2024"),
-    ("Toplam Yayın Sayısına Göre İlk 5 Araştırmacı", "top-5-arastirmaci"),
-    ("Etki Puanı", "etki-puani"),
-    ("Yayın ve Etki Puanı", "yayin-etki"),
-    ("Aktif Araştırmacı Oranı", "aktif-oran"),
-    ("Yıl Bazında Yayınlar", "yil-bazinda-yayinlar"),
-    ("Çeyreklik Çeşitlilik İndeksi", "cesitlilik-indeksi"),
-    ("En Yaygın Yayın Türleri", "en-yaygin-yayin"),
-]
-
-# Sidebar with TOC
+] + [(section['title'], section['anchor']) for section in REPORT_SECTIONS]
+
+SECTION_TITLES = {anchor: title for title, anchor in toc_items}
+# Report sections after the filter panel can be picked individually
+REPORT_ANCHORS = [section['anchor'] for section in REPORT_SECTIONS]
+
+# Sidebar with TOC and section picker
 with st.sidebar:
     st.header("İçindekiler")
+    on_demand = st.toggle("İsteğe Bağlı Görüntüleme", value=True,
+                          help="Yalnızca seçilen bölümler, açılan genişleticiler ve seçili sekmeler hesaplanır.")
+    if on_demand:
+        selected_sections = st.multiselect("Görüntülenecek Bölümler", options=REPORT_ANCHORS, default=REPORT_ANCHORS,
+                                           format_func=SECTION_TITLES.get)
+    else:
+        selected_sections = REPORT_ANCHORS
+    profiling = st.toggle("Profil Modu", value=st.query_params.get("profile") == "1", key="profiling",
+                          help="Her bölümün hesaplama, grafik oluşturma ve gönderim sürelerini sayfanın sonunda gösterir.")
     for title, anchor in toc_items:
-        st.markdown(f'<a href="#{anchor}" style="text-decoration: none; color: #1f77b4;">{title}</a>', unsafe_allow_html=True)
-
-# Faculty and Department mappings
-FACULTY_MAPPING = {
-    'Mühendislik Fakültesi': 'Mühendislik Fakültesi',
-    'İktisadi ve İdari Bilimler Fakültesi': 'İktisadi ve İdari Bilimler Fakültesi',
-    'Fen Edebiyat Fakültesi': 'Fen Edebiyat Fakültesi',
-    'Eğitim Fakültesi': 'Eğitim Fakültesi',
-    'Mimarlık Fakültesi': 'Mimarlık Fakültesi',
-    'Yabancı Diller Yüksek Okulu': 'Yabancı Diller Yüksek Okulu',
-    'Rektörlük': 'Rektörlük',
-    'Fen Bilimleri Enstitüsü': 'Fen Bilimleri Enstitüsü',
-    'Deniz Bilimleri Enstitüsü': 'Deniz Bilimleri Enstitüsü',
-    'Uygulamalı Matematik Enstitüsü': 'Uygulamalı Matematik Enstitüsü',
-    'Sosyal Bilimler Enstitüsü': 'Sosyal Bilimler Enstitüsü',
-    'Enformatik Enstitüsü': 'Enformatik Enstitüsü',
-    'Meslek Yüksek Okulu': 'Meslek Yüksek Okulu'
-}
-FACULTY_ORDER = sorted(FACULTY_MAPPING.keys())
-
-DEPARTMENT_MAPPING = {
-    'Aktüerya Bilimleri Anabilim Dalı': 'Aktüerya Bilimleri Anabilim Dalı',
-    'Beden Eğitimi ve Spor Bölümü': 'Beden Eğitimi ve Spor Bölümü',
-    'Bilgisayar Mühendisliği Bölümü': 'Bilgisayar Mühendisliği Bölümü',
-    'Bilgisayar ve Öğretim Teknolojileri Eğitimi Bölümü': 'Bilgisayar ve Öğretim Teknolojileri Eğitimi Bölümü',
-    'Bilim ve Teknoloji Politikası Çalışmaları Anabilim Dalı': 'Bilim ve Teknoloji Politikası Çalışmaları Anabilim Dalı',
-    'Bilimsel Hesaplama Anabilim Dalı': 'Bilimsel Hesaplama Anabilim Dalı',
-    'Bilişim Sistemleri Anabilim Dalı': 'Bilişim Sistemleri Anabilim Dalı',
-    'Bilişsel Bilimler Anabilim Dalı': 'Bilişsel Bilimler Anabilim Dalı',
-    'Biyolojik Bilimler Bölümü': 'Biyolojik Bilimler Bölümü',
-    'Çevre Mühendisliği Bölümü': 'Çevre Mühendisliği Bölümü',
-    'Deniz Bilimleri Anabilim Dalı': 'Deniz Bilimleri Anabilim Dalı',
-    'Deniz Biyolojisi ve Balıkçılık Anabilim Dalı': 'Deniz Biyolojisi ve Balıkçılık Anabilim Dalı',
-    'Deniz Jeolojisi ve Jeofiziği Anabilim Dalı': 'Deniz Jeolojisi ve Jeofiziği Anabilim Dalı',
-    'Eğitim Bilimleri Bölümü': 'Eğitim Bilimleri Bölümü',
-    'Elektrik ve Elektronik Mühendisliği Bölümü': 'Elektrik ve Elektronik Mühendisliği Bölümü',
-    'Endüstri Mühendisliği Bölümü': 'Endüstri Mühendisliği Bölümü',
-    'Endüstriyel Tasarım Bölümü': 'Endüstriyel Tasarım Bölümü',
-    'Fen Bilimleri Enstitüsü': 'Fen Bilimleri Enstitüsü',
-    'Felsefe Bölümü': 'Felsefe Bölümü',
-    'Finansal Matematik Anabilim Dalı': 'Finansal Matematik Anabilim Dalı',
-    'Fizik Bölümü': 'Fizik Bölümü',
-    'Gıda Mühendisliği Bölümü': 'Gıda Mühendisliği Bölümü',
-    'Havacılık ve Uzay Mühendisliği Bölümü': 'Havacılık ve Uzay Mühendisliği Bölümü',
-    'İktisat Bölümü': 'İktisat Bölümü',
-    'İnşaat Mühendisliği Bölümü': 'İnşaat Mühendisliği Bölümü',
-    'İstatistik Bölümü': 'İstatistik Bölümü',
-    'Jeoloji Mühendisliği Bölümü': 'Jeoloji Mühendisliği Bölümü',
-    'Kimya Bölümü': 'Kimya Bölümü',
-    'Kimya Mühendisliği Bölümü': 'Kimya Mühendisliği Bölümü',
-    'Kriptografi Anabilim Dalı': 'Kriptografi Anabilim Dalı',
-    'Maden Mühendisliği Bölümü': 'Maden Mühendisliği Bölümü',
-    'Makina Mühendisliği Bölümü': 'Makina Mühendisliği Bölümü',
-    'Matematik Bölümü': 'Matematik Bölümü',
-    'Matematik ve Fen Bilimleri Eğitimi Bölümü': 'Matematik ve Fen Bilimleri Eğitimi Bölümü',
-    'Meslek Yüksek Okulu': 'Meslek Yüksek Okulu',
-    'Metalurji ve Malzeme Mühendisliği Bölümü': 'Metalurji ve Malzeme Mühendisliği Bölümü',
-    'Mimarlık Bölümü': 'Mimarlık Bölümü',
-    'Modelleme ve Simülasyon Anabilim Dalı': 'Modelleme ve Simülasyon Anabilim Dalı',
-    'Modern Diller Bölümü': 'Modern Diller Bölümü',
-    'Mühendislik Bilimleri Bölümü': 'Mühendislik Bilimleri Bölümü',
-    'Müzik ve Güzel Sanatlar Bölümü': 'Müzik ve Güzel Sanatlar Bölümü',
-    'Petrol ve Doğal Gaz Mühendisliği Bölümü': 'Petrol ve Doğal Gaz Mühendisliği Bölümü',
-    'Psikoloji Bölümü': 'Psikoloji Bölümü',
-    'Sağlık Bilişimi Anabilim Dalı': 'Sağlık Bilişimi Anabilim Dalı',
-    'Siber Güvenlik Anabilim Dalı': 'Siber Güvenlik Anabilim Dalı',
-    'Siyaset Bilimi ve Kamu Yönetimi Bölümü': 'Siyaset Bilimi ve Kamu Yönetimi Bölümü',
-    'Sosyoloji Bölümü': 'Sosyoloji Bölümü',
-    'Şehir ve Bölge Planlama Bölümü': 'Şehir ve Bölge Planlama Bölümü',
-    'Tarih Bölümü': 'Tarih Bölümü',
-    'Temel Eğitim Bölümü': 'Temel Eğitim Bölümü',
-    'Türk Dili Bölümü': 'Türk Dili Bölümü',
-    'Uluslararası İlişkiler Bölümü': 'Uluslararası İlişkiler Bölümü',
-    'Veri Bilişimi Anabilim Dalı': 'Veri Bilişimi Anabilim Dalı',
-    'Yabancı Diller Bölümü': 'Yabancı Diller Bölümü',
-    'Yabancı Diller Eğitimi Bölümü': 'Yabancı Diller Eğitimi Bölümü',
-    '': 'Bilinmeyen'
-}
-DEPARTMENT_ORDER = sorted([d for d in DEPARTMENT_MAPPING.keys() if d])
-
-# Column mapping for new file layout
-COLUMN_MAPPING = {
-    'Unvan': 'Title',
-    'Ad Soyad': 'Name',
-    'Fakülte': 'Faculty',
-    'Bölüm': 'Department',
-    'WoS ESCI İndeksinde Taranan Makale': 'ESCI Articles',
-    'Scopus Makale (WoS SCIE, AHCI, SSCI, ESCI Taranmayan)': 'Scopus Articles',
-    'WoS Q1 Makale Sayısı': 'Q1 Articles',
-    'WoS Q2 Makale Sayısı': 'Q2 Articles',
-    'WoS Q3 Makale Sayısı': 'Q3 Articles',
-    'WoS Q4 Makale Sayısı': 'Q4 Articles',
-    'WoS Quartile Bulunmayan Makale Sayısı': 'Non-Quartile Articles'
-}
-
-# Title order
-title_order = ["Arş. Gör.", "Öğr. Gör.", "Dr. Öğr. Üyesi", "Doç. Dr.", "Prof. Dr.", "Diğer"]
-
-# Publication types definition
-pub_types = ['ESCI Articles', 'Scopus Articles', 'Q1 Articles', 'Q2 Articles', 'Q3 Articles', 'Q4 Articles', 'Non-Quartile Articles']
-pub_type_labels = {
-    'ESCI Articles': 'ESCI Makaleleri',
-    'Scopus Articles': 'Scopus Makaleleri',
-    'Q1 Articles': 'Q1 Makaleleri',
-    'Q2 Articles': 'Q2 Makaleleri',
-    'Q3 Articles': 'Q3 Makaleleri',
-    'Q4 Articles': 'Q4 Makaleleri',
-    'Non-Quartile Articles': 'Çeyreklik Olmayan Makaleler'
-}
-
-# Title extraction function
-def extract_title(name):
-    titles = [
-        "Prof. Dr.", "Prof.", "Doç. Dr.", "Dr. Öğr. Üyesi", "Öğr. Gör.", "Arş. Gör.",
-        "Asst. Prof.", "Assoc. Prof.", "Lect. PhD", "Res. Asst.",
-        "Araştırma Görevlisi", "Öğretim Görevlisi", "Araştırmacı", "İdari Personel"
-    ]
-    title_mapping = {
-        "Prof. Dr.": "Prof. Dr.",
-        "Prof.": "Prof. Dr.",
-        "Doç. Dr.": "Doç. Dr.",
-        "Dr. Öğr. Üyesi": "Dr. Öğr. Üyesi",
-        "Öğr. Gör.": "Öğr. Gör.",
-        "Arş. Gör.": "Arş. Gör.",
-        "Asst. Prof.": "Dr. Öğr. Üyesi",
-        "Assoc. Prof.": "Doç. Dr.",
-        "Lect. PhD": "Öğr. Gör.",
-        "Res. Asst.": "Arş. Gör.",
-        "Araştırma Görevlisi": "Arş. Gör.",
-        "Öğretim Görevlisi": "Öğr. Gör.",
-        "Araştırmacı": "Diğer",
-        "İdari Personel": "Diğer"
+        if anchor in selected_sections or anchor not in REPORT_ANCHORS:
+            st.markdown(f'<a href="#{anchor}" style="text-decoration: none; color: #1f77b4;">{title}</a>', unsafe_allow_html=True)
+
+# Built panels kept in memory across reruns and sessions, evicted least recently used first once their
+# serialized size passes the byte budget; the entry count is a secondary cap
+FIGURE_CACHE_MAX_BYTES = int(os.environ.get('DASHBOARD_FIGURE_CACHE_MB', '256')) * 1024 * 1024
+FIGURE_CACHE_MAX_ENTRIES = int(os.environ.get('DASHBOARD_FIGURE_CACHE_SIZE', '256'))
+
+# Memory budget for processed datasets no session is displaying any more
+DATASET_MEMORY_MAX_BYTES = int(os.environ.get('DASHBOARD_DATASET_MEMORY_MB', '1024')) * 1024 * 1024
+
+# One processed copy of each upload set (frames and filter bitsets) for the whole server, shared by reference
+@st.cache_resource
+def dataset_registry():
+    return DatasetRegistry(DATASET_MEMORY_MAX_BYTES)
+
+# Threads that build the unfiltered panels in the background after an upload
+PRECOMPUTE_WORKERS = int(os.environ.get('DASHBOARD_PRECOMPUTE_WORKERS', str(min(4, os.cpu_count() or 1))))
+# Seconds between sidebar progress refreshes while background panels are being built
+PRECOMPUTE_POLL_SECONDS = 1.0
+
+# Chart data sent to the browser by one run or fragment rerun; charts past it wait for a click. 0 disables it.
+PAGE_PAYLOAD_MAX_BYTES = int(os.environ.get('DASHBOARD_PAGE_PAYLOAD_KB', '2048')) * 1024
+
+@st.cache_resource
+def precompute_pool():
+    return ThreadPoolExecutor(max_workers=PRECOMPUTE_WORKERS, thread_name_prefix="precompute")
+
+# Per-section profile: one row per rendered section, shown at the bottom of the page in profile mode.
+# Rows are keyed by section title so a fragment rerun replaces the rows of the sections it redrew.
+profile = {'enabled': profiling, 'current': None, 'rows': {}, 'memory': {}}
+
+def profile_compute_seconds():
+    current = profile['current']
+    return current['data'].compute_seconds if current is not None and current['data'] is not None else 0.0
+
+# Starts timing a section and closes the previous one; data is the SectionData the section reads from
+def start_profile(title, data=None):
+    finish_profile()
+    if profile['enabled']:
+        profile['current'] = {'title': title, 'data': data, 'started': time.perf_counter(), 'computed': 0.0,
+                              'build': 0.0, 'send': 0.0, 'charts': 0, 'deferred': 0, 'bytes': 0, 'hits': 0,
+                              'lookups': 0}
+        profile['current']['computed'] = profile_compute_seconds()
+
+def finish_profile():
+    current = profile['current']
+    if current is None:
+        return
+    total = time.perf_counter() - current['started']
+    # Sections without SectionData count everything but chart work as data preparation (e.g. file parsing)
+    if current['data'] is not None:
+        compute = profile_compute_seconds() - current['computed']
+    else:
+        compute = max(total - current['build'] - current['send'], 0.0)
+    profile['rows'][current['title']] = {
+        'Bölüm': current['title'],
+        'Toplam (ms)': round(total * 1000, 1),
+        'Veri Hazırlama (ms)': round(compute * 1000, 1),
+        'Grafik Oluşturma (ms)': round(current['build'] * 1000, 1),
+        'Gönderim (ms)': round(current['send'] * 1000, 1),
+        'Grafik Sayısı': current['charts'],
+        'Ertelenen Grafik': current['deferred'],
+        'Gönderilen Veri (KB)': round(current['bytes'] / 1024, 1),
+        'Önbellek İsabeti': f"{current['hits']}/{current['lookups']}",
     }
-    if isinstance(name, str):
-        for title in titles:
-            if title in name:
-                return title_mapping[title]
-    return "Diğer"
-
-# Error checking and removal function
-def check_and_remove_errors(df):
-    numeric_cols = ['ESCI Articles', 'Scopus Articles', 'Q1 Articles', 'Q2 Articles', 'Q3 Articles', 'Q4 Articles', 'Non-Quartile Articles']
-    removed_entries = []
-    neg_mask = df[numeric_cols].lt(0).any(axis=1)
-    neg_indices = df[neg_mask].index
-    for idx in neg_indices:
-        researcher = df.loc[idx, "Name"]
-        neg_cols = [col for col in numeric_cols if df.loc[idx, col] < 0]
-        for col in neg_cols:
-            reason = f"Negatif değer ({df.loc[idx, col]}) {col} sütununda"
-            removed_entries.append({"Ad Soyad": researcher, "Sebep": reason})
-    indices_to_remove = set(neg_indices)
-    removed_df = pd.DataFrame(removed_entries)
-    cleaned_df = df.drop(index=indices_to_remove).reset_index(drop=True)
-    return cleaned_df, removed_df
+    profile['current'] = None
+
+# Profile table; columns can be sorted by clicking their headers
+def render_profile():
+    finish_profile()
+    st.header("Performans Profili", anchor="performans-profili")
+    if profile['memory']:
+        col1, col2 = st.columns(2)
+        # The delta compares against the int64/object layout the frame had before compaction
+        col1.metric("Veri Belleği (df)", f"{profile['memory']['df'] / 2**20:.1f} MB",
+                    delta=f"{(profile['memory']['df'] - profile['memory']['df_wide']) / 2**20:.1f} MB", delta_color="inverse")
+        col2.metric("Filtrelenmiş Veri Belleği (filtered_df)", f"{profile['memory']['filtered_df'] / 2**20:.1f} MB")
+    rows = list(profile['rows'].values())
+    st.dataframe(rows, use_container_width=True, hide_index=True)
+    report = {'timestamp': datetime.now(timezone.utc).isoformat(timespec='seconds'), 'streamlit': st.__version__,
+              'on_demand': on_demand, 'memory_bytes': profile['memory'], 'sections': rows}
+    st.download_button("Profili JSON Olarak İndir", json.dumps(report, ensure_ascii=False, indent=2),
+                       file_name="profil.json", mime="application/json")
 
 # File upload
+start_profile("Dosya Yükleme")
 with st.container():
     st.header("Dosya Yükleme", anchor="dosya-yukleme")
-    st.markdown("2023 ve 2024 yayın verilerini içeren Excel dosyalarını yükleyin.")
-    uploaded_file_2023 = st.file_uploader("2023 Excel Dosyasını Yükleyin", type=["xlsx"])
-    uploaded_file_2024 = st.file_uploader("2024 Excel Dosyasını Yükleyin", type=["xlsx"])
-
-@st.cache_data
-def load_and_process_data(file_2023, file_2024):
-    try:
-        df_2023 = pd.read_excel(file_2023)
-        df_2024 = pd.read_excel(file_2024)
-        df_2023['Year'] = '2023'
-        df_2024['Year'] = '2024'
-        df = pd.concat([df_2023, df_2024], ignore_index=True)
-        df.columns = df.columns.str.strip()
-        df = df.rename(columns=COLUMN_MAPPING)
-        df['Faculty'] = df['Faculty'].fillna('Bilinmeyen').astype(str)
-        df['Department'] = df['Department'].fillna('Bilinmeyen').astype(str)
-        df['Name'] = df['Name'].fillna('Bilinmeyen').astype(str)
-        df = df.dropna(subset=['Name'], how='all')
-        df = df.fillna({'ESCI Articles': 0, 'Scopus Articles': 0, 'Q1 Articles': 0,
-                        'Q2 Articles': 0, 'Q3 Articles': 0, 'Q4 Articles': 0, 'Non-Quartile Articles': 0})
-        df[['ESCI Articles', 'Scopus Articles', 'Q1 Articles', 'Q2 Articles', 'Q3 Articles',
-            'Q4 Articles', 'Non-Quartile Articles']] = df[['ESCI Articles', 'Scopus Articles', 'Q1 Articles',
-                                                          'Q2 Articles', 'Q3 Articles', 'Q4 Articles',
-                                                          'Non-Quartile Articles']].astype(int)
-        if 'Title' not in df.columns or df['Title'].isna().all():
-            df['Title'] = df['Name'].apply(extract_title)
+    st.markdown("Her yıl için bir Excel dosyası yükleyin. Yıl, dosya adından (ör. yayinlar_2024.xlsx), 'Yıl' sütunundan veya sayfa adından okunur.")
+    uploaded_files = st.file_uploader("Excel Dosyalarını Yükleyin", type=["xlsx"], accept_multiple_files=True)
+
+# Panel cache: built items with figures serialized to compact JSON, shared by all sessions of the process.
+# Paged items keep only their page count: page builders close over the SectionData of the run that built
+# them, and with it the dataset frames, which must not outlive the dataset's registry entry.
+# 'sizes' holds the serialized size of each entry and 'bytes' their total; 'pending' holds the background
+# builds of panels not cached yet, by cache key.
+@st.cache_resource
+def figure_cache():
+    return {'entries': OrderedDict(), 'sizes': {}, 'bytes': 0, 'pending': {}, 'hits': 0, 'misses': 0,
+            'lock': threading.Lock()}
+
+# Everything a panel's output depends on besides the dataset-derived years and colours
+def panel_cache_key(data, section_id, panel, options):
+    filter_key = tuple(tuple(sorted(data['filters'][name])) for name in FILTER_KEYS)
+    return (data['dataset_key'], filter_key, section_id, panel, tuple(data['comparison_pairs']),
+            tuple(data[option] for option in options))
+
+def serialize_items(items):
+    serialized = []
+    for item in items:
+        if item[0] == 'chart':
+            serialized.append(('chart', figure_json(item[1]), item[2]))
+        elif item[0] == 'pages':
+            serialized.append(item[:3])
         else:
-            df['Title'] = df['Title'].fillna('Diğer').astype(str)
-        df['Total Publications'] = df[pub_types].sum(axis=1)
-        df['Impact Score'] = (4 * df['Q1 Articles'] + 3 * df['Q2 Articles'] + 2 * df['Q3 Articles'] +
-                             1 * df['Q4 Articles'] + 0.5 * (df['ESCI Articles'] + df['Scopus Articles'] +
-                                                            df['Non-Quartile Articles']))
-        df['Faculty'] = df['Faculty'].apply(lambda x: FACULTY_MAPPING.get(x, x))
-        df['Department'] = df['Department'].apply(lambda x: DEPARTMENT_MAPPING.get(x, x))
-        df['Faculty'] = pd.Categorical(df['Faculty'], categories=[FACULTY_MAPPING[f] for f in FACULTY_ORDER if FACULTY_MAPPING[f] in df['Faculty'].unique()], ordered=True)
-        df['Department'] = pd.Categorical(df['Department'], categories=[DEPARTMENT_MAPPING[d] for d in DEPARTMENT_ORDER if DEPARTMENT_MAPPING[d] in df['Department'].unique()], ordered=True)
-        df['Title'] = pd.Categorical(df['Title'], categories=title_order, ordered=True)
-        df['Year'] = df['Year'].astype(str)
-        df, removed_df = check_and_remove_errors(df)
-        return df, removed_df, None
-    except Exception as e:
-        return None, None, str(e)
-
-# Color mapping
-COLOR_MAP = {
-    'ESCI Makaleleri': '#1F77B4',
-    'Scopus Makaleleri': '#FF7F0E',
-    'Q1 Makaleleri': '#2CA02C',
-    'Q2 Makaleleri': '#D62728',
-    'Q3 Makaleleri': '#9467BD',
-    'Q4 Makaleleri': '#8C564B',
-    'Çeyreklik Olmayan Makaleler': '#7F7F7F'
-}
-YEAR_COLOR_MAP = {
-    '2023': '#1F77B4',
-    '2024': '#4A90E2'
-}
-CHANGE_COLOR_MAP = {
-    'increase': '#2CA02C',
-    'decrease': '#D62728'
-}
+            serialized.append(item)
+    return serialized
+
+# Charts carry the size of their JSON, which is what st.plotly_chart sends for them. Paged items get their
+# page builders from build, the panel's builder for the current run, which is only called when there are any.
+def deserialize_items(items, cache_key, build):
+    page_builders = None
+    deserialized = []
+    for item in items:
+        if item[0] == 'chart':
+            # Specs come from plotly itself, so the figures skip validation
+            deserialized.append(('chart', go.Figure(json.loads(item[1]), _validate=False), item[2],
+                                 len(item[1].encode())))
+        elif item[0] == 'pages':
+            if page_builders is None:
+                page_builders = {built[1]: built[3] for built in build() if built[0] == 'pages'}
+            _, key, page_count = item
+            deserialized.append(('pages', key, page_count, partial(cached_page, page_builders[key], cache_key)))
+        else:
+            deserialized.append(item)
+    return deserialized
+
+# Chart JSON and texts count their length, tables their deep memory usage
+def items_nbytes(items):
+    nbytes = 0
+    for item in items:
+        if item[0] == 'table':
+            nbytes += int(item[1].memory_usage(deep=True).sum())
+        elif isinstance(item[1], str):
+            nbytes += len(item[1])
+    return nbytes
+
+# The newest entry is kept even when it alone is over the budget
+def store_items(cache, cache_key, items):
+    nbytes = items_nbytes(items)
+    with cache['lock']:
+        cache['misses'] += 1
+        cache['bytes'] += nbytes - cache['sizes'].get(cache_key, 0)
+        cache['entries'][cache_key] = items
+        cache['sizes'][cache_key] = nbytes
+        cache['entries'].move_to_end(cache_key)
+        while len(cache['entries']) > 1 and (cache['bytes'] > FIGURE_CACHE_MAX_BYTES or
+                                             len(cache['entries']) > FIGURE_CACHE_MAX_ENTRIES):
+            evicted, _ = cache['entries'].popitem(last=False)
+            cache['bytes'] -= cache['sizes'].pop(evicted)
+
+# Serialized items of a panel and, on a miss, the items it was built from (None on a hit). A panel the
+# pool has queued is taken off its queue and built here; one the pool is already building is waited for
+# rather than built twice, and only built here if the pool's build failed.
+def lookup_items(cache, cache_key, build):
+    with cache['lock']:
+        items = cache['entries'].get(cache_key)
+        if items is not None:
+            cache['entries'].move_to_end(cache_key)
+            cache['hits'] += 1
+            return items, None
+        pending = cache['pending'].get(cache_key)
+    if pending is not None and not pending.cancel():
+        try:
+            return pending.result(), None
+        except Exception:
+            pass
+    built = build()
+    items = serialize_items(built)
+    store_items(cache, cache_key, items)
+    return items, built
+
+def cached_items(cache_key, build):
+    started, computed = time.perf_counter(), profile_compute_seconds()
+    items, built = lookup_items(figure_cache(), cache_key, build)
+    deserialized = deserialize_items(items, cache_key, build if built is None else lambda: built)
+    current = profile['current']
+    if current is not None:
+        # Roll-ups computed by the builder are data preparation, not figure construction
+        current['build'] += time.perf_counter() - started - (profile_compute_seconds() - computed)
+        current['hits'] += built is None
+        current['lookups'] += 1
+    return deserialized
+
+def cached_page(build_page, cache_key, page):
+    return cached_items(cache_key + (page,), partial(build_page, page))
+
+# Background build of one panel into the figure cache, with the first page of paged items.
+# Runs on a pool thread: no Streamlit calls and no profiling.
+def precompute_panel(cache, cache_key, build):
+    with cache['lock']:
+        items = cache['entries'].get(cache_key)
+    if items is not None:
+        return items
+    built = build()
+    for item in built:
+        if item[0] == 'pages':
+            store_items(cache, cache_key + (1,), serialize_items(item[3](1)))
+    items = serialize_items(built)
+    store_items(cache, cache_key, items)
+    return items
+
+def forget_pending(cache, cache_key, future):
+    with cache['lock']:
+        if cache['pending'].get(cache_key) is future:
+            del cache['pending'][cache_key]
+
+# Queues the unfiltered, default-option panels of the trends and the selected report sections after a
+# dataset is loaded, so they are warm by the time the page scrolls to them. The session keeps
+# the futures of its batch for the progress display; a new batch cancels the queued part of the old one.
+def schedule_precompute(section_context):
+    batch_key = (section_context['dataset_key'], tuple(section_context['comparison_pairs']), tuple(selected_sections))
+    batch = st.session_state.get('precompute')
+    if batch is not None and batch['key'] == batch_key:
+        return
+    if batch is not None:
+        for future in batch['futures']:
+            future.cancel()
+    # One SectionData of its own for the pool threads; its roll-ups are shared by all panels
+    data = SectionData(section_context, filters=dict.fromkeys(FILTER_KEYS, []))
+    sections = [("trends", TREND_PANELS, ())]
+    for section in REPORT_SECTIONS:
+        if section['anchor'] in selected_sections:
+            options = section.get('options', {})
+            for option, (_, choices) in options.items():
+                data[option] = choices[0]
+            sections.append((section['anchor'], section['panels'], tuple(options)))
+    cache, pool, futures = figure_cache(), precompute_pool(), []
+    for section_id, panels, options in sections:
+        for label, build in panels:
+            cache_key = panel_cache_key(data, section_id, label if len(panels) > 1 else None, options)
+            with cache['lock']:
+                if cache_key in cache['entries']:
+                    continue
+                future = submitted = cache['pending'].get(cache_key)
+                if future is None:
+                    future = cache['pending'][cache_key] = pool.submit(precompute_panel, cache, cache_key, partial(build, data))
+            # A callback on a finished future runs right away, so it is added outside the lock
+            if submitted is None:
+                future.add_done_callback(partial(forget_pending, cache, cache_key))
+            futures.append(future)
+    st.session_state['precompute'] = {'key': batch_key, 'futures': futures}
+
+def render_precompute_progress():
+    futures = st.session_state['precompute']['futures']
+    done = sum(future.done() for future in futures)
+    st.progress(done / len(futures) if futures else 1.0,
+                text=f"Arka Plan Hesaplaması: {done}/{len(futures)} panel")
+
+# Section rendering. In on-demand mode tabs and expanders rerun the script when toggled
+# and only the open panel's builder is called; otherwise every panel is built up front.
+def lazy_tabs(labels, key):
+    if on_demand:
+        return st.tabs(labels, key=key, on_change="rerun")
+    return st.tabs(labels)
+
+def lazy_expander(label, key):
+    if on_demand:
+        return st.expander(label, key=key, on_change="rerun")
+    return st.expander(label)
+
+def panel_is_open(container):
+    return container.open if on_demand else True
+
+# Chart bytes sent by the current run. Fragments nest, so only the outermost scope starts a new count:
+# a full run counts every fragment it draws, a fragment rerun only what it redraws.
+payload = {'sent': 0, 'depth': 0}
+
+@contextmanager
+def payload_scope():
+    if payload['depth'] == 0:
+        payload['sent'] = 0
+    payload['depth'] += 1
+    try:
+        yield
+    finally:
+        payload['depth'] -= 1
+
+def show_chart(key):
+    st.session_state.setdefault('shown_charts', set()).add(key)
+
+def render_chart(figure, key, nbytes):
+    current = profile['current']
+    requested = key in st.session_state.get('shown_charts', ())
+    if PAGE_PAYLOAD_MAX_BYTES and payload['sent'] + nbytes > PAGE_PAYLOAD_MAX_BYTES and not requested:
+        st.info(f"Bu grafik ({nbytes / 1024:.0f} KB) sayfa başına {PAGE_PAYLOAD_MAX_BYTES // 1024} KB olan "
+                f"veri sınırını aştığı için gönderilmedi.")
+        st.button("Grafiği Göster", key=f"{key}-show", on_click=show_chart, args=(key,))
+        if current is not None:
+            current['deferred'] += 1
+        return
+    started = time.perf_counter()
+    st.plotly_chart(figure, use_container_width=True, key=key)
+    payload['sent'] += nbytes
+    if current is not None:
+        current['send'] += time.perf_counter() - started
+        current['charts'] += 1
+        current['bytes'] += nbytes
+
+def render_items(items):
+    for item in items:
+        kind = item[0]
+        if kind == 'chart':
+            render_chart(*item[1:])
+        elif kind == 'table':
+            st.dataframe(item[1])
+        elif kind == 'markdown':
+            st.markdown(item[1])
+        elif kind == 'info':
+            st.info(item[1])
+        elif kind == 'pages':
+            _, key, page_count, build_page = item
+            page = 1
+            if page_count > 1:
+                page = st.number_input(f"Sayfa (toplam {page_count})", min_value=1, max_value=page_count, step=1, key=key)
+            render_items(build_page(page))
+
+def render_panel(build, data, section_id, panel, options):
+    render_items(cached_items(panel_cache_key(data, section_id, panel, options), partial(build, data)))
+
+def render_panels(panels, data, section_id, options=()):
+    if len(panels) == 1:
+        render_panel(panels[0][1], data, section_id, None, options)
+        return
+    tabs = lazy_tabs([label for label, _ in panels], key=f"{section_id}-tabs")
+    for tab, (label, build) in zip(tabs, panels):
+        with tab:
+            if panel_is_open(tab):
+                render_panel(build, data, section_id, label, options)
+
+# Each section is a fragment: its options, tabs, expander and pager rerun only the section itself
+@st.fragment
+@payload_scope()
+def render_section(section, data):
+    start_profile(section['title'], data)
+    anchor = section['anchor']
+    st.header(section['title'], anchor=anchor)
+    st.markdown(section['description'].format_map(data))
+    options = section.get('options', {})
+    for option, (label, choices) in options.items():
+        data[option] = st.radio(label, choices, horizontal=True, key=option)
+    if 'expander' in section:
+        expander = lazy_expander(section['expander'], key=f"{anchor}-expander")
+        with expander:
+            if panel_is_open(expander):
+                render_panels(section['panels'], data, anchor, tuple(options))
+    else:
+        render_panels(section['panels'], data, anchor, tuple(options))
+    if 'footnote' in section:
+        st.markdown(section['footnote'])
+    finish_profile()
+
+# Headline metrics and takeaways depend only on the dataset and the compared years, so they are computed
+# once per dataset and year pair for all sessions; filter changes never reach them
+@st.cache_resource(max_entries=64)
+def summary_metrics(_dataset, dataset_key, base_year, target_year, has_pairs):
+    df, cube = _dataset.df, _dataset.cube
+    year_summary = rollup_cube(cube, ['Year']).set_index('Year')
+    faculty_summary = rollup_cube(cube, ['Faculty', 'Year'])
+    summary = {'total_pubs': year_summary['Total Publications'].sum(),
+               'pubs_base': year_summary['Total Publications'].get(base_year, 0),
+               'pubs_target': year_summary['Total Publications'].get(target_year, 0)}
+    pubs_base, pubs_target = summary['pubs_base'], summary['pubs_target']
+    pub_change = summary['pub_change'] = ((pubs_target - pubs_base) / pubs_base * 100) if pubs_base > 0 and has_pairs else 0
+    active_researchers = summary['active_researchers'] = df[df['Total Publications'] > 0]['Name'].nunique()
+    high_impact_researchers = summary['high_impact_researchers'] = df[(df['Q1 Articles'] > 0) | (df['Q2 Articles'] > 0)]['Name'].nunique()
+    summary['avg_impact'] = year_summary['Impact Score'].sum() / len(df) if len(df) else 0
+    summary['diversity_index'] = diversity_by(cube, ['Faculty', 'Year']).mean()
+
+    # Key Takeaways
+    takeaways = summary['takeaways'] = []
+    if pub_change > 10:
+        takeaways.append(f"- **Büyüme Trendi**: {base_year}'ten {target_year}'e yayın sayısında %{pub_change:.1f} artış, araştırma çıktılarında güçlü bir yükselişi gösteriyor.")
+    elif pub_change < -10:
+        takeaways.append(f"- **Düşüş Trendi**: {base_year}'ten {target_year}'e yayın sayısında %{pub_change:.1f} azalma, potansiyel kaynak veya odak değişikliğini işaret edebilir.")
+    top_pub_type = year_summary[pub_types].sum().idxmax()
+    top_pub_count = year_summary[pub_types].sum().max()
+    takeaways.append(f"- **Dominant Yayın Türü**: {pub_type_labels[top_pub_type]} ({top_pub_count} adet), toplam çıktının önemli bir kısmını oluşturuyor.")
+    if high_impact_researchers / active_researchers > 0.5:
+        takeaways.append(f"- **Yüksek Etki Odağı**: Aktif araştırmacıların %{high_impact_researchers/active_researchers*100:.1f}'i Q1 veya Q2 makaleler üretiyor.")
+    declining_faculties = faculty_summary.pivot(index='Faculty', columns='Year', values='Total Publications').reindex(
+        columns=[base_year, target_year], fill_value=0).fillna(0).pipe(
+        lambda x: x[x[target_year] < x[base_year] * 0.8].index.tolist()
+    ) if has_pairs else []
+    if declining_faculties:
+        takeaways.append(f"- **Düşüş Gösteren Fakülteler**: {', '.join(declining_faculties)} {target_year}'te yayın sayısında önemli düşüşler yaşadı.")
+    return summary
+
+# Summary, unit matching and validation blocks; the trend tabs and expander rerun only this fragment
+@st.fragment
+@payload_scope()
+def render_summary(dataset, summary_data):
+    years_text, comparison_pairs = summary_data['years_text'], summary_data['comparison_pairs']
+    # Headline metrics use the latest compared pair
+    base_year, target_year = comparison_pairs[-1] if comparison_pairs else (None, summary_data['years'][-1])
+
+    # Expanded Summary Statistics
+    start_profile("Özet İstatistikler", summary_data)
+    st.header("Özet İstatistikler", anchor="ozet-istatistikler")
+    st.markdown(f"Bu bölüm, {years_text} yayın verilerinin temel istatistiklerini ve önemli trendlerini özetler.")
+
+    # Metrics
+    summary = summary_metrics(dataset, dataset.key, base_year, target_year, bool(comparison_pairs))
+    col1, col2, col3 = st.columns(3)
+    with col1:
+        st.metric("Toplam Yayın", f"{summary['total_pubs']}")
+        if comparison_pairs:
+            st.metric(f"{base_year} Yayınları", f"{summary['pubs_base']}")
+        st.metric(f"{target_year} Yayınları", f"{summary['pubs_target']}")
+    with col2:
+        if comparison_pairs:
+            st.metric(f"Yayın Değişimi ({base_year}-{target_year})", f"{summary['pub_change']:.1f}%")
+        st.metric("Aktif Araştırmacılar", f"{summary['active_researchers']}")
+        st.metric("Yüksek Etkili Araştırmacılar (Q1/Q2)", f"{summary['high_impact_researchers']}")
+    with col3:
+        st.metric("Ortalama Etki Puanı", f"{summary['avg_impact']:.2f}")
+        st.metric("Ortalama Çeyreklik Çeşitlilik İndeksi", f"{summary['diversity_index']:.2f}")
+
+    # Key Takeaways
+    st.subheader("Önemli Bulgular")
+    for takeaway in summary['takeaways']:
+        st.markdown(takeaway)
+
+    # Visualizations
+    st.subheader("Trend Görselleştirmeleri")
+    trends_expander = lazy_expander("Trendleri Görüntüle", key="trends-expander")
+    with trends_expander:
+        if panel_is_open(trends_expander):
+            render_panels(TREND_PANELS, summary_data, "trends")
+
+    # Unit names that were not in the mappings: fuzzy matches and names left unmapped
+    unit_matches = dataset.unit_matches
+    if not unit_matches.empty:
+        unmapped = unit_matches[unit_matches['Durum'] == 'Eşlenmedi']
+        with st.expander(f"Eşlenmemiş Fakülte ve Bölümler ({len(unmapped)}/{len(unit_matches)})"):
+            st.markdown(f"Eşleme tablosunda bulunmayan birim adları en benzer birime eşlendi; benzerliği "
+                        f"{UNIT_MATCH_THRESHOLD:.2f} altında kalanlar veya ikinci en benzer birimin önüne "
+                        f"{UNIT_MATCH_MARGIN:.2f} farkla geçemeyenler, her kelimesi tek bir birimin adında (uzun "
+                        f"kelimelerde bir harf hatasıyla) bulunmuyorsa eşlenmedi ve birim bazındaki grafiklerde yer almaz.")
+            if not unmapped.empty:
+                st.warning("Eşlenmemiş Fakülte ve Bölümler: " + ", ".join(unmapped['Ham Değer']))
+            st.dataframe(unit_matches, use_container_width=True, hide_index=True)
+
+    # Validation report
+    start_profile("Veri Hataları")
+    removed_df = dataset.removed_df
+    st.header("Veri Hataları", anchor="veri-hatalari")
+    if removed_df.empty:
+        st.markdown("Doğrulama kurallarını ihlal eden kayıt bulunamadı.")
+    else:
+        removed_count = (removed_df['Durum'] == 'Kaldırıldı').sum()
+        st.markdown(f"Doğrulama kuralları {len(removed_df)} bulgu üretti: {removed_count} hata nedeniyle ilgili satırlar analizden çıkarıldı, {len(removed_df) - removed_count} uyarı yalnızca raporlandı.")
+        with st.expander("Doğrulama Raporunu Görüntüle"):
+            st.dataframe(removed_df, use_container_width=True)
+
+    # Names whose title could not be extracted (only when the sheet has no Title column)
+    unmatched_titles = dataset.unmatched_titles
+    if not unmatched_titles.empty:
+        with st.expander(f"Unvanı Belirlenemeyen Kişiler ({len(unmatched_titles)})"):
+            st.markdown("Bu kişilerin adında tanınan bir unvan bulunamadı ve 'Diğer' olarak sınıflandırıldılar.")
+            st.dataframe(unmatched_titles, use_container_width=True)
+    finish_profile()
+
+# Filter panel and the report sections below it: a filter change reruns this fragment only,
+# leaving the upload, summary and validation blocks as they are
+@st.fragment
+@payload_scope()
+def render_report(dataset, section_context):
+    df, cube, label_indexes = dataset.df, dataset.cube, dataset.label_indexes
+    # Interactive Filters
+    start_profile("Veri Filtreleme")
+    st.header("Veri Filtreleme", anchor="veri-filtreleme")
+    st.markdown("Fakülte, bölüm ve unvan bazında filtreleme yapın. Dahil etmek istediğiniz kategorileri seçin veya hariç tutmak istediğiniz kategorileri belirtin.")
+    col1, col2, col3 = st.columns(3)
+    with col1:
+        faculty_options = sorted([f for f in FACULTY_MAPPING.keys() if f in present_unit_labels(cube['Faculty'], label_indexes['Faculty'])], key=str.lower)
+        faculty_filter = st.multiselect("Fakülte Seçin (Dahil Et)", options=faculty_options, default=[])
+    with col2:
+        dept_options = sorted([d for d in DEPARTMENT_MAPPING.keys() if d in present_unit_labels(cube['Department'], label_indexes['Department']) and d], key=str.lower)
+        department_filter = st.multiselect("Bölüm Seçin (Dahil Et)", options=dept_options, default=[])
+    with col3:
+        title_options = sorted([t for t in df['Title'].unique() if t and isinstance(t, str)], key=str.lower)
+        title_filter = st.multiselect("Unvan Seçin (Dahil Et)", options=title_options, default=[])
+    
+    # Exclusion Filters
+    col4, col5, col6 = st.columns(3)
+    with col4:
+        faculty_exclude = st.multiselect("Fakülte Hariç Tut", options=faculty_options, default=[])
+    with col5:
+        department_exclude = st.multiselect("Bölüm Hariç Tut", options=dept_options, default=[])
+    with col6:
+        title_exclude = st.multiselect("Unvan Hariç Tut", options=title_options, default=[])
+
+    filters = dict(zip(FILTER_KEYS, [faculty_filter, department_filter, title_filter,
+                                     faculty_exclude, department_exclude, title_exclude]))
+    section_data = SectionData(section_context, filters=filters)
+    # Built on click on Streamlit's download thread, from its own SectionData so the runs never share one
+    st.download_button("Filtrelenmiş Verileri Excel Olarak İndir",
+                       data=partial(export_workbook, SectionData(section_context, filters=filters)),
+                       file_name="yayin_ozetleri.xlsx", on_click="ignore",
+                       mime="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet")
+
+    # Visualizations
+    st.subheader("Veri Görselleştirmeleri")
+    finish_profile()
+    for section in REPORT_SECTIONS:
+        if section['anchor'] in selected_sections:
+            # Fragment ids derive from the enclosing container, so each section gets its own
+            with st.container():
+                render_section(section, section_data)
+    if profiling:
+        df_memory = frame_memory(df)
+        profile['memory'] = {'df': df_memory['compact'], 'df_wide': df_memory['wide'],
+                             'filtered_df': int(section_data['filtered_df'].memory_usage(deep=True).sum())}
+        render_profile()
 
 # Process uploaded files
-if uploaded_file_2023 is not None and uploaded_file_2024 is not None:
-    df, removed_df, error = load_and_process_data(uploaded_file_2023, uploaded_file_2024)
+report_shown = False
+if uploaded_files:
+    # The session holds its lease until it uploads other files or ends; it is kept out of the script's
+    # globals so the previous run's namespace cannot keep it alive
+    st.session_state['dataset_lease'], error = dataset_registry().acquire(
+        uploaded_files, st.session_state.get('dataset_lease'))
     if error:
         st.error(f"Dosyalar işlenirken hata oluştu: {error}")
     else:
+        dataset = st.session_state['dataset_lease'].dataset
+        # Year comparison settings
+        years = sorted(dataset.df['Year'].unique())
+        year_color_map = build_year_color_map(years)
+        with st.sidebar:
+            st.header("Yıl Karşılaştırması")
+            comparison_mode = st.radio("Değişim Hesaplama", ["Seçili Yıl Çifti", "Ardışık Yıllar"])
+            base_year, target_year = years[max(len(years) - 2, 0)], years[-1]
+            if comparison_mode == "Seçili Yıl Çifti":
+                base_year = st.selectbox("Başlangıç Yılı", years, index=years.index(base_year))
+                target_year = st.selectbox("Bitiş Yılı", years, index=years.index(target_year))
+        comparison_pairs = build_comparison_pairs(years, comparison_mode, base_year, target_year)
+        compared_years = sorted({year for pair in comparison_pairs for year in pair}) or years
+        years_text = describe_years(years)
+
         with st.container():
             st.success("Dosyalar başarıyla yüklendi ve fakülte/bölüm isimleri standardize edildi.")
 
-            # Expanded Summary Statistics
-            st.header("Özet İstatistikler", anchor="ozet-istatistikler")
-            st.markdown("Bu bölüm, 2023 ve 2024 yayın verilerinin temel istatistiklerini ve önemli trendlerini özetler.")
-
-            # Metrics
-            total_pubs = df['Total Publications'].sum()
-            pubs_2023 = df[df['Year'] == '2023']['Total Publications'].sum()
-            pubs_2024 = df[df['Year'] == '2024']['Total Publications'].sum()
-            pub_change = ((pubs_2024 - pubs_2023) / pubs_2023 * 100) if pubs_2023 > 0 else 0
-            active_researchers = df[df['Total Publications'] > 0]['Name'].nunique()
-            high_impact_researchers = df[df['Q1 Articles'] + df['Q2 Articles'] > 0]['Name'].nunique()
-            avg_impact = df['Impact Score'].mean()
-            quartile_cols = ['Q1 Articles', 'Q2 Articles', 'Q3 Articles', 'Q4 Articles']
-            diversity_index = df.groupby(['Faculty', 'Year'])[quartile_cols].sum().apply(
-                lambda row: -sum((c / sum(row) * np.log(c / sum(row))) for c in row if c > 0) if sum(row) > 0 else 0, axis=1
-            ).mean()
-
-            col1, col2, col3 = st.columns(3)
-            with col1:
-                st.metric("Toplam Yayın", f"{total_pubs}")
-                st.metric("2023 Yayınları", f"{pubs_2023}")
-                st.metric("2024 Yayınları", f"{pubs_2024}")
-            with col2:
-                st.metric("Yayın Değişimi (2023-2024)", f"{pub_change:.1f}%")
-                st.metric("Aktif Araştırmacılar", f"{active_researchers}")
-                st.metric("Yüksek Etkili Araştırmacılar (Q1/Q2)", f"{high_impact_researchers}")
-            with col3:
-                st.metric("Ortalama Etki Puanı", f"{avg_impact:.2f}")
-                st.metric("Ortalama Çeyreklik Çeşitlilik İndeksi", f"{diversity_index:.2f}")
-
-            # Key Takeaways
-            st.subheader("Önemli Bulgular")
-            takeaways = []
-            if pub_change > 10:
-                takeaways.append(f"- **Büyüme Trendi**: 2023'ten 2024'e yayın sayısında %{pub_change:.1f} artış, araştırma çıktılarında güçlü bir yükselişi gösteriyor.")
-            elif pub_change < -10:
-                takeaways.append(f"- **Düşüş Trendi**: 2023'ten 2024'e yayın sayısında %{pub_change:.1f} azalma, potansiyel kaynak veya odak değişikliğini işaret edebilir.")
-            top_pub_type = df[pub_types].sum().idxmax()
-            top_pub_count = df[pub_types].sum().max()
-            takeaways.append(f"- **Dominant Yayın Türü**: {pub_type_labels[top_pub_type]} ({top_pub_count} adet), toplam çıktının önemli bir kısmını oluşturuyor.")
-            if high_impact_researchers / active_researchers > 0.5:
-                takeaways.append(f"- **Yüksek Etki Odağı**: Aktif araştırmacıların %{high_impact_researchers/active_researchers*100:.1f}'i Q1 veya Q2 makaleler üretiyor.")
-            declining_faculties = df.groupby(['Faculty', 'Year'])['Total Publications'].sum().unstack().fillna(0).pipe(
-                lambda x: x[x['2024'] < x['2023'] * 0.8].index.tolist()
-            )
-            if declining_faculties:
-                takeaways.append(f"- **Düşüş Gösteren Fakülteler**: {', '.join(declining_faculties)} 2024'te yayın sayısında önemli düşüşler yaşadı.")
-            for takeaway in takeaways:
-                st.markdown(takeaway)
-
-            # Visualizations
-            st.subheader("Trend Görselleştirmeleri")
-            with st.expander("Trendleri Görüntüle"):
-                tab1, tab2, tab3 = st.tabs(["Yayın Türü Değişimleri", "Yayın Türü Dağılımı", "En Aktif Fakülteler"])
-                with tab1:
-                    pub_trend = df.groupby('Year')[pub_types].sum().reset_index()
-                    pub_trend_melted = pub_trend.melt(id_vars='Year', value_vars=pub_types, var_name='Publication Type', value_name='Sayı')
-                    pub_trend_melted['Publication Type'] = pub_trend_melted['Publication Type'].map(pub_type_labels)
-                    change_data = pub_trend.set_index('Year')[pub_types].T
-                    change_data['Change'] = change_data['2024'] - change_data['2023']
-                    change_data['Change Type'] = change_data['Change'].apply(lambda x: 'increase' if x >= 0 else 'decrease')
-                    change_data = change_data.reset_index().rename(columns={'index': 'Publication Type'})
-                    change_data['Publication Type'] = change_data['Publication Type'].map(pub_type_labels)
-                    fig_trend = px.bar(change_data, x='Change', y='Publication Type', orientation='h',
-                                       color='Change Type', title="Yayın Türü Değişimleri (2023-2024)",
-                                       color_discrete_map=CHANGE_COLOR_MAP)
-                    fig_trend.update_layout(
-                        xaxis_title="Değişim (2024 - 2023)",
-                        yaxis_title="Yayın Türü",
-                        height=500,
-                        width=900,
-                        xaxis=dict(zeroline=True, zerolinecolor='black', zerolinewidth=2)
-                    )
-                    st.plotly_chart(fig_trend, use_container_width=True, key="pub_trend_change_bar")
-                with tab2:
-                    pub_dist = df[pub_types].sum().reset_index()
-                    pub_dist.columns = ['Publication Type', 'Sayı']
-                    pub_dist['Publication Type'] = pub_dist['Publication Type'].map(pub_type_labels)
-                    fig_dist = px.pie(pub_dist, names='Publication Type', values='Sayı',
-                                      title="Tüm Yayın Türlerinin Dağılımı", color_discrete_map=COLOR_MAP)
-                    fig_dist.update_layout(height=500, width=900)
-                    st.plotly_chart(fig_dist, use_container_width=True, key="pub_dist_pie_summary")
-                with tab3:
-                    faculty_pubs = df.groupby(['Faculty', 'Year'])['Total Publications'].sum().reset_index()
-                    faculty_pubs['Faculty'] = faculty_pubs['Faculty'].map(lambda x: list(FACULTY_MAPPING.keys())[list(FACULTY_MAPPING.values()).index(x)] if x in FACULTY_MAPPING.values() else x)
-                    top_faculties = faculty_pubs.groupby('Faculty')['Total Publications'].sum().nlargest(5).index
-                    top_faculty_data = faculty_pubs[faculty_pubs['Faculty'].isin(top_faculties)]
-                    fig_faculty = px.bar(top_faculty_data, x='Faculty', y='Total Publications', color='Year', barmode='group',
-                                         title="En Aktif 5 Fakülte (Yayın Sayısı)", color_discrete_map=YEAR_COLOR_MAP)
-                    fig_faculty.update_layout(xaxis_tickangle=45, height=500, width=900)
-                    st.plotly_chart(fig_faculty, use_container_width=True, key="top_faculties_bar_summary")
-
-            # Check for unmapped faculties or departments
-            unmapped_faculties = df['Faculty'][~df['Faculty'].isin(FACULTY_MAPPING.values()) & (df['Faculty'] != 'Bilinmeyen')].unique()
-            unmapped_departments = df['Department'][~df['Department'].isin(DEPARTMENT_MAPPING.values()) & (df['Department'] != 'Bilinmeyen')].unique()
-            if unmapped_faculties.size > 0 or unmapped_departments.size > 0:
-                with st.expander("Eşlenmemiş Fakülte ve Bölümler"):
-                    if unmapped_faculties.size > 0:
-                        st.warning("Eşlenmemiş Fakülteler:")
-                        for faculty in unmapped_faculties:
-                            st.write(f"- {faculty}")
-                    if unmapped_departments.size > 0:
-                        st.warning("Eşlenmemiş Bölümler:")
-                        for dept in unmapped_departments:
-                            st.write(f"- {dept}")
-
-            # Interactive Filters
-            st.header("Veri Filtreleme", anchor="veri-filtreleme")
-            st.markdown("Fakülte, bölüm ve unvan bazında filtreleme yapın. Dahil etmek istediğiniz kategorileri seçin veya hariç tutmak istediğiniz kategorileri belirtin.")
-            col1, col2, col3 = st.columns(3)
-            with col1:
-                faculty_options = sorted([f for f in FACULTY_MAPPING.keys() if f in df['Faculty'].map(lambda x: list(FACULTY_MAPPING.keys())[list(FACULTY_MAPPING.values()).index(x)] if x in FACULTY_MAPPING.values() else x).unique()], key=str.lower)
-                faculty_filter = st.multiselect("Fakülte Seçin (Dahil Et)", options=faculty_options, default=[])
-            with col2:
-                dept_options = sorted([d for d in DEPARTMENT_MAPPING.keys() if d in df['Department'].map(lambda x: list(DEPARTMENT_MAPPING.keys())[list(DEPARTMENT_MAPPING.values()).index(x)] if x in DEPARTMENT_MAPPING.values() else x).unique() and d], key=str.lower)
-                department_filter = st.multiselect("Bölüm Seçin (Dahil Et)", options=dept_options, default=[])
-            with col3:
-                title_options = sorted([t for t in df['Title'].unique() if t and isinstance(t, str)], key=str.lower)
-                title_filter = st.multiselect("Unvan Seçin (Dahil Et)", options=title_options, default=[])
-            
-            # Exclusion Filters
-            col4, col5, col6 = st.columns(3)
-            with col4:
-                faculty_exclude = st.multiselect("Fakülte Hariç Tut", options=faculty_options, default=[])
-            with col5:
-                department_exclude = st.multiselect("Bölüm Hariç Tut", options=dept_options, default=[])
-            with col6:
-                title_exclude = st.multiselect("Unvan Hariç Tut", options=title_options, default=[])
-
-            # Apply filters
-            filtered_df = df.copy()
-            # Inclusion filters
-            if faculty_filter:
-                filtered_df = filtered_df[filtered_df['Faculty'].map(lambda x: list(FACULTY_MAPPING.keys())[list(FACULTY_MAPPING.values()).index(x)] if x in FACULTY_MAPPING.values() else x).isin(faculty_filter)]
-            if department_filter:
-                filtered_df = filtered_df[filtered_df['Department'].map(lambda x: list(DEPARTMENT_MAPPING.keys())[list(DEPARTMENT_MAPPING.values()).index(x)] if x in DEPARTMENT_MAPPING.values() else x).isin(department_filter)]
-            if title_filter:
-                filtered_df = filtered_df[filtered_df['Title'].isin(title_filter)]
-            # Exclusion filters
-            if faculty_exclude:
-                filtered_df = filtered_df[~filtered_df['Faculty'].map(lambda x: list(FACULTY_MAPPING.keys())[list(FACULTY_MAPPING.values()).index(x)] if x in FACULTY_MAPPING.values() else x).isin(faculty_exclude)]
-            if department_exclude:
-                filtered_df = filtered_df[~filtered_df['Department'].map(lambda x: list(DEPARTMENT_MAPPING.keys())[list(DEPARTMENT_MAPPING.values()).index(x)] if x in DEPARTMENT_MAPPING.values() else x).isin(department_exclude)]
-            if title_exclude:
-                filtered_df = filtered_df[~filtered_df['Title'].isin(title_exclude)]
-
-            # Visualizations
-            st.subheader("Veri Görselleştirmeleri")
-
-            # Year-wise Publication Type Distribution
-            st.header("Yıl Bazında Yayın Türü Dağılımı", anchor="yil-bazinda-yayin")
-            st.markdown("2023 ve 2024 yıllarında yayın türlerinin dağılımı.")
-            pub_data = filtered_df.groupby('Year')[pub_types].sum().reset_index()
-            pub_data_melted = pub_data.melt(id_vars='Year', value_vars=pub_types, var_name='Publication Type', value_name='Sayı')
-            pub_data_melted['Publication Type'] = pub_data_melted['Publication Type'].map(pub_type_labels)
-            fig1 = px.bar(pub_data_melted, x='Year', y='Sayı', color='Publication Type', barmode='group',
-                          title="Yıl Bazında Yayın Türü Dağılımı", color_discrete_map=COLOR_MAP)
-            fig1.update_layout(height=600, width=900)
-            st.plotly_chart(fig1, use_container_width=True, key="year_wise_pub_type")
-
-            # Side-by-Side Comparison for 2023 vs 2024
-            st.header("Yayın Türü Değişim Karşılaştırması (2023 vs 2024)", anchor="yayin-degisim")
-            st.markdown("2023 ve 2024 yıllarında yayın türlerinin karşılaştırması.")
-            pub_compare = filtered_df.groupby(['Year'])[pub_types].sum().reset_index()
-            pub_compare_melted = pub_compare.melt(id_vars='Year', value_vars=pub_types, var_name='Publication Type', value_name='Sayı')
-            pub_compare_melted['Publication Type'] = pub_compare_melted['Publication Type'].map(pub_type_labels)
-            fig1b = px.bar(pub_compare_melted, x='Publication Type', y='Sayı', color='Year', barmode='group',
-                           title="2023 ve 2024 Yılları Yayın Türü Karşılaştırması",
-                           color_discrete_map=YEAR_COLOR_MAP)
-            fig1b.update_layout(xaxis_tickangle=45, height=600, width=900)
-            st.plotly_chart(fig1b, use_container_width=True, key="year_comparison_bar")
-
-            # Faculty/Department-wise Publication Quartile Distribution (Pie Chart)
-            st.header("Fakülte/Bölüm Bazında Yayın Çeyreklik Dağılımı", anchor="fakulte-ceyreklik")
-            st.markdown("Fakülteler ve bölümlerdeki Q1-Q4 çeyreklik makalelerin dağılımı.")
-            with st.expander("Fakülte/Bölüm Bazında Çeyreklik Dağılımlarını Görüntüle"):
-                quartile_cols = ['Q1 Articles', 'Q2 Articles', 'Q3 Articles', 'Q4 Articles']
-                tab1, tab2 = st.tabs(["Fakülteler", "Bölümler"])
-                with tab1:
-                    pub_quartile_data_faculty = filtered_df.groupby(['Faculty', 'Year'])[quartile_cols].sum().reset_index()
-                    pub_quartile_data_faculty['Faculty'] = pub_quartile_data_faculty['Faculty'].map(lambda x: list(FACULTY_MAPPING.keys())[list(FACULTY_MAPPING.values()).index(x)] if x in FACULTY_MAPPING.values() else x)
-                    pub_quartile_melted_faculty = pub_quartile_data_faculty.melt(id_vars=['Faculty', 'Year'], value_vars=quartile_cols, var_name='Çeyreklik', value_name='Sayı')
-                    pub_quartile_melted_faculty['Çeyreklik'] = pub_quartile_melted_faculty['Çeyreklik'].map({
-                        'Q1 Articles': 'Q1 Makaleleri',
-                        'Q2 Articles': 'Q2 Makaleleri',
-                        'Q3 Articles': 'Q3 Makaleleri',
-                        'Q4 Articles': 'Q4 Makaleleri'
-                    })
-                    for year in ['2023', '2024']:
-                        for faculty in pub_quartile_data_faculty['Faculty'].unique():
-                            faculty_data = pub_quartile_melted_faculty[(pub_quartile_melted_faculty['Faculty'] == faculty) & (pub_quartile_melted_faculty['Year'] == year)]
-                            if faculty_data['Sayı'].sum() > 0:
-                                fig = px.pie(faculty_data, names='Çeyreklik', values='Sayı', title=f"{year} - {faculty} için Yayın Çeyreklik Dağılımı", color_discrete_map=COLOR_MAP)
-                                fig.update_layout(height=500, width=800)
-                                st.plotly_chart(fig, use_container_width=True, key=f"pie_faculty_{faculty}_{year}")
-                with tab2:
-                    pub_quartile_data_dept = filtered_df.groupby(['Department', 'Year'])[quartile_cols].sum().reset_index()
-                    pub_quartile_data_dept['Department'] = pub_quartile_data_dept['Department'].map(lambda x: list(DEPARTMENT_MAPPING.keys())[list(DEPARTMENT_MAPPING.values()).index(x)] if x in DEPARTMENT_MAPPING.values() else x)
-                    pub_quartile_melted_dept = pub_quartile_data_dept.melt(id_vars=['Department', 'Year'], value_vars=quartile_cols, var_name='Çeyreklik', value_name='Sayı')
-                    pub_quartile_melted_dept['Çeyreklik'] = pub_quartile_melted_dept['Çeyreklik'].map({
-                        'Q1 Articles': 'Q1 Makaleleri',
-                        'Q2 Articles': 'Q2 Makaleleri',
-                        'Q3 Articles': 'Q3 Makaleleri',
-                        'Q4 Articles': 'Q4 Makaleleri'
-                    })
-                    for year in ['2023', '2024']:
-                        for dept in pub_quartile_data_dept['Department'].unique():
-                            dept_data = pub_quartile_melted_dept[(pub_quartile_melted_dept['Department'] == dept) & (pub_quartile_melted_dept['Year'] == year)]
-                            if dept_data['Sayı'].sum() > 0:
-                                fig = px.pie(dept_data, names='Çeyreklik', values='Sayı', title=f"{year} - {dept} için Yayın Çeyreklik Dağılımı", color_discrete_map=COLOR_MAP)
-                                fig.update_layout(height=500, width=800)
-                                st.plotly_chart(fig, use_container_width=True, key=f"pie_dept_{dept}_{year}")
-
-            # Faculty and Publication Type Heatmap
-            st.header("Fakülte ve Yayın Türü Dağılımı", anchor="fakulte-yayin-turu")
-            st.markdown("Fakültelerdeki yayın türlerinin ısı haritası.")
-            tab1, tab2 = st.tabs(["Fakülteler", "Bölümler"])
-            with tab1:
-                heatmap_data_faculty = filtered_df.groupby(['Faculty', 'Year'])[pub_types].sum().reset_index()
-                heatmap_data_faculty['Faculty'] = heatmap_data_faculty['Faculty'].map(lambda x: list(FACULTY_MAPPING.keys())[list(FACULTY_MAPPING.values()).index(x)] if x in FACULTY_MAPPING.values() else x)
-                for year in ['2023', '2024']:
-                    heatmap_year = heatmap_data_faculty[heatmap_data_faculty['Year'] == year].set_index('Faculty')[pub_types]
-                    heatmap_year = heatmap_year.loc[heatmap_year.sum(axis=1) > 0, :]
-                    heatmap_year = heatmap_year.reindex(index=[FACULTY_MAPPING[f] for f in FACULTY_ORDER if FACULTY_MAPPING[f] in heatmap_year.index])
-                    heatmap_year.columns = [pub_type_labels[col] for col in heatmap_year.columns]
-                    fig2 = px.imshow(heatmap_year, title=f"{year} - Fakülte ve Yayın Türü Dağılımı",
-                                     labels=dict(x="Yayın Türü", y="Fakülte", color="Sayı"), color_continuous_scale="Blues")
-                    fig2.update_layout(height=800, width=900, xaxis={'tickangle': 45})
-                    st.plotly_chart(fig2, use_container_width=True, key=f"heatmap_faculty_{year}")
-            with tab2:
-                heatmap_data_dept = filtered_df.groupby(['Department', 'Year'])[pub_types].sum().reset_index()
-                heatmap_data_dept['Department'] = heatmap_data_dept['Department'].map(lambda x: list(DEPARTMENT_MAPPING.keys())[list(DEPARTMENT_MAPPING.values()).index(x)] if x in DEPARTMENT_MAPPING.values() else x)
-                for year in ['2023', '2024']:
-                    heatmap_year = heatmap_data_dept[heatmap_data_dept['Year'] == year].set_index('Department')[pub_types]
-                    heatmap_year = heatmap_year.loc[heatmap_year.sum(axis=1) > 0, :]
-                    heatmap_year = heatmap_year.reindex(index=[DEPARTMENT_MAPPING[d] for d in DEPARTMENT_ORDER if DEPARTMENT_MAPPING[d] in heatmap_year.index])
-                    heatmap_year.columns = [pub_type_labels[col] for col in heatmap_year.columns]
-                    fig2 = px.imshow(heatmap_year, title=f"{year} - Bölüm ve Yayın Türü Dağılımı",
-                                     labels=dict(x="Yayın Türü", y="Bölüm", color="Sayı"), color_continuous_scale="Blues")
-                    fig2.update_layout(height=800, width=900, xaxis={'tickangle': 45})
-                    st.plotly_chart(fig2, use_container_width=True, key=f"heatmap_dept_{year}")
-
-            # Top 5 Units by Total Publications
-            st.header("Toplam Yayın Sayısına Göre İlk 5 Birim", anchor="top-5-birim")
-            st.markdown("2023 ve 2024 için en aktif 5 fakülte ve bölüm.")
-            tab1, tab2 = st.tabs(["Fakülteler", "Bölümler"])
-            with tab1:
-                faculty_year_totals = filtered_df.groupby(['Faculty', 'Year'])['Total Publications'].sum().reset_index()
-                faculty_year_totals['Faculty'] = faculty_year_totals['Faculty'].map(lambda x: list(FACULTY_MAPPING.keys())[list(FACULTY_MAPPING.values()).index(x)] if x in FACULTY_MAPPING.values() else x)
-                top_5_faculties = faculty_year_totals.groupby('Faculty')['Total Publications'].sum().nlargest(5).index
-                top_faculty_data = faculty_year_totals[faculty_year_totals['Faculty'].isin(top_5_faculties)]
-                fig3_faculty = px.bar(top_faculty_data, x='Faculty', y='Total Publications', color='Year', barmode='group',
-                                      title="Toplam Yayın Sayısına Göre İlk 5 Fakülte",
-                                      color_discrete_map=YEAR_COLOR_MAP)
-                fig3_faculty.update_layout(xaxis_tickangle=45, height=500, width=900)
-                st.plotly_chart(fig3_faculty, use_container_width=True, key="top_5_faculties_bar")
-            with tab2:
-                dept_year_totals = filtered_df.groupby(['Department', 'Year'])['Total Publications'].sum().reset_index()
-                dept_year_totals['Department'] = dept_year_totals['Department'].map(lambda x: list(DEPARTMENT_MAPPING.keys())[list(DEPARTMENT_MAPPING.values()).index(x)] if x in FACULTY_MAPPING.values() else x)
-                top_5_depts = dept_year_totals.groupby('Department')['Total Publications'].sum().nlargest(5).index
-                top_dept_data = dept_year_totals[dept_year_totals['Department'].isin(top_5_depts)]
-                fig3_dept = px.bar(top_dept_data, x='Department', y='Total Publications', color='Year', barmode='group',
-                                   title="Toplam Yayın Sayısına Göre İlk 5 Bölüm",
-                                   color_discrete_map=YEAR_COLOR_MAP)
-                fig3_dept.update_layout(xaxis_tickangle=45, height=500, width=900)
-                st.plotly_chart(fig3_dept, use_container_width=True, key="top_5_depts_bar")
-            
-            # Title-wise Publication Distribution
-            st.header("Unvan Bazında Yayın Dağılımı", anchor="unvan-dagilim")
-            st.markdown("2023 ve 2024 için akademik unvanların yayın katkıları.")
-            
-            # Apply title mapping to ensure consistency
-            title_mapping = {
-                "Prof. Dr.": "Prof. Dr.",
-                "Doç. Dr.": "Doç. Dr.",
-                "Dr. Öğr. Üyesi": "Dr. Öğr. Üyesi",
-                "Araştırma Görevlisi": "Diğer Ünvanlar",
-                "Öğretim Görevlisi": "Diğer Ünvanlar",
-                "Araştırmacı": "Diğer Ünvanlar",
-                "İdari Personel": "Diğer Ünvanlar",
-                "Diğer": "Diğer Ünvanlar",
-                "Arş. Gör.": "Diğer Ünvanlar",
-                "Öğr. Gör.": "Diğer Ünvanlar"
-            }
-            filtered_df['Title'] = filtered_df['Title'].map(title_mapping).fillna("Diğer Ünvanlar")
-            title_year_pubs = filtered_df.groupby(['Title', 'Year'])['Total Publications'].sum().reset_index()
-            title_order_updated = ["Dr. Öğr. Üyesi", "Doç. Dr.", "Prof. Dr.", "Diğer Ünvanlar"]
-            title_year_pubs['Title'] = pd.Categorical(title_year_pubs['Title'], categories=title_order_updated, ordered=True)
-            
-            # Debug: Display raw publication counts
-            st.write("**Unvan Bazında Yayın Sayıları**")
-            st.dataframe(title_year_pubs.pivot(index='Title', columns='Year', values='Total Publications').fillna(0))
-            
-            # Plot for all titles
-            fig_titles = px.bar(title_year_pubs, x='Title', y='Total Publications', color='Year', barmode='group',
-                                title="Unvan Bazında Yayın Dağılımı",
-                                color_discrete_map=YEAR_COLOR_MAP)
-            max_y = title_year_pubs['Total Publications'].max() + 10 if not title_year_pubs.empty else 100
-            fig_titles.update_layout(
-                xaxis_tickangle=45,
-                height=500,
-                width=900,
-                xaxis_title="Unvan",
-                yaxis=dict(range=[0, max_y], title="Toplam Yayın")
-            )
-            st.plotly_chart(fig_titles, use_container_width=True, key="title_wise_pubs_bar")
-            
-            # Publication Change (2023-2024)
-            st.header("Yayın Değişimi (2023-2024)", anchor="yayin-degisim-2023-2024")
-            st.markdown("Birimlerin 2023-2024 arası yayın sayılarındaki değişim.")
-            tab1, tab2 = st.tabs(["Fakülteler", "Bölümler"])
-            with tab1:
-                faculty_year_pubs = filtered_df.groupby(['Faculty', 'Year'])['Total Publications'].sum().unstack().fillna(0)
-                faculty_year_pubs['Change'] = faculty_year_pubs['2024'] - faculty_year_pubs['2023']
-                faculty_year_pubs['Change Type'] = faculty_year_pubs['Change'].apply(lambda x: 'increase' if x >= 0 else 'decrease')
-                change_df_faculty = faculty_year_pubs.reset_index()[['Faculty', 'Change', 'Change Type']]
-                change_df_faculty['Faculty'] = change_df_faculty['Faculty'].map(lambda x: list(FACULTY_MAPPING.keys())[list(FACULTY_MAPPING.values()).index(x)] if x in FACULTY_MAPPING.values() else x)
-                fig6_faculty = px.bar(change_df_faculty, x='Faculty', y='Change', color='Change Type',
-                                      title="Fakülte Bazında Yayın Değişimi (2023-2024)",
-                                      color_discrete_map=CHANGE_COLOR_MAP)
-                fig6_faculty.update_layout(xaxis_tickangle=45, height=500, width=900)
-                st.plotly_chart(fig6_faculty, use_container_width=True, key="pub_change_faculty_bar")
-            with tab2:
-                dept_year_pubs = filtered_df.groupby(['Department', 'Year'])['Total Publications'].sum().unstack().fillna(0)
-                dept_year_pubs['Change'] = dept_year_pubs['2024'] - dept_year_pubs['2023']
-                dept_year_pubs['Change Type'] = dept_year_pubs['Change'].apply(lambda x: 'increase' if x >= 0 else 'decrease')
-                change_df_dept = dept_year_pubs.reset_index()[['Department', 'Change', 'Change Type']]
-                change_df_dept['Department'] = change_df_dept['Department'].map(lambda x: list(DEPARTMENT_MAPPING.keys())[list(DEPARTMENT_MAPPING.values()).index(x)] if x in DEPARTMENT_MAPPING.values() else x)
-                fig6_dept = px.bar(change_df_dept, x='Department', y='Change', color='Change Type',
-                                   title="Bölüm Bazında Yayın Değişimi (2023-2024)",
-                                   color_discrete_map=CHANGE_COLOR_MAP)
-                fig6_dept.update_layout(xaxis_tickangle=45, height=500, width=900)
-                st.plotly_chart(fig6_dept, use_container_width=True, key="pub_change_dept_bar")
-
-            # Top 5 Researchers by Total Publications
-            st.header("Toplam Yayın Sayısına Göre İlk 5 Araştırmacı", anchor="top-5-arastirmaci")
-            st.markdown("En aktif 5 araştırmacı.")
-            top_researchers = filtered_df.groupby(['Name', 'Faculty', 'Department'])['Total Publications'].sum().reset_index()
-            top_researchers['Faculty'] = top_researchers['Faculty'].map(lambda x: list(FACULTY_MAPPING.keys())[list(FACULTY_MAPPING.values()).index(x)] if x in FACULTY_MAPPING.values() else x)
-            top_researchers['Department'] = top_researchers['Department'].map(lambda x: list(DEPARTMENT_MAPPING.keys())[list(DEPARTMENT_MAPPING.values()).index(x)] if x in DEPARTMENT_MAPPING.values() else x)
-            top_5_researchers = top_researchers.nlargest(5, 'Total Publications')
-            fig7 = go.Figure(data=[
-                go.Table(
-                    header=dict(values=['İsim', 'Fakülte', 'Bölüm', 'Toplam Yayın'],
-                                fill_color='paleturquoise', align='left'),
-                    cells=dict(values=[top_5_researchers['Name'], top_5_researchers['Faculty'],
-                                      top_5_researchers['Department'], top_5_researchers['Total Publications']],
-                               fill_color='lavender', align='left'))
-            ])
-            st.plotly_chart(fig7, use_container_width=True, key="top_5_researchers_table")
-
-            # Impact Score
-            st.header("Etki Puanı", anchor="etki-puani")
-            st.markdown("2023 ve 2024 için birimlerin toplam etki puanı.")
-            tab1, tab2 = st.tabs(["Fakülteler", "Bölümler"])
-            with tab1:
-                faculty_year_impact = filtered_df.groupby(['Faculty', 'Year'])['Impact Score'].sum().reset_index()
-                faculty_year_impact['Faculty'] = faculty_year_impact['Faculty'].map(lambda x: list(FACULTY_MAPPING.keys())[list(FACULTY_MAPPING.values()).index(x)] if x in FACULTY_MAPPING.values() else x)
-                fig8_faculty = px.bar(faculty_year_impact, x='Faculty', y='Impact Score', color='Year', barmode='group',
-                                      title="Fakülte Bazında Etki Puanı",
-                                      color_discrete_map=YEAR_COLOR_MAP)
-                fig8_faculty.update_layout(xaxis_tickangle=45, height=500, width=900)
-                st.plotly_chart(fig8_faculty, use_container_width=True, key="impact_score_faculty_bar")
-            with tab2:
-                dept_year_impact = filtered_df.groupby(['Department', 'Year'])['Impact Score'].sum().reset_index()
-                dept_year_impact['Department'] = dept_year_impact['Department'].map(lambda x: list(DEPARTMENT_MAPPING.keys())[list(DEPARTMENT_MAPPING.values()).index(x)] if x in DEPARTMENT_MAPPING.values() else x)
-                fig8_dept = px.bar(dept_year_impact, x='Department', y='Impact Score', color='Year', barmode='group',
-                                   title="Bölüm Bazında Etki Puanı",
-                                   color_discrete_map=YEAR_COLOR_MAP)
-                fig8_dept.update_layout(xaxis_tickangle=45, height=500, width=900)
-                st.plotly_chart(fig8_dept, use_container_width=True, key="impact_score_dept_bar")
-            st.markdown("**Hesaplama:** Etki puanı, yayın türlerine göre ağırlıklı bir toplam olarak hesaplanır: Q1 makaleleri için 4 puan, Q2 için 3 puan, Q3 için 2 puan, Q4 için 1 puan, ESCI, Scopus ve çeyreklik olmayan makaleler için 0.5 puan. Formül: **Etki Puanı = (Q1 × 4) + (Q2 × 3) + (Q3 × 2) + (Q4 × 1) + [(ESCI + Scopus + Çeyreklik Olmayan) × 0.5]**. Örnek: Bir fakültede 5 Q1 (5×4=20), 3 Q2 (3×3=9), 2 ESCI (2×0.5=1) makale varsa, toplam etki puanı 20+9+1=30 olur.")
-
-            # Publication and Impact Score (Scatter Plot)
-            st.header("Yayın ve Etki Puanı", anchor="yayin-etki")
-            st.markdown("Birimlerin toplam yayın ve etki puanı ilişkisi.")
-            tab1, tab2 = st.tabs(["Fakülteler", "Bölümler"])
-            with tab1:
-                scatter_data_faculty = filtered_df.groupby(['Faculty', 'Year'])[['Total Publications', 'Impact Score']].sum().reset_index()
-                scatter_data_faculty['Faculty'] = scatter_data_faculty['Faculty'].map(lambda x: list(FACULTY_MAPPING.keys())[list(FACULTY_MAPPING.values()).index(x)] if x in FACULTY_MAPPING.values() else x)
-                fig8b_faculty = px.scatter(scatter_data_faculty, x='Total Publications', y='Impact Score', color='Faculty', symbol='Year',
-                                           title="Fakülte Bazında Yayın ve Etki Puanı", size='Total Publications')
-                fig8b_faculty.update_layout(height=600, width=900)
-                st.plotly_chart(fig8b_faculty, use_container_width=True, key="scatter_faculty_plot")
-            with tab2:
-                scatter_data_dept = filtered_df.groupby(['Department', "Year"])[['Total Publications', 'Impact Score']].sum().reset_index()
-                scatter_data_dept['Department'] = scatter_data_dept['Department'].map(lambda x: list(DEPARTMENT_MAPPING.keys())[list(DEPARTMENT_MAPPING.values()).index(x)] if x in DEPARTMENT_MAPPING.values() else x)
-                fig8b_dept = px.scatter(scatter_data_dept, x='Total Publications', y='Impact Score', color='Department', symbol='Year',
-                                        title="Bölüm Bazında Yayın ve Etki Puanı", size='Total Publications')
-                fig8b_dept.update_layout(height=600, width=900)
-                st.plotly_chart(fig8b_dept, use_container_width=True, key="scatter_dept_plot")
-            st.markdown("**Hesaplama:** Bu görselleştirme, birimlerin toplam yayın sayılarını (tüm yayın türlerinin toplamı) ve etki puanlarını (yukarıda açıklanan formülle hesaplanan) karşılaştırır. Her nokta bir fakülte veya bölümü temsil eder, nokta boyutu toplam yayın sayısını, sembol ise yılı (2023 veya 2024) gösterir.")
-
-            # Active Researcher Ratio
-            st.header("Aktif Araştırmacı Oranı", anchor="aktif-oran")
-            st.markdown("Birimlerde aktif araştırmacı oranı.")
-            tab1, tab2 = st.tabs(["Fakülteler", "Bölümler"])
-            with tab1:
-                total_researchers_faculty = filtered_df.groupby(['Faculty', 'Year'])['Name'].nunique().reset_index(name='Toplam Araştırmacılar')
-                active_researchers_faculty = filtered_df[filtered_df['Total Publications'] > 0].groupby(['Faculty', 'Year'])['Name'].nunique().reset_index(name='Aktif Araştırmacılar')
-                total_researchers_faculty['Faculty'] = total_researchers_faculty['Faculty'].map(lambda x: list(FACULTY_MAPPING.keys())[list(FACULTY_MAPPING.values()).index(x)] if x in FACULTY_MAPPING.values() else x)
-                active_researchers_faculty['Faculty'] = active_researchers_faculty['Faculty'].map(lambda x: list(FACULTY_MAPPING.keys())[list(FACULTY_MAPPING.values()).index(x)] if x in FACULTY_MAPPING.values() else x)
-                ratio_df_faculty = total_researchers_faculty.merge(active_researchers_faculty, on=['Faculty', 'Year'], how='left').fillna({'Aktif Araştırmacılar': 0})
-                ratio_df_faculty['Aktif Araştırmacı Oranı'] = ratio_df_faculty['Aktif Araştırmacılar'] / ratio_df_faculty['Toplam Araştırmacılar']
-                fig9_faculty = px.bar(ratio_df_faculty, x='Faculty', y='Aktif Araştırmacı Oranı', color='Year', barmode='group',
-                                      title="Fakülte Bazında Aktif Araştırmacı Oranı",
-                                      color_discrete_map=YEAR_COLOR_MAP)
-                fig9_faculty.update_layout(xaxis_tickangle=45, height=500, width=900)
-                st.plotly_chart(fig9_faculty, use_container_width=True, key="active_ratio_faculty_bar")
-            with tab2:
-                total_researchers_dept = filtered_df.groupby(['Department', 'Year'])['Name'].nunique().reset_index(name='Toplam Araştırmacılar')
-                active_researchers_dept = filtered_df[filtered_df['Total Publications'] > 0].groupby(['Department', 'Year'])['Name'].nunique().reset_index(name='Aktif Araştırmacılar')
-                total_researchers_dept['Department'] = total_researchers_dept['Department'].map(lambda x: list(DEPARTMENT_MAPPING.keys())[list(DEPARTMENT_MAPPING.values()).index(x)] if x in DEPARTMENT_MAPPING.values() else x)
-                active_researchers_dept['Department'] = active_researchers_dept['Department'].map(lambda x: list(DEPARTMENT_MAPPING.keys())[list(DEPARTMENT_MAPPING.values()).index(x)] if x in DEPARTMENT_MAPPING.values() else x)
-                ratio_df_dept = total_researchers_dept.merge(active_researchers_dept, on=['Department', 'Year'], how='left').fillna({'Aktif Araştırmacılar': 0})
-                ratio_df_dept['Aktif Araştırmacı Oranı'] = ratio_df_dept['Aktif Araştırmacılar'] / ratio_df_dept['Toplam Araştırmacılar']
-                fig9_dept = px.bar(ratio_df_dept, x='Department', y='Aktif Araştırmacı Oranı', color='Year', barmode='group',
-                                   title="Bölüm Bazında Aktif Araştırmacı Oranı",
-                                   color_discrete_map=YEAR_COLOR_MAP)
-                fig9_dept.update_layout(xaxis_tickangle=45, height=500, width=900)
-                st.plotly_chart(fig9_dept, use_container_width=True, key="active_ratio_dept_bar")
-
-            # Publications by Year
-            st.header("Yıl Bazında Yayınlar", anchor="yil-bazinda-yayinlar")
-            st.markdown("2023 ve 2024 için birimlerin yayın sayıları.")
-            tab1, tab2 = st.tabs(["Fakülteler", "Bölümler"])
-            with tab1:
-                faculty_year_pubs = filtered_df.groupby(['Faculty', 'Year'])['Total Publications'].sum().reset_index()
-                faculty_year_pubs['Faculty'] = faculty_year_pubs['Faculty'].map(lambda x: list(FACULTY_MAPPING.keys())[list(FACULTY_MAPPING.values()).index(x)] if x in FACULTY_MAPPING.values() else x)
-                fig10_faculty = px.bar(faculty_year_pubs, x='Faculty', y='Total Publications', color='Year', barmode='group',
-                                       title="Fakülte Bazında Yıl Bazında Yayınlar",
-                                       color_discrete_map=YEAR_COLOR_MAP)
-                fig10_faculty.update_layout(xaxis_tickangle=45, height=500, width=900)
-                st.plotly_chart(fig10_faculty, use_container_width=True, key="pubs_by_year_faculty_bar")
-            with tab2:
-                dept_year_pubs = filtered_df.groupby(['Department', 'Year'])['Total Publications'].sum().reset_index()
-                dept_year_pubs['Department'] = dept_year_pubs['Department'].map(lambda x: list(DEPARTMENT_MAPPING.keys())[list(DEPARTMENT_MAPPING.values()).index(x)] if x in DEPARTMENT_MAPPING.values() else x)
-                fig10_dept = px.bar(dept_year_pubs, x='Department', y='Total Publications', color='Year', barmode='group',
-                                    title="Bölüm Bazında Yıl Bazında Yayınlar",
-                                    color_discrete_map=YEAR_COLOR_MAP)
-                fig10_dept.update_layout(xaxis_tickangle=45, height=500, width=900)
-                st.plotly_chart(fig10_dept, use_container_width=True, key="pubs_by_year_dept_bar")
-
-            # Quartile Diversity Index
-            st.header("Çeyreklik Çeşitlilik İndeksi", anchor="cesitlilik-indeksi")
-            st.markdown("Birimlerin Q1-Q4 makale çeşitliliği.")
-            tab1, tab2 = st.tabs(["Fakülteler", "Bölümler"])
-            with tab1:
-                def shannon_diversity(row):
-                    counts = [row[col] for col in quartile_cols]
-                    total = sum(counts)
-                    if total == 0:
-                        return 0
-                    proportions = [c / total for c in counts if c > 0]
-                    return -sum(p * np.log(p) for p in proportions) if proportions else 0
-                faculty_quartile = filtered_df.groupby(['Faculty', 'Year'])[quartile_cols].sum().reset_index()
-                faculty_quartile['Diversity Index'] = faculty_quartile[quartile_cols].apply(shannon_diversity, axis=1)
-                faculty_quartile['Faculty'] = faculty_quartile['Faculty'].map(lambda x: list(FACULTY_MAPPING.keys())[list(FACULTY_MAPPING.values()).index(x)] if x in FACULTY_MAPPING.values() else x)
-                fig11_faculty = px.bar(faculty_quartile, x='Faculty', y='Diversity Index', color='Year', barmode='group',
-                                       title="Fakülte Bazında Çeyreklik Çeşitlilik İndeksi",
-                                       color_discrete_map=YEAR_COLOR_MAP)
-                fig11_faculty.update_layout(xaxis_tickangle=45, height=500, width=900)
-                st.plotly_chart(fig11_faculty, use_container_width=True, key="diversity_index_faculty_bar")
-            with tab2:
-                dept_quartile = filtered_df.groupby(['Department', 'Year'])[quartile_cols].sum().reset_index()
-                dept_quartile['Diversity Index'] = dept_quartile[quartile_cols].apply(shannon_diversity, axis=1)
-                dept_quartile['Department'] = dept_quartile['Department'].map(lambda x: list(DEPARTMENT_MAPPING.keys())[list(DEPARTMENT_MAPPING.values()).index(x)] if x in DEPARTMENT_MAPPING.values() else x)
-                fig11_dept = px.bar(dept_quartile, x='Department', y='Diversity Index', color='Year', barmode='group',
-                                    title="Bölüm Bazında Çeyreklik Çeşitlilik İndeksi",
-                                    color_discrete_map=YEAR_COLOR_MAP)
-                fig11_dept.update_layout(xaxis_tickangle=45, height=500, width=900)
-                st.plotly_chart(fig11_dept, use_container_width=True, key="diversity_index_dept_bar")
-            st.markdown("**Hesaplama:** Çeyreklik Çeşitlilik İndeksi, Shannon Entropi formülü kullanılarak hesaplanır. Q1, Q2, Q3 ve Q4 makalelerinin toplam yayın içindeki oranları dikkate alınır. Formül: **H = -Σ(p_i * ln(p_i))**; burada p_i, her çeyreklik türünün toplam yayınlara oranıdır. Örneğin, bir fakültede 10 Q1, 5 Q2, 5 Q3 ve 0 Q4 makale varsa, toplam 20 makale olur. Oranlar: Q1=0.5, Q2=0.25, Q3=0.25. H = -[(0.5 * ln(0.5)) + (0.25 * ln(0.25)) + (0.25 * ln(0.25))] ≈ 1.04. Daha yüksek indeks, daha dengeli bir çeyreklik dağılımını gösterir.")
-
-            # Top Publication Types
-            st.header("En Yaygın Yayın Türleri", anchor="en-yaygin-yayin")
-            st.markdown("Birimlerdeki en yaygın yayın türleri.")
-            tab1, tab2 = st.tabs(["Fakülteler", "Bölümler"])
-            with tab1:
-                pub_type_sums_faculty = filtered_df.groupby(['Faculty', 'Year'])[pub_types].sum().reset_index()
-                pub_type_sums_faculty['Faculty'] = pub_type_sums_faculty['Faculty'].map(lambda x: list(FACULTY_MAPPING.keys())[list(FACULTY_MAPPING.values()).index(x)] if x in FACULTY_MAPPING.values() else x)
-                pub_type_melted_faculty = pub_type_sums_faculty.melt(id_vars=['Faculty', 'Year'], value_vars=pub_types, var_name='Publication Type', value_name='Sayı')
-                pub_type_melted_faculty['Publication Type'] = pub_type_melted_faculty['Publication Type'].map(pub_type_labels)
-                top_pub_types_faculty = pub_type_melted_faculty.groupby('Publication Type')['Sayı'].sum().nlargest(5).index
-                
-                # 2023 Chart
-                faculty_2023 = pub_type_melted_faculty[(pub_type_melted_faculty['Publication Type'].isin(top_pub_types_faculty)) & (pub_type_melted_faculty['Year'] == '2023')]
-                fig12_faculty_2023 = px.bar(faculty_2023, x='Faculty', y='Sayı', color='Publication Type', barmode='stack',
-                                            title="Fakülte Bazında En Yaygın Yayın Türleri (2023)", color_discrete_map=COLOR_MAP)
-                fig12_faculty_2023.update_layout(xaxis_tickangle=45, height=600, width=900)
-                st.plotly_chart(fig12_faculty_2023, use_container_width=True, key="faculty_top_pub_types_2023")
-                
-                # 2024 Chart
-                faculty_2024 = pub_type_melted_faculty[(pub_type_melted_faculty['Publication Type'].isin(top_pub_types_faculty)) & (pub_type_melted_faculty['Year'] == '2024')]
-                fig12_faculty_2024 = px.bar(faculty_2024, x='Faculty', y='Sayı', color='Publication Type', barmode='stack',
-                                            title="Fakülte Bazında En Yaygın Yayın Türleri (2024)", color_discrete_map=COLOR_MAP)
-                fig12_faculty_2024.update_layout(xaxis_tickangle=45, height=600, width=900)
-                st.plotly_chart(fig12_faculty_2024, use_container_width=True, key="faculty_top_pub_types_2024")
-                
-            with tab2:
-                pub_type_sums_dept = filtered_df.groupby(['Department', 'Year'])[pub_types].sum().reset_index()
-                pub_type_sums_dept['Department'] = pub_type_sums_dept['Department'].map(lambda x: list(DEPARTMENT_MAPPING.keys())[list(DEPARTMENT_MAPPING.values()).index(x)] if x in DEPARTMENT_MAPPING.values() else x)
-                pub_type_melted_dept = pub_type_sums_dept.melt(id_vars=['Department', 'Year'], value_vars=pub_types, var_name='Publication Type', value_name='Sayı')
-                pub_type_melted_dept['Publication Type'] = pub_type_melted_dept['Publication Type'].map(pub_type_labels)
-                top_pub_types_dept = pub_type_melted_dept.groupby('Publication Type')['Sayı'].sum().nlargest(5).index
-                
-                # 2023 Chart
-                dept_2023 = pub_type_melted_dept[(pub_type_melted_dept['Publication Type'].isin(top_pub_types_dept)) & (pub_type_melted_dept['Year'] == '2023')]
-                fig12_dept_2023 = px.bar(dept_2023, x='Department', y='Sayı', color='Publication Type', barmode='stack',
-                                         title="Bölüm Bazında En Yaygın Yayın Türleri (2023)", color_discrete_map=COLOR_MAP)
-                fig12_dept_2023.update_layout(xaxis_tickangle=45, height=600, width=900)
-                st.plotly_chart(fig12_dept_2023, use_container_width=True, key="dept_top_pub_types_2023")
-                
-                # 2024 Chart
-                dept_2024 = pub_type_melted_dept[(pub_type_melted_dept['Publication Type'].isin(top_pub_types_dept)) & (pub_type_melted_dept['Year'] == '2024')]
-                fig12_dept_2024 = px.bar(dept_2024, x='Department', y='Sayı', color='Publication Type', barmode='stack',
-                                         title="Bölüm Bazında En Yaygın Yayın Türleri (2024)", color_discrete_map=COLOR_MAP)
-                fig12_dept_2024.update_layout(xaxis_tickangle=45, height=600, width=900)
-                st.plotly_chart(fig12_dept_2024, use_container_width=True, key="dept_top_pub_types_2024")
+            # Section inputs for the unfiltered data; the trend panels and headline metrics share its roll-ups
+            section_context = dict(df=dataset.df, cube=dataset.cube, label_indexes=dataset.label_indexes, dataset_key=dataset.key,
+                                   years=years, years_text=years_text,
+                                   comparison_pairs=comparison_pairs, compared_years=compared_years,
+                                   compared_years_text=describe_years(compared_years), year_color_map=year_color_map,
+                                   filter_indexes=dataset.filter_indexes)
+            # One payload count for both fragments, so the budget covers the whole page
+            with payload_scope():
+                render_summary(dataset, SectionData(section_context, filters=dict.fromkeys(FILTER_KEYS, [])))
+                render_report(dataset, section_context)
+            report_shown = True
+
+        # Queued once this run has drawn its own panels: pool threads share the GIL with the script
+        # thread, so they warm the closed tabs, expanders and pages while the page is being read
+        schedule_precompute(section_context)
+        with st.sidebar:
+            # Refreshes on its own only while this run found panels still being built
+            pending = any(not future.done() for future in st.session_state['precompute']['futures'])
+            st.fragment(render_precompute_progress, run_every=PRECOMPUTE_POLL_SECONDS if pending else None)()
 
 else:
+    st.session_state.pop('dataset_lease', None)
+    st.session_state.pop('precompute', None)
     with st.container():
-        st.warning("Lütfen 2023 ve 2024 Excel dosyalarını yükleyin.")
+        st.warning("Lütfen her yıl için Excel dosyalarını yükleyin.")
+
+# Figure cache counters
+with st.sidebar.expander("Grafik Önbelleği"):
+    cache = figure_cache()
+    lookups = cache['hits'] + cache['misses']
+    st.markdown(f"İsabet: {cache['hits']}  \nKaçırma: {cache['misses']}  \n"
+                f"İsabet Oranı: {cache['hits'] / lookups if lookups else 0:.0%}  \n"
+                f"Kayıt: {len(cache['entries'])}/{FIGURE_CACHE_MAX_ENTRIES}  \n"
+                f"Bellek: {cache['bytes'] / 2**20:.1f}/{FIGURE_CACHE_MAX_BYTES / 2**20:.0f} MB")
+
+# Shared dataset registry counters
+with st.sidebar.expander("Veri Kümesi Önbelleği"):
+    registry_stats = dataset_registry().stats()
+    st.markdown(f"Veri Kümesi: {registry_stats['datasets']}  \nAktif Oturum: {registry_stats['leases']}  \n"
+                f"Bellek: {registry_stats['bytes'] / 2**20:.1f}/{registry_stats['max_bytes'] / 2**20:.0f} MB")
+
+# Without a dataset there is no report fragment to draw the profile
+if profiling and not report_shown:
+    render_profile()
 
 # Application footer
 st.markdown("---")
@@ -0,0 +1,649 @@
+# Report sections of the publication dashboard: data preparation and figure builders.
+# Builders never call Streamlit, so the same sections render in the app and in batch reports.
+import threading
+import time
+from functools import partial
+
+import numpy as np
+import pandas as pd
+import plotly.express as px
+import plotly.graph_objects as go
+
+from metrics import DIVERSITY_METRICS, QUARTILE_COLUMNS, proportions
+from processing import (DEPARTMENT_MAPPING, DEPARTMENT_ORDER, FACULTY_MAPPING, FACULTY_ORDER, build_filter_index,
+                        filter_rows, impact_score, pub_type_labels, pub_types, resolve_unit_labels, rollup_cube, title_order,
+                        top_n)
+
+# Color mapping
+COLOR_MAP = {
+    'ESCI Makaleleri': '#1F77B4',
+    'Scopus Makaleleri': '#FF7F0E',
+    'Q1 Makaleleri': '#2CA02C',
+    'Q2 Makaleleri': '#D62728',
+    'Q3 Makaleleri': '#9467BD',
+    'Q4 Makaleleri': '#8C564B',
+    'Çeyreklik Olmayan Makaleler': '#7F7F7F'
+}
+YEAR_COLORS = ['#1F77B4', '#4A90E2', '#08306B', '#6BAED6', '#2171B5', '#9ECAE1', '#084594', '#4292C6', '#C6DBEF', '#3182BD']
+CHANGE_COLOR_MAP = {
+    'increase': '#2CA02C',
+    'decrease': '#D62728'
+}
+
+# Year comparison helpers
+def build_year_color_map(years):
+    return {year: YEAR_COLORS[i % len(YEAR_COLORS)] for i, year in enumerate(years)}
+
+def build_comparison_pairs(years, mode, base_year, target_year):
+    if mode == "Ardışık Yıllar":
+        return list(zip(years[:-1], years[1:]))
+    return [(base_year, target_year)] if base_year != target_year else []
+
+def describe_years(years):
+    return ' ve '.join(years) if len(years) <= 2 else f"{years[0]}-{years[-1]}"
+
+# Change between each (base, target) year pair of a frame whose columns are years
+def year_changes(year_pivot, pairs):
+    frames = []
+    for base_year, target_year in pairs:
+        pair_values = year_pivot.reindex(columns=[base_year, target_year], fill_value=0)
+        frames.append(pd.DataFrame({
+            'Change': pair_values[target_year] - pair_values[base_year],
+            'Dönem': f"{base_year}-{target_year}",
+        }))
+    changes = pd.concat(frames)
+    changes['Change Type'] = np.where(changes['Change'] >= 0, 'increase', 'decrease')
+    return changes
+
+# Filter selections as produced by the filter panel; empty lists mean "no filter"
+FILTER_KEYS = ['faculty_include', 'department_include', 'title_include',
+               'faculty_exclude', 'department_exclude', 'title_exclude']
+
+# Unfiltered frames are returned as is; builders never modify their inputs
+def apply_filters(frame, filter_index, filters, label_indexes):
+    rows = filter_rows(filter_index, filters, label_indexes)
+    return frame if rows is None else frame.take(rows)
+
+# Publications, impact score, name, department and title of each researcher per year of the filtered rows
+def researcher_years(data):
+    frame = data['filtered_df']
+    # Counts are stored as small unsigned ints, so the weighted sum is taken in int64
+    frame = frame.assign(**{'Impact Score': impact_score(frame[pub_types].astype(np.int64))})
+    per_year = frame.groupby(['Researcher ID', 'Year'], observed=True).agg(
+        Name=('Name', 'first'), Department=('Department', 'first'), Title=('Title', 'first'),
+        Publications=('Total Publications', 'sum'), **{'Impact Score': ('Impact Score', 'sum')})
+    per_year = per_year.reset_index()
+    per_year['Department'] = resolve_unit_labels(per_year['Department'], data['label_indexes']['Department']).astype(object)
+    per_year['Name'] = per_year['Name'].astype(object)
+    per_year['Publications'] = per_year['Publications'].astype(np.int64)
+    return per_year
+
+# Total publications per observed (name, faculty, department) of the filtered rows, in one hash pass.
+# 'Key' orders the groups like a sorted groupby; rows with an unknown unit are left out as groupby drops them.
+def researcher_totals(data):
+    frame = data['filtered_df']
+    codes = [frame[column].cat.codes.to_numpy().astype(np.int64) for column in ('Name', 'Faculty', 'Department')]
+    rows = np.flatnonzero((codes[1] >= 0) & (codes[2] >= 0))
+    keys = ((codes[0][rows] * (len(frame['Faculty'].cat.categories) + 1) + codes[1][rows])
+            * (len(frame['Department'].cat.categories) + 1) + codes[2][rows])
+    groups, group_keys = pd.factorize(keys)
+    first_rows = np.empty(len(group_keys), dtype=np.int64)
+    first_rows[groups[::-1]] = rows[::-1]
+    totals = frame.iloc[first_rows][['Name', 'Faculty', 'Department']].reset_index(drop=True)
+    totals['Total Publications'] = np.bincount(groups, weights=frame['Total Publications'].to_numpy()[rows],
+                                               minlength=len(group_keys)).astype(np.int64)
+    totals['Key'] = group_keys
+    return totals
+
+# Labels of the n groups with the largest summed measure, ties going to the first group in sorted order
+def top_groups(frame, by, measure, n=5):
+    sums = frame.groupby(by, observed=True)[measure].sum()
+    return sums.index[top_n(sums.to_numpy(), n)]
+
+def unit_rollup(data, unit):
+    rollup = rollup_cube(data['filtered_cube'], [unit, 'Year'])
+    rollup[unit] = resolve_unit_labels(rollup[unit], data['label_indexes'][unit])
+    return rollup
+
+# Section inputs derived from the cube; each is computed on first use only
+SECTION_DATA_FACTORIES = {
+    'filter_indexes': lambda data: {'df': build_filter_index(data['df']), 'cube': build_filter_index(data['cube'])},
+    'filtered_cube': lambda data: apply_filters(data['cube'], data['filter_indexes']['cube'], data['filters'], data['label_indexes']),
+    'filtered_df': lambda data: apply_filters(data['df'], data['filter_indexes']['df'], data['filters'], data['label_indexes']),
+    'year_rollup': lambda data: rollup_cube(data['filtered_cube'], ['Year']),
+    'researcher_years': researcher_years,
+    'researcher_totals': researcher_totals,
+    'faculty_rollup': lambda data: unit_rollup(data, 'Faculty'),
+    'dept_rollup': lambda data: unit_rollup(data, 'Department'),
+}
+
+# Lazy mapping of section inputs, so sections that are not rendered never run their groupbys.
+# Safe to share between threads: each input is computed once, by the first thread that needs it.
+class SectionData(dict):
+    # Wall-clock seconds spent in factories; nested factories are counted once
+    compute_seconds = 0.0
+    factory_depth = 0
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.lock = threading.RLock()
+
+    def __missing__(self, key):
+        if key not in SECTION_DATA_FACTORIES:
+            raise KeyError(key)
+        with self.lock:
+            if dict.__contains__(self, key):
+                return dict.__getitem__(self, key)
+            started = time.perf_counter()
+            self.factory_depth += 1
+            try:
+                value = self[key] = SECTION_DATA_FACTORIES[key](self)
+            finally:
+                self.factory_depth -= 1
+            if self.factory_depth == 0:
+                self.compute_seconds += time.perf_counter() - started
+        return value
+
+# Per-unit naming used by the Fakülteler/Bölümler panels
+UNIT_VIEWS = {
+    'Faculty': {'rollup': 'faculty_rollup', 'label': 'Fakülte', 'slug': 'faculty', 'plural': 'faculties',
+                'mapping': FACULTY_MAPPING, 'order': FACULTY_ORDER},
+    'Department': {'rollup': 'dept_rollup', 'label': 'Bölüm', 'slug': 'dept', 'plural': 'depts',
+                   'mapping': DEPARTMENT_MAPPING, 'order': DEPARTMENT_ORDER},
+}
+QUARTILE_LABELS = {
+    'Q1 Articles': 'Q1 Makaleleri',
+    'Q2 Articles': 'Q2 Makaleleri',
+    'Q3 Articles': 'Q3 Makaleleri',
+    'Q4 Articles': 'Q4 Makaleleri'
+}
+# Display grouping of academic titles for the title section
+TITLE_GROUPS = {
+    "Prof. Dr.": "Prof. Dr.",
+    "Doç. Dr.": "Doç. Dr.",
+    "Dr. Öğr. Üyesi": "Dr. Öğr. Üyesi",
+    "Araştırma Görevlisi": "Diğer Ünvanlar",
+    "Öğretim Görevlisi": "Diğer Ünvanlar",
+    "Araştırmacı": "Diğer Ünvanlar",
+    "İdari Personel": "Diğer Ünvanlar",
+    "Diğer": "Diğer Ünvanlar",
+    "Arş. Gör.": "Diğer Ünvanlar",
+    "Öğr. Gör.": "Diğer Ünvanlar"
+}
+TITLE_GROUP_ORDER = ["Dr. Öğr. Üyesi", "Doç. Dr.", "Prof. Dr.", "Diğer Ünvanlar"]
+NEED_TWO_YEARS = "Değişim için en az iki yıl gereklidir."
+QUARTILE_VIEWS = ["Birleşik Grafik", "Birim Bazında Pasta Grafikleri"]
+# Units per page of the combined quartile figure; keeps its size independent of the unit count
+QUARTILE_PAGE_SIZE = 25
+RESEARCHER_STATES = ["Devam Eden Aktif", "Yeni Aktif", "Aktifliği Sona Eren", "Bölüm Değiştiren"]
+RESEARCHER_STATE_COLORS = dict(zip(RESEARCHER_STATES, ['#1F77B4', '#2CA02C', '#D62728', '#FF7F0E']))
+# Largest increases and decreases shown in the per-researcher change chart
+RESEARCHER_CHANGE_COUNT = 10
+# Researcher-level charts send at most this many points per year; larger selections are binned here
+RESEARCHER_POINT_LIMIT = 5000
+# Grid cells per axis of the binned researcher scatter
+RESEARCHER_SCATTER_BINS = 80
+# Highest-impact researchers per year kept as named points in the binned scatter and per box as outliers
+RESEARCHER_OUTLIER_COUNT = 50
+RESEARCHER_MEASURES = {'Publications': "Toplam Yayın", 'Impact Score': "Etki Puanı"}
+
+# Section builders. Each takes the SectionData of the current run and returns the items to render:
+# ('chart', figure, key), ('table', frame), ('markdown', text), ('info', text) or
+# ('pages', key, page_count, build_page) where build_page(page) returns the items of one page.
+def build_trend_changes(data):
+    pub_trend = data['year_rollup'][['Year'] + pub_types]
+    items = [] if data['comparison_pairs'] else [('info', NEED_TWO_YEARS)]
+    for pair_base, pair_target in data['comparison_pairs']:
+        change_data = year_changes(pub_trend.set_index('Year')[pub_types].T, [(pair_base, pair_target)])
+        change_data = change_data.reset_index().rename(columns={'index': 'Publication Type'})
+        change_data['Publication Type'] = change_data['Publication Type'].map(pub_type_labels)
+        fig_trend = px.bar(change_data, x='Change', y='Publication Type', orientation='h',
+                           color='Change Type', title=f"Yayın Türü Değişimleri ({pair_base}-{pair_target})",
+                           color_discrete_map=CHANGE_COLOR_MAP)
+        fig_trend.update_layout(
+            xaxis_title=f"Değişim ({pair_target} - {pair_base})",
+            yaxis_title="Yayın Türü",
+            height=500,
+            width=900,
+            xaxis=dict(zeroline=True, zerolinecolor='black', zerolinewidth=2)
+        )
+        items.append(('chart', fig_trend, f"pub_trend_change_bar_{pair_base}_{pair_target}"))
+    return items
+
+def build_trend_distribution(data):
+    pub_dist = data['year_rollup'][pub_types].sum().reset_index()
+    pub_dist.columns = ['Publication Type', 'Sayı']
+    pub_dist['Publication Type'] = pub_dist['Publication Type'].map(pub_type_labels)
+    fig_dist = px.pie(pub_dist, names='Publication Type', values='Sayı',
+                      title="Tüm Yayın Türlerinin Dağılımı", color_discrete_map=COLOR_MAP)
+    fig_dist.update_layout(height=500, width=900)
+    return [('chart', fig_dist, "pub_dist_pie_summary")]
+
+def build_trend_top_faculties(data):
+    faculty_pubs = data['faculty_rollup'][['Faculty', 'Year', 'Total Publications']]
+    top_faculties = top_groups(faculty_pubs, 'Faculty', 'Total Publications')
+    top_faculty_data = faculty_pubs[faculty_pubs['Faculty'].isin(top_faculties)]
+    fig_faculty = px.bar(top_faculty_data, x='Faculty', y='Total Publications', color='Year', barmode='group',
+                         title="En Aktif 5 Fakülte (Yayın Sayısı)", color_discrete_map=data['year_color_map'])
+    fig_faculty.update_layout(xaxis_tickangle=45, height=500, width=900)
+    return [('chart', fig_faculty, "top_faculties_bar_summary")]
+
+def build_year_wise(data):
+    pub_data = data['year_rollup'][['Year'] + pub_types]
+    pub_data_melted = pub_data.melt(id_vars='Year', value_vars=pub_types, var_name='Publication Type', value_name='Sayı')
+    pub_data_melted['Publication Type'] = pub_data_melted['Publication Type'].map(pub_type_labels)
+    fig1 = px.bar(pub_data_melted, x='Year', y='Sayı', color='Publication Type', barmode='group',
+                  title="Yıl Bazında Yayın Türü Dağılımı", color_discrete_map=COLOR_MAP)
+    fig1.update_layout(height=600, width=900)
+    return [('chart', fig1, "year_wise_pub_type")]
+
+def build_year_comparison(data):
+    year_rollup = data['year_rollup']
+    pub_compare = year_rollup.loc[year_rollup['Year'].isin(data['compared_years']), ['Year'] + pub_types]
+    pub_compare_melted = pub_compare.melt(id_vars='Year', value_vars=pub_types, var_name='Publication Type', value_name='Sayı')
+    pub_compare_melted['Publication Type'] = pub_compare_melted['Publication Type'].map(pub_type_labels)
+    fig1b = px.bar(pub_compare_melted, x='Publication Type', y='Sayı', color='Year', barmode='group',
+                   title=f"{data['compared_years_text']} Yılları Yayın Türü Karşılaştırması",
+                   color_discrete_map=data['year_color_map'])
+    fig1b.update_layout(xaxis_tickangle=45, height=600, width=900)
+    return [('chart', fig1b, "year_comparison_bar")]
+
+def build_quartile_pies(data, unit):
+    view = UNIT_VIEWS[unit]
+    pub_quartile_data = data[view['rollup']][[unit, 'Year'] + QUARTILE_COLUMNS]
+    pub_quartile_melted = pub_quartile_data.melt(id_vars=[unit, 'Year'], value_vars=QUARTILE_COLUMNS, var_name='Çeyreklik', value_name='Sayı')
+    pub_quartile_melted['Çeyreklik'] = pub_quartile_melted['Çeyreklik'].map(QUARTILE_LABELS)
+    items = []
+    for year in data['years']:
+        for name in pub_quartile_data[unit].unique():
+            unit_data = pub_quartile_melted[(pub_quartile_melted[unit] == name) & (pub_quartile_melted['Year'] == year)]
+            if unit_data['Sayı'].sum() > 0:
+                fig = px.pie(unit_data, names='Çeyreklik', values='Sayı', title=f"{year} - {name} için Yayın Çeyreklik Dağılımı", color_discrete_map=COLOR_MAP)
+                fig.update_layout(height=500, width=800)
+                items.append(('chart', fig, f"pie_{view['slug']}_{name}_{year}"))
+    return items
+
+# All units in one normalized stacked bar per page, faceted by year and built from the roll-up itself
+def build_quartile_shares(data, unit):
+    view = UNIT_VIEWS[unit]
+    counts = data[view['rollup']].loc[:, [unit, 'Year'] + QUARTILE_COLUMNS]
+    counts = counts[counts[QUARTILE_COLUMNS].sum(axis=1) > 0]
+    units = counts[unit].unique()
+    page_count = max(1, -(-len(units) // QUARTILE_PAGE_SIZE))
+
+    def build_page(page):
+        page_counts = counts[counts[unit].isin(units[(page - 1) * QUARTILE_PAGE_SIZE:page * QUARTILE_PAGE_SIZE])]
+        shares = pd.DataFrame(proportions(page_counts[QUARTILE_COLUMNS]), columns=QUARTILE_COLUMNS, index=page_counts.index)
+        shares_melted = page_counts[[unit, 'Year']].join(shares).melt(id_vars=[unit, 'Year'], var_name='Çeyreklik', value_name='Oran')
+        shares_melted['Sayı'] = page_counts[QUARTILE_COLUMNS].melt()['value'].to_numpy()
+        shares_melted['Çeyreklik'] = shares_melted['Çeyreklik'].map(QUARTILE_LABELS)
+        fig = px.bar(shares_melted, x=unit, y='Oran', color='Çeyreklik', facet_row='Year', barmode='stack',
+                     hover_data=['Sayı'], category_orders={'Year': data['years']}, color_discrete_map=COLOR_MAP,
+                     title=f"{view['label']} Bazında Yayın Çeyreklik Dağılımı")
+        fig.for_each_annotation(lambda annotation: annotation.update(text=annotation.text.split('=')[-1]))
+        fig.update_yaxes(tickformat='.0%', range=[0, 1], title_text='')
+        fig.update_layout(xaxis_tickangle=45, xaxis_title=view['label'], height=250 * len(data['years']) + 250, width=900)
+        return [('chart', fig, f"quartile_shares_{view['slug']}_{page}")]
+    return [('pages', f"quartile_page_{view['slug']}", page_count, build_page)]
+
+def build_quartile_distribution(data, unit):
+    if data['quartile_view'] == QUARTILE_VIEWS[1]:
+        return build_quartile_pies(data, unit)
+    return build_quartile_shares(data, unit)
+
+def build_type_heatmaps(data, unit):
+    view = UNIT_VIEWS[unit]
+    heatmap_data = data[view['rollup']][[unit, 'Year'] + pub_types]
+    items = []
+    for year in data['years']:
+        heatmap_year = heatmap_data[heatmap_data['Year'] == year].set_index(unit)[pub_types]
+        heatmap_year = heatmap_year.loc[heatmap_year.sum(axis=1) > 0, :]
+        heatmap_year = heatmap_year.reindex(index=[view['mapping'][u] for u in view['order'] if view['mapping'][u] in heatmap_year.index])
+        heatmap_year.columns = [pub_type_labels[col] for col in heatmap_year.columns]
+        fig2 = px.imshow(heatmap_year, title=f"{year} - {view['label']} ve Yayın Türü Dağılımı",
+                         labels=dict(x="Yayın Türü", y=view['label'], color="Sayı"), color_continuous_scale="Blues")
+        fig2.update_layout(height=800, width=900, xaxis={'tickangle': 45})
+        items.append(('chart', fig2, f"heatmap_{view['slug']}_{year}"))
+    return items
+
+def build_top_units(data, unit):
+    view = UNIT_VIEWS[unit]
+    year_totals = data[view['rollup']][[unit, 'Year', 'Total Publications']]
+    top_5_units = top_groups(year_totals, unit, 'Total Publications')
+    top_unit_data = year_totals[year_totals[unit].isin(top_5_units)]
+    fig3 = px.bar(top_unit_data, x=unit, y='Total Publications', color='Year', barmode='group',
+                  title=f"Toplam Yayın Sayısına Göre İlk 5 {view['label']}",
+                  color_discrete_map=data['year_color_map'])
+    fig3.update_layout(xaxis_tickangle=45, height=500, width=900)
+    return [('chart', fig3, f"top_5_{view['plural']}_bar")]
+
+def build_title_distribution(data):
+    filtered_cube = data['filtered_cube']
+    title_cube = filtered_cube.assign(Title=filtered_cube['Title'].astype(object).map(TITLE_GROUPS).fillna("Diğer Ünvanlar"))
+    title_year_pubs = rollup_cube(title_cube, ['Title', 'Year'], ['Total Publications'])
+    title_year_pubs['Title'] = pd.Categorical(title_year_pubs['Title'], categories=TITLE_GROUP_ORDER, ordered=True)
+    fig_titles = px.bar(title_year_pubs, x='Title', y='Total Publications', color='Year', barmode='group',
+                        title="Unvan Bazında Yayın Dağılımı",
+                        color_discrete_map=data['year_color_map'])
+    max_y = title_year_pubs['Total Publications'].max() + 10 if not title_year_pubs.empty else 100
+    fig_titles.update_layout(
+        xaxis_tickangle=45,
+        height=500,
+        width=900,
+        xaxis_title="Unvan",
+        yaxis=dict(range=[0, max_y], title="Toplam Yayın")
+    )
+    return [
+        ('markdown', "**Unvan Bazında Yayın Sayıları**"),
+        ('table', title_year_pubs.pivot(index='Title', columns='Year', values='Total Publications').fillna(0)),
+        ('chart', fig_titles, "title_wise_pubs_bar"),
+    ]
+
+def build_unit_changes(data, unit):
+    view = UNIT_VIEWS[unit]
+    items = [] if data['comparison_pairs'] else [('info', NEED_TWO_YEARS)]
+    year_pubs = data[view['rollup']].pivot(index=unit, columns='Year', values='Total Publications').fillna(0)
+    for pair_base, pair_target in data['comparison_pairs']:
+        change_df = year_changes(year_pubs, [(pair_base, pair_target)]).reset_index()[[unit, 'Change', 'Change Type']]
+        fig6 = px.bar(change_df, x=unit, y='Change', color='Change Type',
+                      title=f"{view['label']} Bazında Yayın Değişimi ({pair_base}-{pair_target})",
+                      color_discrete_map=CHANGE_COLOR_MAP)
+        fig6.update_layout(xaxis_tickangle=45, height=500, width=900)
+        items.append(('chart', fig6, f"pub_change_{view['slug']}_bar_{pair_base}_{pair_target}"))
+    return items
+
+def build_top_researchers(data):
+    totals = data['researcher_totals']
+    top_5_researchers = totals.iloc[top_n(totals['Total Publications'].to_numpy(), 5, order=totals['Key'].to_numpy())]
+    top_5_researchers = top_5_researchers.assign(
+        Name=top_5_researchers['Name'].astype(object),
+        Faculty=resolve_unit_labels(top_5_researchers['Faculty'], data['label_indexes']['Faculty']),
+        Department=resolve_unit_labels(top_5_researchers['Department'], data['label_indexes']['Department']))
+    fig7 = go.Figure(data=[
+        go.Table(
+            header=dict(values=['İsim', 'Fakülte', 'Bölüm', 'Toplam Yayın'],
+                        fill_color='paleturquoise', align='left'),
+            cells=dict(values=[top_5_researchers['Name'], top_5_researchers['Faculty'],
+                              top_5_researchers['Department'], top_5_researchers['Total Publications']],
+                       fill_color='lavender', align='left'))
+    ])
+    return [('chart', fig7, "top_5_researchers_table")]
+
+# Researchers of a (base, target) pair joined on their id; absent years count as zero publications
+def researcher_pair(data, pair_base, pair_target):
+    per_year = data['researcher_years']
+    base = per_year[per_year['Year'] == pair_base].set_index('Researcher ID')
+    target = per_year[per_year['Year'] == pair_target].set_index('Researcher ID')
+    pair = base[['Name', 'Department', 'Publications']].join(
+        target[['Name', 'Department', 'Publications']], how='outer', lsuffix=' Base', rsuffix=' Target')
+    pair['Name'] = pair['Name Target'].fillna(pair['Name Base'])
+    pair['Present Base'] = pair['Publications Base'].notna()
+    pair['Present Target'] = pair['Publications Target'].notna()
+    pair[['Publications Base', 'Publications Target']] = pair[['Publications Base', 'Publications Target']].fillna(0).astype(np.int64)
+    pair['Change'] = pair['Publications Target'] - pair['Publications Base']
+    # A missing department (NaN) in either year says nothing about a move
+    known = pair['Department Base'].notna() & pair['Department Target'].notna()
+    pair['Moved'] = pair['Present Base'] & pair['Present Target'] & known & pair['Department Base'].ne(pair['Department Target'])
+    return pair
+
+def build_researcher_summary(data):
+    items = [] if data['comparison_pairs'] else [('info', NEED_TWO_YEARS)]
+    for pair_base, pair_target in data['comparison_pairs']:
+        pair = researcher_pair(data, pair_base, pair_target)
+        active_base, active_target = pair['Publications Base'] > 0, pair['Publications Target'] > 0
+        summary = pd.DataFrame({
+            'Durum': RESEARCHER_STATES,
+            'Araştırmacı Sayısı': [(active_base & active_target).sum(), (~active_base & active_target).sum(),
+                                   (active_base & ~active_target).sum(), pair['Moved'].sum()],
+        })
+        fig = px.bar(summary, x='Durum', y='Araştırmacı Sayısı', color='Durum', color_discrete_map=RESEARCHER_STATE_COLORS,
+                     title=f"Araştırmacı Değişimleri ({pair_base}-{pair_target})")
+        fig.update_layout(height=500, width=900, showlegend=False)
+        items.append(('chart', fig, f"researcher_states_bar_{pair_base}_{pair_target}"))
+    return items
+
+def build_researcher_movers(data):
+    items = [] if data['comparison_pairs'] else [('info', NEED_TWO_YEARS)]
+    for pair_base, pair_target in data['comparison_pairs']:
+        pair = researcher_pair(data, pair_base, pair_target)
+        movers = pair[pair['Moved']].sort_values('Name')
+        items.append(('markdown', f"**{pair_base}-{pair_target} Döneminde Bölüm Değiştiren Araştırmacılar ({len(movers)})**"))
+        items.append(('table', pd.DataFrame({
+            'Ad Soyad': movers['Name'],
+            f"{pair_base} Bölümü": movers['Department Base'],
+            f"{pair_target} Bölümü": movers['Department Target'],
+            f"{pair_base} Yayın": movers['Publications Base'],
+            f"{pair_target} Yayın": movers['Publications Target'],
+        }).reset_index(drop=True)))
+    return items
+
+def build_researcher_changes(data):
+    items = [] if data['comparison_pairs'] else [('info', NEED_TWO_YEARS)]
+    for pair_base, pair_target in data['comparison_pairs']:
+        pair = researcher_pair(data, pair_base, pair_target)
+        changed = pair[pair['Change'] != 0]
+        extremes = pd.concat([changed.nlargest(RESEARCHER_CHANGE_COUNT, 'Change'), changed.nsmallest(RESEARCHER_CHANGE_COUNT, 'Change')])
+        extremes = extremes[~extremes.index.duplicated()].sort_values('Change')
+        change_df = pd.DataFrame({
+            'Araştırmacı': extremes['Name'] + ' (' + extremes['Department Target'].fillna(extremes['Department Base']).astype(str) + ')',
+            'Change': extremes['Change'],
+            'Change Type': np.where(extremes['Change'] >= 0, 'increase', 'decrease'),
+        })
+        fig = px.bar(change_df, x='Change', y='Araştırmacı', orientation='h', color='Change Type',
+                     title=f"En Büyük Kişi Bazında Yayın Değişimleri ({pair_base}-{pair_target})",
+                     color_discrete_map=CHANGE_COLOR_MAP)
+        fig.update_layout(xaxis_title=f"Değişim ({pair_target} - {pair_base})", yaxis_title="", height=700, width=900)
+        items.append(('chart', fig, f"researcher_change_bar_{pair_base}_{pair_target}"))
+    return items
+
+def build_impact_scores(data, unit):
+    view = UNIT_VIEWS[unit]
+    year_impact = data[view['rollup']][[unit, 'Year', 'Impact Score']]
+    fig8 = px.bar(year_impact, x=unit, y='Impact Score', color='Year', barmode='group',
+                  title=f"{view['label']} Bazında Etki Puanı",
+                  color_discrete_map=data['year_color_map'])
+    fig8.update_layout(xaxis_tickangle=45, height=500, width=900)
+    return [('chart', fig8, f"impact_score_{view['slug']}_bar")]
+
+def build_impact_scatter(data, unit):
+    view = UNIT_VIEWS[unit]
+    scatter_data = data[view['rollup']][[unit, 'Year', 'Total Publications', 'Impact Score']]
+    fig8b = px.scatter(scatter_data, x='Total Publications', y='Impact Score', color=unit, symbol='Year',
+                       title=f"{view['label']} Bazında Yayın ve Etki Puanı", size='Total Publications')
+    fig8b.update_layout(height=600, width=900)
+    return [('chart', fig8b, f"scatter_{view['slug']}_plot")]
+
+# Occupied cells of a 2D histogram: cell centres and researcher counts
+def bin_points(x, y, x_edges, y_edges):
+    counts, _, _ = np.histogram2d(x, y, bins=[x_edges, y_edges])
+    x_cells, y_cells = np.nonzero(counts)
+    return ((x_edges[x_cells] + x_edges[x_cells + 1]) / 2, (y_edges[y_cells] + y_edges[y_cells + 1]) / 2,
+            counts[x_cells, y_cells].astype(np.int64))
+
+# One WebGL point per researcher and year. Above RESEARCHER_POINT_LIMIT points a year is drawn as the
+# occupied cells of a grid, sized by researcher count, plus its highest-impact researchers by name.
+def build_researcher_scatter(data):
+    per_year = data['researcher_years']
+    years = [year for year in data['years'] if (per_year['Year'] == year).any()]
+    binned = per_year['Year'].value_counts().max() > RESEARCHER_POINT_LIMIT if len(per_year) else False
+    x_edges = np.linspace(per_year['Publications'].min(), per_year['Publications'].max() + 1, RESEARCHER_SCATTER_BINS + 1) if binned else None
+    y_edges = np.linspace(per_year['Impact Score'].min(), per_year['Impact Score'].max() + 1, RESEARCHER_SCATTER_BINS + 1) if binned else None
+    fig = go.Figure()
+    for year in years:
+        year_data = per_year[per_year['Year'] == year]
+        color = data['year_color_map'][year]
+        if binned:
+            x, y, counts = bin_points(year_data['Publications'].to_numpy(), year_data['Impact Score'].to_numpy(), x_edges, y_edges)
+            fig.add_trace(go.Scattergl(x=x, y=y, mode='markers', name=year, customdata=counts,
+                                       marker=dict(color=color, opacity=0.5, size=4 + 16 * np.sqrt(counts / counts.max())),
+                                       hovertemplate="Toplam Yayın: ~%{x:.0f}<br>Etki Puanı: ~%{y:.1f}<br>"
+                                                     "%{customdata} araştırmacı<extra>" + year + "</extra>"))
+            year_data = year_data.iloc[top_n(year_data['Impact Score'].to_numpy(), RESEARCHER_OUTLIER_COUNT)]
+        fig.add_trace(go.Scattergl(x=year_data['Publications'], y=year_data['Impact Score'], mode='markers', name=year,
+                                   legendgroup=year, showlegend=not binned, customdata=year_data[['Name', 'Department']],
+                                   marker=dict(color=color, opacity=0.7, size=7, symbol='diamond' if binned else 'circle'),
+                                   hovertemplate="%{customdata[0]}<br>%{customdata[1]}<br>Toplam Yayın: %{x}<br>"
+                                                 "Etki Puanı: %{y}<extra>" + year + "</extra>"))
+    fig.update_layout(title="Araştırmacı Bazında Yayın ve Etki Puanı", xaxis_title="Toplam Yayın", yaxis_title="Etki Puanı",
+                      height=600, width=900)
+    items = [('chart', fig, "researcher_scatter_plot")]
+    if binned:
+        items.insert(0, ('info', f"{len(per_year)} araştırmacı-yıl noktası ızgara hücrelerinde gruplandı; nokta boyutu hücredeki "
+                                 f"araştırmacı sayısını gösterir. Her yıl için etki puanı en yüksek {RESEARCHER_OUTLIER_COUNT} "
+                                 "araştırmacı ayrıca (elmas) gösterilir."))
+    return items
+
+# Tukey box statistics per group, computed here so the figure carries five numbers per box instead of
+# every researcher. Returns the statistics and the rows beyond the whiskers.
+def box_stats(frame, by, measure):
+    grouped = frame.groupby(by, observed=True)[measure]
+    q1, q3 = grouped.transform('quantile', 0.25), grouped.transform('quantile', 0.75)
+    inside = frame[measure].between(q1 - 1.5 * (q3 - q1), q3 + 1.5 * (q3 - q1))
+    whiskers = frame[measure].where(inside).groupby([frame[column] for column in by], observed=True)
+    stats = pd.DataFrame({'q1': grouped.quantile(0.25), 'median': grouped.median(), 'q3': grouped.quantile(0.75),
+                          'mean': grouped.mean(), 'lowerfence': whiskers.min(), 'upperfence': whiskers.max()})
+    return stats.reset_index(), frame[~inside]
+
+# Researcher totals by title as box plots, one per measure and a box per year
+def build_researcher_distributions(data):
+    per_year = data['researcher_years']
+    titles = [title for title in title_order if (per_year['Title'] == title).any()]
+    items = []
+    for measure, label in RESEARCHER_MEASURES.items():
+        stats, outliers = box_stats(per_year, ['Title', 'Year'], measure)
+        fig = go.Figure()
+        for year in data['years']:
+            year_stats = stats[stats['Year'] == year]
+            if year_stats.empty:
+                continue
+            color = data['year_color_map'][year]
+            fig.add_trace(go.Box(x=year_stats['Title'].astype(str), q1=year_stats['q1'], median=year_stats['median'],
+                                 q3=year_stats['q3'], mean=year_stats['mean'], lowerfence=year_stats['lowerfence'],
+                                 upperfence=year_stats['upperfence'], name=year, legendgroup=year, marker_color=color,
+                                 offsetgroup=year, boxpoints=False))
+            # The most extreme outliers of each box, as WebGL points
+            year_outliers = outliers[outliers['Year'] == year].sort_values(measure, ascending=False, kind='stable')
+            year_outliers = year_outliers.groupby('Title', observed=True).head(RESEARCHER_OUTLIER_COUNT)
+            if not year_outliers.empty:
+                fig.add_trace(go.Scattergl(x=year_outliers['Title'].astype(str), y=year_outliers[measure], mode='markers',
+                                           name=year, legendgroup=year, showlegend=False, marker=dict(color=color, size=5),
+                                           customdata=year_outliers[['Name', 'Department']],
+                                           hovertemplate="%{customdata[0]}<br>%{customdata[1]}<br>%{y}<extra>" + year + "</extra>"))
+        fig.update_layout(title=f"Unvan Bazında Araştırmacı {label} Dağılımı", boxmode='group', xaxis_title="Unvan",
+                          yaxis_title=label, height=550, width=900,
+                          xaxis=dict(categoryorder='array', categoryarray=titles, tickangle=45))
+        items.append(('chart', fig, f"researcher_box_{measure.replace(' ', '_').lower()}"))
+    return items
+
+def build_active_ratio(data, unit):
+    view = UNIT_VIEWS[unit]
+    ratio_df = data[view['rollup']][[unit, 'Year', 'Total Researchers', 'Active Researchers']].rename(
+        columns={'Total Researchers': 'Toplam Araştırmacılar', 'Active Researchers': 'Aktif Araştırmacılar'})
+    ratio_df['Aktif Araştırmacı Oranı'] = ratio_df['Aktif Araştırmacılar'] / ratio_df['Toplam Araştırmacılar']
+    fig9 = px.bar(ratio_df, x=unit, y='Aktif Araştırmacı Oranı', color='Year', barmode='group',
+                  title=f"{view['label']} Bazında Aktif Araştırmacı Oranı",
+                  color_discrete_map=data['year_color_map'])
+    fig9.update_layout(xaxis_tickangle=45, height=500, width=900)
+    return [('chart', fig9, f"active_ratio_{view['slug']}_bar")]
+
+def build_unit_publications(data, unit):
+    view = UNIT_VIEWS[unit]
+    year_pubs = data[view['rollup']][[unit, 'Year', 'Total Publications']]
+    fig10 = px.bar(year_pubs, x=unit, y='Total Publications', color='Year', barmode='group',
+                   title=f"{view['label']} Bazında Yıl Bazında Yayınlar",
+                   color_discrete_map=data['year_color_map'])
+    fig10.update_layout(xaxis_tickangle=45, height=500, width=900)
+    return [('chart', fig10, f"pubs_by_year_{view['slug']}_bar")]
+
+def build_diversity(data, unit):
+    view = UNIT_VIEWS[unit]
+    diversity_metric = data['diversity_metric']
+    unit_quartile = data[view['rollup']][[unit, 'Year'] + QUARTILE_COLUMNS].copy()
+    unit_quartile['Diversity Index'] = DIVERSITY_METRICS[diversity_metric](unit_quartile[QUARTILE_COLUMNS])
+    fig11 = px.bar(unit_quartile, x=unit, y='Diversity Index', color='Year', barmode='group',
+                   title=f"{view['label']} Bazında Çeyreklik Çeşitlilik İndeksi ({diversity_metric})",
+                   color_discrete_map=data['year_color_map'])
+    fig11.update_layout(xaxis_tickangle=45, height=500, width=900)
+    return [('chart', fig11, f"diversity_index_{view['slug']}_bar")]
+
+def build_top_pub_types(data, unit):
+    view = UNIT_VIEWS[unit]
+    pub_type_sums = data[view['rollup']][[unit, 'Year'] + pub_types]
+    pub_type_melted = pub_type_sums.melt(id_vars=[unit, 'Year'], value_vars=pub_types, var_name='Publication Type', value_name='Sayı')
+    pub_type_melted['Publication Type'] = pub_type_melted['Publication Type'].map(pub_type_labels)
+    top_types = top_groups(pub_type_melted, 'Publication Type', 'Sayı')
+    items = []
+    for year in data['years']:
+        year_types = pub_type_melted[(pub_type_melted['Publication Type'].isin(top_types)) & (pub_type_melted['Year'] == year)]
+        fig12 = px.bar(year_types, x=unit, y='Sayı', color='Publication Type', barmode='stack',
+                       title=f"{view['label']} Bazında En Yaygın Yayın Türleri ({year})", color_discrete_map=COLOR_MAP)
+        fig12.update_layout(xaxis_tickangle=45, height=600, width=900)
+        items.append(('chart', fig12, f"{view['slug']}_top_pub_types_{year}"))
+    return items
+
+def unit_panels(builder):
+    return [("Fakülteler", partial(builder, unit='Faculty')), ("Bölümler", partial(builder, unit='Department'))]
+
+TREND_PANELS = [
+    ("Yayın Türü Değişimleri", build_trend_changes),
+    ("Yayın Türü Dağılımı", build_trend_distribution),
+    ("En Aktif Fakülteler", build_trend_top_faculties),
+]
+
+# Report sections in page order. Descriptions are format templates over SectionData;
+# 'options' are per-section radios stored into SectionData before the panels run.
+REPORT_SECTIONS = [
+    {'anchor': "yil-bazinda-yayin", 'title': "Yıl Bazında Yayın Türü Dağılımı",
+     'description': "{years_text} yıllarında yayın türlerinin dağılımı.",
+     'panels': [(None, build_year_wise)]},
+    {'anchor': "yayin-degisim", 'title': "Yayın Türü Değişim Karşılaştırması",
+     'description': "{compared_years_text} yıllarında yayın türlerinin karşılaştırması.",
+     'panels': [(None, build_year_comparison)]},
+    {'anchor': "fakulte-ceyreklik", 'title': "Fakülte/Bölüm Bazında Yayın Çeyreklik Dağılımı",
+     'description': "Fakülteler ve bölümlerdeki Q1-Q4 çeyreklik makalelerin dağılımı.",
+     'options': {'quartile_view': ("Görünüm", QUARTILE_VIEWS)},
+     'expander': "Fakülte/Bölüm Bazında Çeyreklik Dağılımlarını Görüntüle", 'panels': unit_panels(build_quartile_distribution)},
+    {'anchor': "fakulte-yayin-turu", 'title': "Fakülte ve Yayın Türü Dağılımı",
+     'description': "Fakültelerdeki yayın türlerinin ısı haritası.",
+     'panels': unit_panels(build_type_heatmaps)},
+    {'anchor': "top-5-birim", 'title': "Toplam Yayın Sayısına Göre İlk 5 Birim",
+     'description': "{years_text} için en aktif 5 fakülte ve bölüm.",
+     'panels': unit_panels(build_top_units)},
+    {'anchor': "unvan-dagilim", 'title': "Unvan Bazında Yayın Dağılımı",
+     'description': "{years_text} için akademik unvanların yayın katkıları.",
+     'panels': [(None, build_title_distribution)]},
+    {'anchor': "birim-yayin-degisimi", 'title': "Birim Bazında Yayın Değişimi",
+     'description': "Birimlerin karşılaştırılan yıllar arasındaki yayın sayılarındaki değişim.",
+     'panels': unit_panels(build_unit_changes)},
+    {'anchor': "top-5-arastirmaci", 'title': "Toplam Yayın Sayısına Göre İlk 5 Araştırmacı",
+     'description': "En aktif 5 araştırmacı.",
+     'panels': [(None, build_top_researchers)]},
+    {'anchor': "arastirmaci-degisimi", 'title': "Araştırmacı Bazında Değişim",
+     'description': "Araştırmacıların karşılaştırılan yıllar arasındaki aktiflik, bölüm ve yayın değişimleri.",
+     'panels': [("Özet", build_researcher_summary), ("Bölüm Değiştirenler", build_researcher_movers),
+                ("Kişi Bazında Değişim", build_researcher_changes)],
+     'footnote': "**Eşleştirme:** Araştırmacılar yıllar arasında adlarıyla eşleştirilir; unvanlar, noktalama, fazla boşluklar ve büyük/küçük harf farkları (İ/ı dahil) yok sayılır. Aynı yıl içinde birden fazla kez geçen adlar bölüme göre ayrılır. Aktif araştırmacı, ilgili yılda en az bir yayını olan kişidir. Filtre uygulandığında yalnızca filtrelenen satırlar karşılaştırılır."},
+    {'anchor': "etki-puani", 'title': "Etki Puanı",
+     'description': "{years_text} için birimlerin toplam etki puanı.",
+     'panels': unit_panels(build_impact_scores),
+     'footnote': "**Hesaplama:** Etki puanı, yayın türlerine göre ağırlıklı bir toplam olarak hesaplanır: Q1 makaleleri için 4 puan, Q2 için 3 puan, Q3 için 2 puan, Q4 için 1 puan, ESCI, Scopus ve çeyreklik olmayan makaleler için 0.5 puan. Formül: **Etki Puanı = (Q1 × 4) + (Q2 × 3) + (Q3 × 2) + (Q4 × 1) + [(ESCI + Scopus + Çeyreklik Olmayan) × 0.5]**. Örnek: Bir fakültede 5 Q1 (5×4=20), 3 Q2 (3×3=9), 2 ESCI (2×0.5=1) makale varsa, toplam etki puanı 20+9+1=30 olur."},
+    {'anchor': "yayin-etki", 'title': "Yayın ve Etki Puanı",
+     'description': "Birimlerin ve araştırmacıların toplam yayın ve etki puanı ilişkisi.",
+     'panels': unit_panels(build_impact_scatter) + [("Araştırmacılar", build_researcher_scatter),
+                                                    ("Unvan Dağılımı", build_researcher_distributions)],
+     'footnote': "**Hesaplama:** Bu görselleştirme, birimlerin toplam yayın sayılarını (tüm yayın türlerinin toplamı) ve etki puanlarını (yukarıda açıklanan formülle hesaplanan) karşılaştırır. Birim grafiklerinde her nokta bir fakülte veya bölümü temsil eder, nokta boyutu toplam yayın sayısını, sembol ise yılı gösterir. Araştırmacı grafiklerinde her nokta bir araştırmacının bir yıldaki toplamıdır; unvan dağılımındaki kutular çeyrekleri, bıyıklar 1,5 çeyrekler arası açıklık içindeki en uç değerleri gösterir. Birim filtreleri bu grafikleri seçilen birimlerle sınırlar."},
+    {'anchor': "aktif-oran", 'title': "Aktif Araştırmacı Oranı",
+     'description': "Birimlerde aktif araştırmacı oranı.",
+     'panels': unit_panels(build_active_ratio)},
+    {'anchor': "yil-bazinda-yayinlar", 'title': "Yıl Bazında Yayınlar",
+     'description': "{years_text} için birimlerin yayın sayıları.",
+     'panels': unit_panels(build_unit_publications)},
+    {'anchor': "cesitlilik-indeksi", 'title': "Çeyreklik Çeşitlilik İndeksi",
+     'description': "Birimlerin Q1-Q4 makale çeşitliliği.",
+     'options': {'diversity_metric': ("İndeks Türü", list(DIVERSITY_METRICS))},
+     'panels': unit_panels(build_diversity),
+     'footnote': "**Hesaplama:** Çeyreklik Çeşitlilik İndeksi, Shannon Entropi formülü kullanılarak hesaplanır. Q1, Q2, Q3 ve Q4 makalelerinin toplam yayın içindeki oranları dikkate alınır. Formül: **H = -Σ(p_i * ln(p_i))**; burada p_i, her çeyreklik türünün toplam yayınlara oranıdır. Örneğin, bir fakültede 10 Q1, 5 Q2, 5 Q3 ve 0 Q4 makale varsa, toplam 20 makale olur. Oranlar: Q1=0.5, Q2=0.25, Q3=0.25. H = -[(0.5 * ln(0.5)) + (0.25 * ln(0.25)) + (0.25 * ln(0.25))] ≈ 1.04. Daha yüksek indeks, daha dengeli bir çeyreklik dağılımını gösterir. Simpson indeksi **1 - Σ(p_i²)** ile, Eşitlik (Pielou) ise **H / ln(S)** ile hesaplanır; S, en az bir makalesi olan çeyreklik sayısıdır."},
+    {'anchor': "en-yaygin-yayin", 'title': "En Yaygın Yayın Türleri",
+     'description': "Birimlerdeki en yaygın yayın türleri.",
+     'panels': unit_panels(build_top_pub_types)},
+]
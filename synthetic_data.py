@@ -0,0 +1,109 @@
+# Synthetic publication workbooks in the upload layout (COLUMN_MAPPING), for load testing
+# the dashboard at university scale and for the benchmark suite.
+#
+#   python synthetic_data.py --researchers 20000 --years 2022 2023 2024 --output sentetik
+import argparse
+import sys
+from io import BytesIO
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from processing import COLUMN_MAPPING, DEPARTMENT_ORDER, FACULTY_ORDER, pub_types, title_order
+
+RAW_COLUMNS = {canonical: raw for raw, canonical in COLUMN_MAPPING.items()}
+# Share of researchers per title, in title_order
+TITLE_WEIGHTS = [0.25, 0.15, 0.25, 0.15, 0.17, 0.03]
+# Expected share of a researcher's output per publication type, in pub_types order
+PUB_TYPE_WEIGHTS = [0.12, 0.18, 0.2, 0.17, 0.12, 0.08, 0.13]
+
+# Unit names: the known faculties and departments first, numbered synthetic ones beyond that
+def unit_names(known, count, prefix):
+    return list(known[:count]) + [f"{prefix} {i}" for i in range(len(known) + 1, count + 1)]
+
+# One researcher roster shared by every year, so people keep their unit and title across years
+def generate_roster(researchers, faculties, departments, rng):
+    faculty_names = unit_names(FACULTY_ORDER, faculties, "Sentetik Fakülte")
+    department_names = unit_names(DEPARTMENT_ORDER, departments, "Sentetik Bölüm")
+    # Departments are dealt out to faculties round robin; unit sizes follow a Zipf-like curve
+    department_faculty = [faculty_names[i % len(faculty_names)] for i in range(len(department_names))]
+    sizes = 1 / np.arange(1, len(department_names) + 1)
+    department_codes = rng.choice(len(department_names), size=researchers, p=sizes / sizes.sum())
+    return pd.DataFrame({
+        'Title': rng.choice(title_order, size=researchers, p=TITLE_WEIGHTS),
+        'Name': [f"Araştırmacı {i}" for i in range(researchers)],
+        'Faculty': np.array(department_faculty, dtype=object)[department_codes],
+        'Department': np.array(department_names, dtype=object)[department_codes],
+    })
+
+# Publication counts for one year. skew is the spread of per-researcher productivity (log-normal sigma);
+# error_rate is the share of rows that get one injected validation problem.
+def generate_year(roster, year, skew, error_rate, rng):
+    productivity = rng.lognormal(mean=0.5, sigma=skew, size=len(roster))
+    counts = rng.poisson(productivity[:, None] * np.array(PUB_TYPE_WEIGHTS) * 3)
+    frame = roster.copy()
+    for column, values in zip(pub_types, counts.T):
+        frame[column] = values
+    frame['Reported WoS Total'] = frame[['Q1 Articles', 'Q2 Articles', 'Q3 Articles', 'Q4 Articles',
+                                         'Non-Quartile Articles']].sum(axis=1)
+    bad_rows = np.flatnonzero(rng.random(len(frame)) < error_rate)
+    problems = rng.integers(0, 4, size=len(bad_rows))
+    for problem in range(4):
+        rows = bad_rows[problems == problem]
+        if problem == 0:
+            frame.loc[rows, 'Q1 Articles'] = -frame.loc[rows, 'Q1 Articles'] - 1
+        elif problem == 1:
+            frame.loc[rows, 'Reported WoS Total'] += rng.integers(1, 5, size=len(rows))
+        elif problem == 2:
+            frame.loc[rows, 'Department'] = ''
+        else:
+            frame.loc[rows, 'Q2 Articles'] += 200
+    if len(bad_rows):
+        # A few exact duplicates as produced by copy-pasted sheets
+        frame = pd.concat([frame, frame.iloc[rng.choice(len(frame), size=max(1, len(bad_rows) // 4))]], ignore_index=True)
+    frame.insert(0, 'Year', year)
+    return frame
+
+def generate_dataset(researchers, years, faculties=len(FACULTY_ORDER), departments=len(DEPARTMENT_ORDER), skew=0.6,
+                     error_rate=0.01, seed=0):
+    rng = np.random.default_rng(seed)
+    roster = generate_roster(researchers, faculties, departments, rng)
+    return [generate_year(roster, str(year), skew, error_rate, rng) for year in years]
+
+# Upload-layout workbook bytes for one year; titles_in_names drops the title column and prefixes the names instead
+def workbook_bytes(frame, titles_in_names=False):
+    frame = frame.drop(columns='Year')
+    if titles_in_names:
+        frame = frame.assign(Name=frame['Title'] + ' ' + frame['Name']).drop(columns='Title')
+    buffer = BytesIO()
+    frame.rename(columns=RAW_COLUMNS).to_excel(buffer, index=False)
+    return buffer.getvalue()
+
+def parse_args(argv):
+    parser = argparse.ArgumentParser(description="Yükleme biçiminde sentetik yıllık yayın dosyaları üretir.")
+    parser.add_argument('--researchers', type=int, default=1000, help="Araştırmacı sayısı (her yıl için bir satır)")
+    parser.add_argument('--years', nargs='+', type=int, default=[2023, 2024], help="Üretilecek yıllar")
+    parser.add_argument('--faculties', type=int, default=len(FACULTY_ORDER), help="Fakülte sayısı")
+    parser.add_argument('--departments', type=int, default=len(DEPARTMENT_ORDER), help="Bölüm sayısı")
+    parser.add_argument('--skew', type=float, default=0.6, help="Araştırmacı verimliliği dağılımının çarpıklığı")
+    parser.add_argument('--error-rate', type=float, default=0.01, help="Doğrulama hatası eklenen satır oranı")
+    parser.add_argument('--titles-in-names', action='store_true', help="Unvanı ayrı sütun yerine ada ekle")
+    parser.add_argument('--seed', type=int, default=0, help="Rastgele sayı tohumu")
+    parser.add_argument('--output', default='sentetik', help="Çıktı klasörü (varsayılan: sentetik)")
+    return parser.parse_args(argv)
+
+def main(argv=None):
+    args = parse_args(argv)
+    output = Path(args.output)
+    output.mkdir(parents=True, exist_ok=True)
+    frames = generate_dataset(args.researchers, args.years, args.faculties, args.departments, args.skew,
+                              args.error_rate, args.seed)
+    for frame in frames:
+        path = output / f"yayinlar_{frame['Year'].iloc[0]}.xlsx"
+        path.write_bytes(workbook_bytes(frame, args.titles_in_names))
+        print(f"{path}: {len(frame)} satır")
+    return 0
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,77 @@
+import numpy as np
+import pandas as pd
+
+import processing
+from processing import COLUMN_MAPPING, build_filter_index, concat_filter_indexes, load_and_process_data, pub_types
+
+class MemoryFile:
+    def __init__(self, name, data):
+        self.name = name
+        self.data = data
+
+    def getvalue(self):
+        return self.data
+
+# A parsed workbook: raw column names, one publication of each type per row
+def workbook(rows):
+    df = pd.DataFrame(rows, columns=['Name', 'Title', 'Faculty', 'Department', 'Year'])
+    for column in pub_types:
+        df[column] = 1
+    return df.rename(columns={column: raw for raw, column in COLUMN_MAPPING.items()})
+
+WORKBOOKS = {
+    b'2023': workbook([
+        ("Ayşe Kaya", "Prof. Dr.", "Fen Edebiyat Fakültesi", "Fizik Bölümü", "2023"),
+        ("Ayşe Kaya", "Doç. Dr.", "Fen Edebiyat Fakültesi", "Kimya Bölümü", "2023"),
+        ("Ali Demir", "Doç. Dr.", "Mühendislik Fakültesi", "Makina Mühendisliği Bölümü", "2023"),
+    ]),
+    b'2024': workbook([
+        ("AYŞE KAYA", "Prof. Dr.", "Fen Edebiyat Fakültesi", "Fizik Bölümü", "2024"),
+        ("Ali Demir", "Prof. Dr.", "Mühendislik Fakültesi", "Makina Mühendisliği Bölümü", "2024"),
+    ]),
+    b'2024 corrected': workbook([
+        ("Ayşe Kaya", "Prof. Dr.", "Fen Edebiyat Fakültesi", "Fizik Bölümü", "2024"),
+        ("Ali Demir", "Prof. Dr.", "Mühendislik Fakültesi", "Makina Mühendisliği Bölümü", "2024"),
+        ("Can Er", "Arş. Gör.", "Mühendislik Fakültesi", "Makina Mühendisliği Bölümü", "2024"),
+    ]),
+}
+
+def test_merged_bitsets_match_a_rebuild():
+    rng = np.random.default_rng(0)
+    frames = [pd.DataFrame({column: pd.Categorical.from_codes(rng.integers(-1, 5, rows), list('abcde'))
+                            for column in processing.FILTER_COLUMNS}) for rows in (13, 8, 0, 21, 3)]
+    merged = concat_filter_indexes([build_filter_index(frame) for frame in frames])
+    rebuilt = build_filter_index(pd.concat(frames, ignore_index=True))
+    assert merged['rows'] == rebuilt['rows']
+    for column in processing.FILTER_COLUMNS:
+        assert np.array_equal(merged[column], rebuilt[column])
+
+# Replacing one file indexes only that file; the merged ids and bitsets are those of a full rebuild
+def test_replacing_a_file_indexes_only_that_file(monkeypatch, tmp_path):
+    monkeypatch.setattr(processing, 'CACHE_DIR', tmp_path)
+    monkeypatch.setattr(processing, 'parse_workbooks', lambda files: [WORKBOOKS[data].copy() for _, data in files])
+    indexed = []
+    build_name_index = processing.build_name_index
+
+    def counting_name_index(df):
+        indexed.append(list(df['Year'].cat.categories))
+        return build_name_index(df)
+
+    monkeypatch.setattr(processing, 'build_name_index', counting_name_index)
+
+    first = load_and_process_data([MemoryFile("2023.xlsx", b'2023'), MemoryFile("2024.xlsx", b'2024')])
+    assert first[-1] is None
+    indexed.clear()
+    df, _, cube, _, filter_indexes, *_, error = load_and_process_data(
+        [MemoryFile("2023.xlsx", b'2023'), MemoryFile("2024.xlsx", b'2024 corrected')])
+    assert error is None
+    assert indexed == [["2024"]]
+
+    # The Ayşe Kaya of 2023 are homonyms, told apart by department; the one in Fizik continues in 2024
+    ids = dict(zip(zip(df['Year'], df['Department']), df['Researcher ID']))
+    assert ids[("2023", "Fizik Bölümü")] == ids[("2024", "Fizik Bölümü")] != ids[("2023", "Kimya Bölümü")]
+    assert df['Researcher ID'].nunique() == 4
+    for name, frame in (('df', df), ('cube', cube)):
+        rebuilt = build_filter_index(frame)
+        for column in processing.FILTER_COLUMNS:
+            assert np.array_equal(filter_indexes[name][column], rebuilt[column])
@@ -0,0 +1,15 @@
+import numpy as np
+import pandas as pd
+
+from sections import researcher_pair
+
+def test_missing_department_in_both_years_is_not_a_move():
+    researcher_years = pd.DataFrame({
+        'Year': ["2023", "2024", "2023", "2024", "2023", "2024"],
+        'Researcher ID': [0, 0, 1, 1, 2, 2],
+        'Name': ["Ayşe Kaya", "Ayşe Kaya", "Ali Demir", "Ali Demir", "Can Er", "Can Er"],
+        'Department': [np.nan, np.nan, "Fizik Bölümü", "Kimya Bölümü", "Fizik Bölümü", "Fizik Bölümü"],
+        'Publications': [1, 2, 3, 4, 5, 6],
+    })
+    pair = researcher_pair({'researcher_years': researcher_years}, "2023", "2024")
+    assert pair['Moved'].to_dict() == {0: False, 1: True, 2: False}
@@ -0,0 +1,32 @@
+import threading
+
+import pandas as pd
+
+import processing
+from processing import extract_titles
+
+def test_titles_are_extracted_and_unmatched_names_reported():
+    names = pd.Series(["Prof. Dr. Ayşe Kaya", "Res. Asst. Ali Demir", "Can Er", "Prof. Dr. Ayşe Kaya"])
+    titles, unmatched = extract_titles(names)
+    assert list(titles) == ["Prof. Dr.", "Arş. Gör.", "Diğer", "Prof. Dr."]
+    assert list(unmatched['Ad Soyad']) == ["Can Er"]
+
+# A load that overflows and clears the shared cache must not turn another load's titles into 'Diğer'
+def test_concurrent_loads_keep_their_titles(monkeypatch):
+    monkeypatch.setattr(processing, 'TITLE_CACHE_MAX_SIZE', 50)
+    monkeypatch.setattr(processing, 'TITLE_CACHE', {})
+    failures = []
+
+    def load(offset):
+        names = pd.Series([f"Doç. Dr. Kişi {offset + i}" for i in range(40)])
+        for _ in range(50):
+            titles, _ = extract_titles(names)
+            if (titles != "Doç. Dr.").any():
+                failures.append(offset)
+
+    threads = [threading.Thread(target=load, args=(offset * 1000,)) for offset in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert not failures
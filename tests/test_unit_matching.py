@@ -0,0 +1,48 @@
+import pandas as pd
+import pytest
+
+from processing import match_units, normalize_units, unit_index
+
+def accepted(column, value):
+    matches, _, _, methods = match_units([value], unit_index(column))
+    return matches[0] if methods[0] else None
+
+# Names sharing only generic words ('bilimleri', 'enstitüsü', 'eğitim') with a known unit stay unmapped
+@pytest.mark.parametrize('column, value', [
+    ('Faculty', "Sağlık Bilimleri Enstitüsü"),
+    ('Faculty', "Eğitim Bilimleri Enstitüsü"),
+    ('Department', "Sağlık Bilimleri Enstitüsü"),
+    ('Department', "Kimya Bilimleri"),
+    ('Department', "Eğitim Fakültesi"),
+    ('Department', "Fen"),
+])
+def test_generic_words_do_not_merge_units(column, value):
+    assert accepted(column, value) is None
+
+@pytest.mark.parametrize('column, value, unit', [
+    ('Department', "fizik bolumu", "Fizik Bölümü"),
+    ('Department', "Department of Physics", "Fizik Bölümü"),
+    ('Department', "Makine Mühendisliği Bölüm", "Makina Mühendisliği Bölümü"),
+    ('Department', "Matematik Eğitimi", "Matematik ve Fen Bilimleri Eğitimi Bölümü"),
+    ('Faculty', "Mühendislik Fak.", "Mühendislik Fakültesi"),
+])
+def test_spelling_variants_reach_their_unit(column, value, unit):
+    assert accepted(column, value) == unit
+
+# One typo costs a short name most of its trigrams; the word-by-word match still finds the unit
+@pytest.mark.parametrize('column, value, unit', [
+    ('Department', "Fizk Bölümü", "Fizik Bölümü"),
+    ('Department', "Fizik Bölmü", "Fizik Bölümü"),
+    ('Department', "Siyaset Bilimi", "Siyaset Bilimi ve Kamu Yönetimi Bölümü"),
+    ('Faculty', "Mühendislk Fakültesi", "Mühendislik Fakültesi"),
+])
+def test_typos_in_short_names_reach_their_unit(column, value, unit):
+    assert accepted(column, value) == unit
+
+def test_rejected_matches_are_reported_unmapped():
+    df = pd.DataFrame({'Faculty': ["Sağlık Bilimleri Enstitüsü"], 'Department': ["Kimya Bilimleri"]})
+    df, reviews = normalize_units(df)
+    assert df.loc[0, 'Faculty'] == "Sağlık Bilimleri Enstitüsü"
+    assert df.loc[0, 'Department'] == "Kimya Bilimleri"
+    assert (reviews['Durum'] == 'Eşlenmedi').all()
+    assert reviews['Yöntem'].isna().all()
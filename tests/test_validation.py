@@ -0,0 +1,37 @@
+import pandas as pd
+
+from processing import check_and_remove_errors, pub_types
+
+def publications(rows):
+    df = pd.DataFrame(rows, columns=['Name', 'Faculty', 'Department', 'Year', 'Total Publications'])
+    for column in pub_types:
+        df[column] = 0
+    df['Q1 Articles'] = df['Total Publications']
+    return df
+
+def test_namesakes_in_different_departments_are_kept():
+    df = publications([
+        ("Mehmet Can", "Fen Edebiyat Fakültesi", "Fizik Bölümü", "2024", 3),
+        ("Mehmet Can", "Fen Edebiyat Fakültesi", "Kimya Bölümü", "2024", 5),
+    ])
+    cleaned, removed = check_and_remove_errors(df)
+    assert len(cleaned) == 2
+    assert not (removed['Durum'] == 'Kaldırıldı').any()
+
+def test_repeated_row_in_the_same_unit_is_removed():
+    df = publications([
+        ("Mehmet Can", "Fen Edebiyat Fakültesi", "Fizik Bölümü", "2024", 3),
+        ("Mehmet Can", "Fen Edebiyat Fakültesi", "Fizik Bölümü", "2024", 3),
+    ])
+    cleaned, removed = check_and_remove_errors(df)
+    assert len(cleaned) == 1
+    assert (removed['Durum'] == 'Kaldırıldı').sum() == 1
+
+def test_outliers_are_found_when_most_researchers_have_no_publications():
+    totals = [0] * 12 + [1, 2, 40]
+    df = publications([(f"Kişi {i}", "Fen Edebiyat Fakültesi", "Fizik Bölümü", "2024", total)
+                       for i, total in enumerate(totals)])
+    _, removed = check_and_remove_errors(df)
+    outliers = removed[removed['Sebep'].str.startswith("Aykırı")]
+    assert list(outliers['Ad Soyad']) == ["Kişi 14"]
+    assert (outliers['Durum'] == 'Uyarı').all()